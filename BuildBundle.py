@@ -0,0 +1,83 @@
+###############################################################################
+# NAME:             BuildBundle.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Build a zip of the precompiled budgetize package, for the
+#                   LibreOffice macro to import from, and report how long the
+#                   package takes to import. Run this with the Python that
+#                   LibreOffice uses, since the bytecode is specific to it.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import argparse
+import os
+import subprocess
+import sys
+import zipfile
+
+SCRIPTS_DIRECTORY = os.path.expanduser(
+    '~/.config/libreoffice/4/user/Scripts/python/Finances')
+BUNDLE_NAME = 'budgetize.zip'
+PACKAGE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 'budgetize')
+
+def buildBundle(path):
+    """Write the bytecode of the package (and no sources) to path"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporaryPath = path + '.tmp'
+    with zipfile.PyZipFile(temporaryPath, 'w', optimize=2) as bundle:
+        bundle.writepy(PACKAGE_DIRECTORY)
+    os.replace(temporaryPath, path)
+
+def getImportTimes(module, path=None):
+    """Import module in a fresh interpreter with -X importtime, from path if
+    it's given, or else from the source tree. Returns (cumulative
+    microseconds, module name) for each module imported, in descending
+    order."""
+    # sys.path[0] is the working directory for -c, so replace it
+    searchPath = path or os.path.dirname(PACKAGE_DIRECTORY)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'import sys; sys.path[0] = {searchPath!r}; import {module}'],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times.append((int(cumulative), name.strip()))
+    return sorted(times, reverse=True)
+
+def printImportTimes(times, count):
+    print(f'{"cumulative [ms]":>16}  module')
+    for cumulative, name in times[:count]:
+        print(f'{cumulative / 1000:16.1f}  {name}')
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-o', '--output',
+                        default=os.path.join(SCRIPTS_DIRECTORY, BUNDLE_NAME),
+                        help='Where to write the bundle')
+    parser.add_argument('-t', '--timings', action='store_true',
+                        help='Afterwards, report the time taken to import '
+                        + 'the budgetizer from the bundle')
+    parser.add_argument('-n', '--count', type=int, default=20,
+                        help='Number of modules in the timing report')
+    parser.add_argument('-m', '--module', default='budgetize.budgetizer',
+                        help='Module to time importing')
+    args = parser.parse_args()
+    buildBundle(args.output)
+    print(f'Wrote {args.output}')
+    if args.timings:
+        printImportTimes(getImportTimes(args.module, args.output), args.count)
+
+if __name__ == '__main__':
+    main()
+
+###############################################################################
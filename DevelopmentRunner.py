@@ -7,40 +7,125 @@
 #                   locally, connected to an Office server instance. This
 #                   script is necessary because changes to the package are not
 #                   picked up when running the macro through the "Run Macro"
-#                   dialogue in a running instance of LibreOffice.
+#                   dialogue in a running instance of LibreOffice. It can also
+#                   budgetize an .ods file directly, without an Office server.
 #
 # CREATED:          12/01/2021
 #
-# LAST EDITED:      03/02/2022
+# LAST EDITED:      10/18/2026
 ###
 
 from datetime import datetime
 import calendar
 import argparse
 import code
-import uno
+import threading
+from budgetize.batch import BatchBudgetizer, getBudgetedMonths
 from budgetize.budgetizer import Budgetizer
+from budgetize.ods import OdsSheetBackend
 
 def getMonthName():
     return calendar.month_name[datetime.now().month]
 
+def resident(args):
+    """Stay connected to the Office server until interrupted, serving daemon
+    requests and/or watching the expenses sheets"""
+    from budgetize.connection import OfficeConnection
+    connection = OfficeConnection()
+    # The watcher's recomputes and the daemon's requests come in on different
+    # threads, but share the bridge, so only one of them may use it at a time.
+    lock = threading.Lock()
+    if args.watch:
+        from budgetize.listener import ExpenseWatcher
+        watcher = ExpenseWatcher(connection, args.month, lock=lock)
+        watcher.start()
+    try:
+        if args.daemon:
+            from budgetize.daemon import serve
+            serve(connection=connection, lock=lock)
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.watch:
+            watcher.stop()
+
 def main():
-    """Run the Budgetizer attached to a running Office server instance"""
+    """Run the Budgetizer attached to a running Office server instance, or on
+    an .ods file"""
     parser = argparse.ArgumentParser()
-    parser.add_argument('-m', '--month', required=False,
-                        default=getMonthName())
+    parser.add_argument('-m', '--month', required=False, action='append',
+                        help='Budgetize this month. May be given more than '
+                        + 'once. Defaults to the current month')
+    parser.add_argument('-y', '--year', action='store_true',
+                        help='Budgetize every month which has a budget sheet')
+    parser.add_argument('-f', '--file', required=False,
+                        help='Budgetize this .ods file directly, instead of '
+                        + 'the document open in the Office server')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help='Only apply the expenses added since the last '
+                        + 'incremental run')
+    parser.add_argument('-p', '--project', type=int, metavar='MONTHS',
+                        help='Afterwards, project the balances of the month '
+                        + 'forward this many months (requires numpy)')
+    parser.add_argument('-a', '--amortize', action='store_true',
+                        help='Afterwards, write amortization schedules for '
+                        + 'the month\'s loans (requires numpy)')
+    parser.add_argument('-d', '--daemon', action='store_true',
+                        help='Stay resident, connected to the Office server, '
+                        + 'and take requests from budgetize.client')
+    parser.add_argument('-w', '--watch', action='store_true',
+                        help='Stay resident, and recompute a month whenever '
+                        + 'its expenses sheet is edited')
+    parser.add_argument('-b', '--burndown', nargs=2,
+                        metavar=('START', 'END'),
+                        help='Afterwards, write the burndown table of the '
+                        + 'ledger from START through END (like 12/31/21). '
+                        + 'It\'s vectorized if numpy is installed')
+    parser.add_argument('-c', '--count-calls', action='store_true',
+                        help='Count the calls made to the document, and print '
+                        + 'the totals (and time spent) for each phase')
     args = parser.parse_args()
-    localContext = uno.getComponentContext()
-    resolver = localContext.ServiceManager.createInstanceWithContext(
-        'com.sun.star.bridge.UnoUrlResolver', localContext)
-    context = resolver.resolve(
-        'uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext')
-    desktop = context.ServiceManager.createInstanceWithContext(
-        'com.sun.star.frame.Desktop', context)
-    xSheetDoc = desktop.getCurrentComponent()
-    # code.interact(local=dict(globals(), **locals()))
-    budgetizer = Budgetizer(xSheetDoc, args.month)
-    budgetizer.budgetize()
+    if args.daemon or args.watch:
+        resident(args)
+        return
+    batch = args.year or (args.month and len(args.month) > 1)
+    if batch and args.incremental:
+        parser.error('--incremental only works for a single month')
+    if args.file:
+        backend = OdsSheetBackend(args.file)
+    else:
+        # code.interact(local=dict(globals(), **locals()))
+        from budgetize.connection import OfficeConnection
+        backend = OfficeConnection().getBackend()
+    if args.count_calls:
+        from budgetize.instrument import InstrumentedBackend
+        backend = InstrumentedBackend(backend)
+    if batch:
+        months = getBudgetedMonths(backend) if args.year else args.month
+        BatchBudgetizer(backend, months).budgetize()
+    else:
+        month = args.month[0] if args.month else getMonthName()
+        budgetizer = Budgetizer(backend, month)
+        budgetizer.budgetize(incremental=args.incremental)
+        if args.project:
+            from budgetize.projection import writeProjection
+            with backend.phase('project'):
+                writeProjection(backend, month, args.project,
+                                budgetizer.getDefaults())
+        if args.amortize:
+            from budgetize.amortization import writeSchedules
+            with backend.phase('amortize'):
+                writeSchedules(backend, month)
+    if args.burndown:
+        from budgetize.burndown import runBurndown
+        with backend.phase('burndown'):
+            runBurndown(backend, *args.burndown)
+    if args.file:
+        backend.save()
+    if args.count_calls:
+        backend.getCounter().report()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,278 @@
+###############################################################################
+# NAME:             pipeline.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Benchmarks of each stage of the read -> compute -> write
+#                   pipeline, on synthetic workbooks held in the in-memory
+#                   sheet backend. Results are saved as JSON, and can be
+#                   compared with the results of an earlier run.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import argparse
+from datetime import datetime, timedelta
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budgetize.account import AccountHistorySummary, AccountHistorySummaryForm
+from budgetize.burndown import (
+    BurndownCalculator, VectorizedBurndownCalculator, getLedger, numpy)
+from budgetize.expense import BudgetedExpense, ExpenseRouting
+from budgetize.income import Income
+from budgetize.memory import MemorySheetBackend
+from budgetize.monthly.budget import MonthlyBudget
+from budgetize.monthly.expense import MonthlyExpense, MonthlyExpenseSheet
+from budgetize.monthly.forms import MonthlyBudgetSheet
+from budgetize.transaction import TransactionLedger
+
+# (expenses, line items, accounts)
+SIZES = {
+    'small': (100, 5, 3),
+    'medium': (5000, 50, 10),
+    'large': (50000, 200, 50),
+}
+
+LINE_ITEMS_PER_SECTION = 10
+MONTH = 'January'
+START_DATE = datetime(2022, 1, 1)
+LEDGER_START = '01/01/22'
+LEDGER_END = '12/31/22'
+
+###############################################################################
+# Synthetic Workbooks
+###
+
+class SyntheticWorkbook:
+    """A document holding a budget, its expenses, a ledger and balances, of
+    the given size. The same seed always generates the same document."""
+    def __init__(self, expenses, lineItems, accounts, schedule=None, seed=0):
+        self.random = random.Random(seed)
+        self.expenseCount = expenses
+        self.lineItemCount = lineItems
+        self.accountCount = accounts
+        self.schedule = schedule
+        self.backend = MemorySheetBackend()
+        self.accountNames = [f'Account {index}' for index in range(accounts)]
+        self.budget = self.makeBudget()
+        self.resetBudget()
+        MonthlyExpenseSheet(
+            self.backend.createSheet(MONTH + ' Expenses')).write(
+                self.makeExpenses())
+        self.writeLedger()
+        self.resetBalances()
+
+    def makeBudget(self) -> MonthlyBudget:
+        expenses = {}
+        for index in range(self.lineItemCount):
+            section = f'Section {index // LINE_ITEMS_PER_SECTION}'
+            routing = ExpenseRouting.parse(
+                self.random.choice(self.accountNames))
+            expenses.setdefault(section, []).append(BudgetedExpense(
+                f'Line Item {index}', routing,
+                float(self.random.randint(10, 1000))))
+        incomes = [Income(f'Income {index}', name, 5000.0)
+                   for index, name in enumerate(self.accountNames)]
+        accounts = [AccountHistorySummary(name, 10000.0)
+                    for name in self.accountNames]
+        return MonthlyBudget(expenses, incomes, accounts, [], [])
+
+    def makeExpenses(self):
+        lineItems = [(section, expense)
+                     for section, expenses in self.budget.getExpenseSections()
+                     .items() for expense in expenses]
+        incomes = self.budget.getIncomes()
+        expenses = []
+        for index in range(self.expenseCount):
+            date = START_DATE + timedelta(days=index * 28 // self.expenseCount)
+            if self.random.random() < 0.1:
+                income = self.random.choice(incomes)
+                expenses.append(MonthlyExpense(
+                    'Deposit', income.getDescription(), 'Incomes', date,
+                    100.0, income.getAccountName()))
+            else:
+                section, expense = self.random.choice(lineItems)
+                expenses.append(MonthlyExpense(
+                    'Purchase', expense.getDescription(), section, date,
+                    -float(self.random.randint(1, 100)),
+                    expense.getRouting().getAccountName()))
+        return expenses
+
+    def writeLedger(self):
+        rows = [('Date', 'Description', 'Amount', 'Account')]
+        for index in range(self.expenseCount):
+            date = START_DATE + timedelta(
+                days=index * 365 // self.expenseCount)
+            rows.append((date.strftime('%m/%d/%y'), f'Transaction {index}',
+                         float(self.random.randint(-100, 100)),
+                         self.random.choice(self.accountNames)))
+        sheet = self.backend.createSheet('Non Recurring')
+        sheet.getCellRangeByPosition(0, 0, 3, len(rows) - 1).setDataArray(
+            tuple(rows))
+
+        rows = [('Description', 'Amount', 'Account', 'Schedule')]
+        if self.schedule:
+            rows.extend((f'Recurring {index}', -50.0, name, self.schedule)
+                        for index, name in enumerate(self.accountNames))
+        sheet = self.backend.createSheet('Recurring')
+        sheet.getCellRangeByPosition(0, 0, 3, len(rows) - 1).setDataArray(
+            tuple(rows))
+
+    def resetBudget(self):
+        """Writing the budget back leaves the sheet holding what was written,
+        so a second write would find nothing to change. The sheet is rebuilt
+        before each run, so that every run writes the same changes."""
+        MonthlyBudgetSheet(self.backend.createSheet(MONTH + ' Budget')).write(
+            self.budget)
+
+    def resetBalances(self):
+        """The burndown overwrites the balances, so they're reset before each
+        run of it"""
+        sheet = self.backend.getOrCreateSheet('Balances')
+        AccountHistorySummaryForm(sheet).write(
+            [AccountHistorySummary(name, 10000.0)
+             for name in self.accountNames])
+
+    def getLedger(self) -> TransactionLedger:
+        return getLedger(self.backend)
+
+###############################################################################
+# Stages
+###
+
+def timeStages(workbook: SyntheticWorkbook):
+    """Run the pipeline once, returning the seconds spent in each stage"""
+    timings = {}
+    workbook.resetBudget()
+    budgetSheet = workbook.backend.getSheet(MONTH + ' Budget')
+    expenseSheet = workbook.backend.getSheet(MONTH + ' Expenses')
+
+    start = time.perf_counter()
+    budget = MonthlyBudgetSheet(budgetSheet).read()
+    timings['MonthlyBudgetSheet.read'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expenses = MonthlyExpenseSheet(expenseSheet).readTable()
+    timings['MonthlyExpenseSheet.readTable'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    budget.calculateExpectedBalances()
+    budget.applyExpenses(expenses)
+    timings['MonthlyBudget.applyExpenses'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    MonthlyBudgetSheet(budgetSheet).write(budget)
+    timings['MonthlyBudgetSheet.write'] = time.perf_counter() - start
+
+    # The ledger is read and merged up front, so that the burndown's stage
+    # only times the burndown itself, like the vectorized one's.
+    start = time.perf_counter()
+    transactions = list(
+        workbook.getLedger().iterTransactions(LEDGER_START, LEDGER_END))
+    timings['TransactionLedger.iterTransactions'] = \
+        time.perf_counter() - start
+
+    workbook.resetBalances()
+    calculator = BurndownCalculator(
+        transactions,
+        AccountHistorySummaryForm(workbook.backend.getSheet('Balances')),
+        workbook.backend.getOrCreateSheet('Burndown Table'),
+        workbook.backend)
+    start = time.perf_counter()
+    calculator.run(LEDGER_START, LEDGER_END)
+    timings['BurndownCalculator.run'] = time.perf_counter() - start
+
+    if numpy is None:
+        return timings
+    start = time.perf_counter()
+    table = workbook.getLedger().getTransactionTable(
+        LEDGER_START, LEDGER_END)
+    timings['TransactionLedger.getTransactionTable'] = \
+        time.perf_counter() - start
+
+    workbook.resetBalances()
+    calculator = VectorizedBurndownCalculator(
+        table,
+        AccountHistorySummaryForm(workbook.backend.getSheet('Balances')),
+        workbook.backend.getOrCreateSheet('Burndown Table'),
+        workbook.backend)
+    start = time.perf_counter()
+    calculator.run(LEDGER_START, LEDGER_END)
+    timings['VectorizedBurndownCalculator.run'] = time.perf_counter() - start
+    return timings
+
+def benchmark(name, expenses, lineItems, accounts, repeat, schedule=None):
+    workbook = SyntheticWorkbook(expenses, lineItems, accounts, schedule)
+    runs = [timeStages(workbook) for _ in range(repeat)]
+    stages = {}
+    for stage in runs[0]:
+        samples = [run[stage] for run in runs]
+        stages[stage] = {'min': min(samples),
+                         'median': statistics.median(samples)}
+    return {'size': name, 'expenses': expenses, 'lineItems': lineItems,
+            'accounts': accounts, 'repeat': repeat, 'stages': stages}
+
+###############################################################################
+# Reporting
+###
+
+def printResult(result, baseline=None):
+    print(f'{result["size"]}: {result["expenses"]} expenses, '
+          f'{result["lineItems"]} line items, {result["accounts"]} accounts')
+    for stage, timing in result['stages'].items():
+        line = f'  {stage:<40}{timing["min"] * 1000:10.2f} ms'
+        if baseline and stage in baseline['stages']:
+            before = baseline['stages'][stage]['min']
+            line += f'  ({timing["min"] / before:.2f}x baseline)'
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--size', action='append',
+                        choices=list(SIZES.keys()),
+                        help='Workbook size to benchmark. May be given more '
+                        + 'than once. Defaults to all of them')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='Runs of each stage. The fastest is reported')
+    parser.add_argument('--schedule', default=None,
+                        help='Give each account a recurring transaction on '
+                        + 'this schedule (which must be understood by '
+                        + 'pyrecurrence)')
+    parser.add_argument('-o', '--output', default='benchmark.json',
+                        help='Where to save the results')
+    parser.add_argument('-c', '--compare', default=None,
+                        help='Results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    baselines = {}
+    if args.compare:
+        with open(args.compare, 'r') as baselineFile:
+            baselines = {result['size']: result
+                         for result in json.load(baselineFile)['results']}
+
+    results = []
+    for name in args.size or SIZES.keys():
+        result = benchmark(name, *SIZES[name], args.repeat, args.schedule)
+        printResult(result, baselines.get(name, None))
+        results.append(result)
+
+    with open(args.output, 'w') as outputFile:
+        json.dump({'date': datetime.now().isoformat(),
+                   'python': platform.python_version(),
+                   'schedule': args.schedule,
+                   'results': results}, outputFile, indent=2)
+
+if __name__ == '__main__':
+    main()
+
+###############################################################################
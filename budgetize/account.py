@@ -7,14 +7,20 @@
 #
 # CREATED:          12/03/2021
 #
-# LAST EDITED:      02/07/2022
+# LAST EDITED:      10/18/2026
 ###
 
 from typing import List
 
-from .cellrange import CellRow
+
+from .cellname import RangeAddress, ROW_MAX
+from .cellrange import CellMatrix, CellRow
 from .sheet import SheetTable
 from .cellformat import NumberFormat
+from .constants import FontWeight
+
+# Account, Starting Balance, Current Balance, Expected Period End Balance
+FORM_COLUMNS = 4
 
 class AccountHistorySummary:
     """Contains only necessary information about an account history"""
@@ -39,6 +45,9 @@ class AccountHistorySummary:
     def updateBalance(self, diff):
         self.currentBalance += diff
 
+    def setCurrentBalance(self, balance):
+        self.currentBalance = balance
+
     def updateExpectedBalance(self, diff):
         self.expectedEndBalance += diff
 
@@ -69,4 +78,30 @@ class AccountHistorySummaryRecord:
         expectedEndBalanceCell.NumberFormat = NumberFormat.CURRENCY
         expectedEndBalanceCell.Value = summary.getExpectedEndBalance()
 
+class AccountHistorySummaryForm:
+    """Deals with persistence of a sheet holding a table of
+    AccountHistorySummary instances, with a header row"""
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def read(self) -> List[AccountHistorySummary]:
+        table = SheetTable('A1', FORM_COLUMNS, self.sheet, snapshot=True)
+        return [AccountHistorySummaryRecord(row).read() for row in table]
+
+    def write(self, summaries: List[AccountHistorySummary]):
+        cellrange = CellMatrix(
+            RangeAddress(0, 0, FORM_COLUMNS - 1, ROW_MAX), self.sheet,
+            buffered=True)
+        rowIterator = iter(cellrange)
+        headerRow = iter(next(rowIterator))
+        for header in ["Account", "Starting Balance", "Current Balance",
+                       "Expected Period End Balance"]:
+            headerCell = next(headerRow)
+            headerCell.CharWeight = FontWeight.BOLD
+            headerCell.String = header
+
+        for summary in summaries:
+            AccountHistorySummaryRecord(next(rowIterator)).write(summary)
+        cellrange.flush()
+
 ###############################################################################
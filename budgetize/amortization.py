@@ -0,0 +1,143 @@
+###############################################################################
+# NAME:             amortization.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Amortization schedules for loans. Requires numpy.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from typing import Dict, List
+
+import numpy
+
+from .backend import SheetBackend
+from .cellformat import NumberFormat
+from .constants import FontWeight
+from .loan import Loan
+from .monthly.forms import MonthlyBudgetSheet
+from .sheet import clearSheet
+
+AMORTIZATION_SHEET = 'Amortization'
+
+# Schedules are cut off after this many months (50 years)
+MAX_PERIODS = 600
+
+# Period, Payment, Interest, Principal, Balance
+SCHEDULE_COLUMNS = 5
+
+def getBalances(balances, rates, payments, periods):
+    """Balances (periods x loans) at the end of each month, with interest
+    accruing monthly at rates / 12, clamped at zero once a loan is paid off"""
+    rates = rates / 12
+    months = numpy.arange(1, periods + 1)[:, numpy.newaxis]
+    compounded = (1 + rates) ** months
+    # Closed form of b[t] = b[t - 1] * (1 + rate) - payment
+    withInterest = numpy.where(
+        rates > 0,
+        balances * compounded
+        - payments * (compounded - 1) / numpy.where(rates > 0, rates, 1),
+        balances - payments * months)
+    return numpy.maximum(withInterest, 0.0)
+
+class AmortizationSchedule:
+    """Payment, interest, principal and balance of one loan, per month"""
+    def __init__(self, loan: Loan, payment, interest, principal, balance):
+        self.loan = loan
+        self.payment = payment
+        self.interest = interest
+        self.principal = principal
+        self.balance = balance
+
+    def getLoan(self) -> Loan:
+        return self.loan
+
+    def getPeriods(self):
+        return len(self.balance)
+
+    def isPaidOff(self):
+        """False if the loan isn't paid off within the schedule. The schedule
+        is empty if the payment doesn't even cover the interest."""
+        return self.getPeriods() > 0 and self.balance[-1] == 0
+
+    def getRows(self):
+        return tuple(zip(range(1, self.getPeriods() + 1),
+                         self.payment.tolist(), self.interest.tolist(),
+                         self.principal.tolist(), self.balance.tolist()))
+
+def getSchedules(loans: List[Loan], extraPayments: Dict[str, float]=None,
+                 maxPeriods=MAX_PERIODS) -> List[AmortizationSchedule]:
+    """Amortize every loan at once, starting from its ending balance this
+    month, with this month's payment plus any extra payment (by loan name)
+    every following month"""
+    extraPayments = extraPayments or {}
+    if not loans:
+        return []
+    starting = numpy.array([loan.getEndingBalance() for loan in loans])
+    rates = numpy.array([loan.getAPR() for loan in loans])
+    payments = numpy.array(
+        [loan.getStartingBalance() - loan.getEndingBalance()
+         + extraPayments.get(loan.getName(), 0.0) for loan in loans])
+    payments = numpy.maximum(payments, 0.0)
+
+    balance = getBalances(starting, rates, payments, maxPeriods)
+    previous = numpy.vstack([starting, balance[:-1]])
+    interest = numpy.where(previous > 0, previous * rates / 12, 0.0)
+    principal = previous - balance
+    payment = interest + principal
+
+    # Each schedule runs until the loan is paid off. Loans whose payment
+    # doesn't cover their interest never are, so they get no schedule.
+    amortizing = payments > starting * rates / 12
+    paidOff = balance == 0
+    periods = numpy.where(paidOff.any(axis=0), paidOff.argmax(axis=0) + 1,
+                          maxPeriods)
+    periods = numpy.where(amortizing | (starting == 0), periods, 0)
+    return [AmortizationSchedule(
+        loan, payment[:count, index], interest[:count, index],
+        principal[:count, index], balance[:count, index])
+            for index, (loan, count) in enumerate(zip(loans, periods))]
+
+class AmortizationSheet:
+    """Writes amortization schedules one after another down a sheet, each one
+    with a single setDataArray() call"""
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def write(self, schedules: List[AmortizationSchedule]):
+        clearSheet(self.sheet)
+        right = SCHEDULE_COLUMNS - 1
+        top = 0
+        for schedule in schedules:
+            title = schedule.getLoan().getName()
+            if not schedule.isPaidOff():
+                title += ' (not paid off at this rate)'
+            rows = ((title, '', '', '', ''),
+                    ('Period', 'Payment', 'Interest', 'Principal',
+                     'Balance')) + schedule.getRows()
+            bottom = top + len(rows) - 1
+            self.sheet.getCellRangeByPosition(
+                0, top, right, bottom).setDataArray(rows)
+            self.sheet.getCellRangeByPosition(
+                0, top, right, top + 1).setPropertyValue(
+                    'CharWeight', FontWeight.BOLD)
+            if schedule.getPeriods():
+                self.sheet.getCellRangeByPosition(
+                    1, top + 2, right, bottom).setPropertyValue(
+                        'NumberFormat', NumberFormat.CURRENCY)
+            top = bottom + 2
+
+def writeSchedules(backend: SheetBackend, month, extraPayments=None):
+    """Write the amortization schedules of the loans in the budget for month
+    to the amortization sheet"""
+    budget = MonthlyBudgetSheet(backend.getSheet(month + ' Budget')).read()
+    budget.calculateExpectedBalances()
+    schedules = getSchedules(budget.getLoans(), extraPayments)
+    with backend.updateSession('Amortization'):
+        AmortizationSheet(backend.getOrCreateSheet(AMORTIZATION_SHEET)).write(
+            schedules)
+
+###############################################################################
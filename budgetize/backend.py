@@ -0,0 +1,103 @@
+###############################################################################
+# NAME:             backend.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Interface to the document holding the sheets, so that the
+#                   budgetizer doesn't have to care whether it's talking to an
+#                   Office server or something else.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from contextlib import ExitStack, contextmanager
+
+class NoSuchSheetError(Exception):
+    pass
+
+class SheetBackend:
+    """A document containing named sheets. The sheets returned must support
+    the parts of the XSpreadsheet API used by the budgetizer:
+    getCellRangeByName, getCellRangeByPosition, getCellByPosition,
+    getDataArray/setDataArray, setPropertyValue, clearContents and
+    createCursor."""
+    def getSheet(self, name):
+        """Get the sheet named name, or raise NoSuchSheetError"""
+        raise NotImplementedError()
+
+    def createSheet(self, name):
+        """Insert a new, empty sheet named name into the document"""
+        raise NotImplementedError()
+
+    def getOrCreateSheet(self, name):
+        try:
+            return self.getSheet(name)
+        except NoSuchSheetError:
+            return self.createSheet(name)
+
+    @contextmanager
+    def updateSession(self, title='Budgetize'):
+        """Wraps a run of writes, so that the document can defer whatever it
+        would otherwise do after each one. Sessions may be nested."""
+        yield self
+
+    @contextmanager
+    def phase(self, name):
+        """Marks the sheet accesses made within it as belonging to the named
+        phase of a run, for backends which account for them"""
+        yield
+
+class UnoSheetBackend(SheetBackend):
+    """Sheets of an XSpreadsheetDocument, over the UNO bridge"""
+    def __init__(self, xSheetDoc):
+        self.sheetDoc = xSheetDoc
+        self.sessionDepth = 0
+
+    def getDocument(self):
+        return self.sheetDoc
+
+    def getSheet(self, name):
+        sheets = self.sheetDoc.getSheets()
+        if not sheets.hasByName(name):
+            raise NoSuchSheetError(name)
+        return sheets.getByName(name)
+
+    def createSheet(self, name):
+        sheet = self.sheetDoc.createInstance('com.sun.star.sheet.Spreadsheet')
+        self.sheetDoc.getSheets().insertByName(name, sheet)
+        return sheet
+
+    @contextmanager
+    def updateSession(self, title='Budgetize'):
+        """Stop the views repainting, defer recalculation and record a single
+        undo step, until the outermost session is over (however it ends)"""
+        if self.sessionDepth:
+            self.sessionDepth += 1
+            try:
+                yield self
+            finally:
+                self.sessionDepth -= 1
+            return
+
+        # Each step is undone on the way out, but only if it was taken, in
+        # case a later one fails.
+        document = self.sheetDoc
+        undoManager = document.getUndoManager()
+        automaticCalculation = document.isAutomaticCalculationEnabled()
+        with ExitStack() as stack:
+            document.lockControllers()
+            stack.callback(document.unlockControllers)
+            document.addActionLock()
+            stack.callback(document.removeActionLock)
+            document.enableAutomaticCalculation(False)
+            stack.callback(document.enableAutomaticCalculation,
+                           automaticCalculation)
+            undoManager.enterUndoContext(title)
+            stack.callback(undoManager.leaveUndoContext)
+            self.sessionDepth = 1
+            stack.callback(setattr, self, 'sessionDepth', 0)
+            yield self
+
+###############################################################################
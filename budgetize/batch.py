@@ -0,0 +1,76 @@
+###############################################################################
+# NAME:             batch.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Budgetize several months in one session.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import calendar
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from .backend import SheetBackend, NoSuchSheetError
+from .budgetizer import Budgetizer
+from .monthly.forms import MonthlyBudgetSheet
+
+def getBudgetedMonths(backend: SheetBackend) -> List[str]:
+    """Get the months of the year which have a budget sheet, in order"""
+    months = []
+    for month in calendar.month_name[1:]:
+        try:
+            backend.getSheet(month + ' Budget')
+            months.append(month)
+        except NoSuchSheetError:
+            pass
+    return months
+
+def computeMonth(job):
+    # Runs in a worker process, so it has to be picklable
+    budget, expenses = job
+    return Budgetizer.compute(budget, expenses)
+
+class BatchBudgetizer:
+    """Budgetizes a list of months. Every month's sheets are read before any
+    of them are computed, and none of them are written until all of them
+    have been computed, so the document is only touched in two passes, and
+    all the writes are made in one update session. The months don't depend
+    on each other, so they're computed in a pool of processes, unless
+    processes is 1."""
+    def __init__(self, backend: SheetBackend, months: List[str],
+                 defaults=None, processes=None):
+        self.backend = backend
+        self.months = months
+        self.defaults = defaults
+        self.processes = processes
+
+    def read(self):
+        budgetizers = [Budgetizer(self.backend, month, self.defaults)
+                       for month in self.months]
+        jobs = []
+        sheets = []
+        for budgetizer in budgetizers:
+            budget, budgetSheet = budgetizer.initBudgetSheet()
+            jobs.append((budget, budgetizer.initExpensesSheet()))
+            sheets.append(budgetSheet)
+        return jobs, sheets
+
+    def compute(self, jobs):
+        if self.processes == 1 or len(jobs) < 2:
+            return [computeMonth(job) for job in jobs]
+        with ProcessPoolExecutor(self.processes) as pool:
+            return list(pool.map(computeMonth, jobs))
+
+    def budgetize(self):
+        jobs, sheets = self.read()
+        budgets = self.compute(jobs)
+        title = 'Budgetize ' + ', '.join(self.months)
+        with self.backend.updateSession(title):
+            for budget, budgetSheet in zip(budgets, sheets):
+                MonthlyBudgetSheet(budgetSheet).write(budget)
+
+###############################################################################
@@ -7,59 +7,121 @@
 #
 # CREATED:          12/01/2021
 #
-# LAST EDITED:      03/02/2022
+# LAST EDITED:      10/18/2026
 ###
 
-from configparser import ConfigParser
-from appdirs import user_data_dir
-import uno
-from com.sun.star.container import NoSuchElementException
+from datetime import datetime
 
+from .backend import SheetBackend, NoSuchSheetError
+from .config import APP_NAME, APP_AUTHOR, getDefaultsPath
 from .monthly.budget import MonthlyBudget
 from .monthly.forms import MonthlyBudgetSheet
-from .monthly.expense import MonthlyExpenseSheet, MonthlyExpense
-
-APP_NAME = 'Budgetizer'
-APP_AUTHOR = "edtwardy"
+from .columnar import ExpenseTable
+from .monthly.expense import MonthlyExpenseSheet
 
 class Budgetizer:
-    def __init__(self, xSheetDoc, month):
-        self.sheetDoc = xSheetDoc
+    def __init__(self, backend: SheetBackend, month, defaults=None):
+        """defaults is a ConfigParser holding the template for new budgets. If
+        it's not provided, it's read from defaults.ini in the user data
+        directory when needed."""
+        self.backend = backend
         self.month = month
+        self.defaults = defaults
+
+    def getDefaults(self):
+        """Returns a ConfigParser. defaults.ini is only needed to create a new
+        budget, so neither it nor the modules to read it are loaded until
+        then."""
+        if self.defaults is None:
+            from configparser import ConfigParser
+            config = ConfigParser()
+            config.optionxform=str
+            config.read(getDefaultsPath())
+            self.defaults = config
+        return self.defaults
 
     def initBudgetSheet(self):
         sheetName = self.month + ' Budget'
         try:
-            monthlySheet = self.sheetDoc.getSheets().getByName(sheetName)
+            monthlySheet = self.backend.getSheet(sheetName)
             monthlyBudget = MonthlyBudgetSheet(monthlySheet).read()
-        except NoSuchElementException:
-            monthlySheet = self.sheetDoc.createInstance(
-                'com.sun.star.sheet.Spreadsheet')
-            self.sheetDoc.getSheets().insertByName(sheetName, monthlySheet)
-            config = ConfigParser()
-            config.optionxform=str
-            config.read(user_data_dir(APP_NAME, APP_AUTHOR) + '/defaults.ini')
-            monthlyBudget = MonthlyBudget.defaults(config)
+        except NoSuchSheetError:
+            monthlySheet = self.backend.createSheet(sheetName)
+            monthlyBudget = MonthlyBudget.defaults(self.getDefaults())
         return (monthlyBudget, monthlySheet)
 
-    def initExpensesSheet(self):
+    def initExpensesSheet(self) -> ExpenseTable:
         sheetName = self.month + ' Expenses'
         try:
-            expenseSheet = self.sheetDoc.getSheets().getByName(sheetName)
-            monthlyExpenses = MonthlyExpenseSheet(expenseSheet).read()
-        except NoSuchElementException:
-            expenseSheet = self.sheetDoc.createInstance(
-                'com.sun.star.sheet.Spreadsheet')
-            self.sheetDoc.getSheets().insertByName(sheetName, expenseSheet)
-            monthlyExpenses = []
-            MonthlyExpenseSheet(expenseSheet).write(monthlyExpenses)
+            expenseSheet = self.backend.getSheet(sheetName)
+            monthlyExpenses = MonthlyExpenseSheet(expenseSheet).readTable()
+        except NoSuchSheetError:
+            expenseSheet = self.backend.createSheet(sheetName)
+            monthlyExpenses = ExpenseTable()
+            MonthlyExpenseSheet(expenseSheet).write([])
         return monthlyExpenses
 
-    def budgetize(self):
-        (budget, budgetSheet) = self.initBudgetSheet()
-        expenses = self.initExpensesSheet()
+    def applyExpensesIncrementally(self, budget: MonthlyBudget):
+        """Apply only the expense rows which were appended since the last
+        checkpoint, unless the rows it covers or the budget have changed, and
+        checkpoint the result."""
+        from .monthly.checkpoint import (
+            MonthlyCheckpoint, MonthlyCheckpointSheet, hashBudgetInputs)
+        try:
+            expenseSheet = self.backend.getSheet(self.month + ' Expenses')
+        except NoSuchSheetError:
+            budget.applyExpenses(self.initExpensesSheet())
+            return
+
+        expenseForm = MonthlyExpenseSheet(expenseSheet)
+        checkpointForm = MonthlyCheckpointSheet(
+            self.backend.getOrCreateSheet(self.month + ' Checkpoint'))
+        rows = expenseForm.getDataArray()
+        budgetHash = hashBudgetInputs(budget)
+        checkpoint = checkpointForm.read()
+        start = 0
+        if checkpoint and checkpoint.matches(budgetHash, rows):
+            checkpoint.restore(budget)
+            start = checkpoint.getAppliedRows()
+
+        # Expenses dated in the future are skipped, but will have to be
+        # applied once they've happened, so the checkpoint stops at the first
+        # one of them.
+        expenses = expenseForm.readTable(start)
+        now = datetime.now()
+        prefix = 0
+        while prefix < len(expenses) \
+              and expenses.getItem(prefix).getDate() <= now:
+            prefix += 1
+        budget.applyExpenses(expenses.take(range(prefix)), now)
+        checkpointForm.write(MonthlyCheckpoint.capture(
+            budget, rows[:start + prefix], budgetHash))
+        budget.applyExpenses(expenses.take(range(prefix, len(expenses))),
+                             now)
+
+    @staticmethod
+    def compute(budget: MonthlyBudget, expenses) -> MonthlyBudget:
+        """The part of budgetizing that doesn't touch the document"""
         budget.calculateExpectedBalances()
         budget.applyExpenses(expenses)
-        MonthlyBudgetSheet(budgetSheet).write(budget)
+        return budget
+
+    def budgetize(self, incremental=False):
+        """If incremental is set, only the expenses appended since the last
+        incremental run are applied (see applyExpensesIncrementally)"""
+        with self.backend.updateSession(f'Budgetize {self.month}'):
+            with self.backend.phase('read budget'):
+                (budget, budgetSheet) = self.initBudgetSheet()
+            if incremental:
+                budget.calculateExpectedBalances()
+                with self.backend.phase('apply incrementally'):
+                    self.applyExpensesIncrementally(budget)
+            else:
+                with self.backend.phase('read expenses'):
+                    expenses = self.initExpensesSheet()
+                with self.backend.phase('apply'):
+                    Budgetizer.compute(budget, expenses)
+            with self.backend.phase('write'):
+                MonthlyBudgetSheet(budgetSheet).write(budget)
 
 ###############################################################################
@@ -7,80 +7,185 @@
 #
 # CREATED:          12/03/2021
 #
-# LAST EDITED:      02/03/2022
+# LAST EDITED:      10/18/2026
 ###
 
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable
 
-from .account import Account, AccountHistorySummaryForm
+from .account import AccountHistorySummary, AccountHistorySummaryForm
+from .backend import SheetBackend
 from .cellformat import NumberFormat
-from .cellname import getCellNameFromCoordinates
+from .cellname import RangeAddress, ROW_MAX
 from .cellrange import CellMatrix, CellRow
+from .columnar import TransactionTable
+from .sheet import SheetTable
+from .transaction import (
+    RecurringTransactionForm, TransactionForm, TransactionLedger,
+    usePersistentCache)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Number of burndown rows held in the write buffer before it's flushed
+BURNDOWN_FLUSH_ROWS = 1024
+
+RECURRING_SHEET = 'Recurring'
+NON_RECURRING_SHEET = 'Non Recurring'
+BALANCES_SHEET = 'Balances'
+BURNDOWN_TABLE_SHEET = 'Burndown Table'
 
 class BurndownCalculator:
     def __init__(self, transactions, balances: AccountHistorySummaryForm,
-                 burndownTableSheet):
+                 burndownTableSheet, backend: SheetBackend=None):
+        """If the sheets belong to backend, the run is made in an update
+        session of its document"""
         self.transactions = transactions
         self.balances = balances
         self.burndownTableSheet = burndownTableSheet
+        self.backend = backend or SheetBackend()
 
     @staticmethod
     def getAccounts(balances: AccountHistorySummaryForm):
         """Assemble dictionary of accounts"""
-        accounts = list(map(
-            lambda a: Account(a.getName(), a.getStartingBalance()),
-            balances.read()))
-        accountNames = map(lambda a: a.getName(), accounts)
+        accounts = balances.read()
+        accountNames = map(lambda a: a.getAccountName(), accounts)
         return dict(zip(accountNames, accounts))
 
     @staticmethod
-    def getBurndownEntries(transactions, accounts, startDate, endDate):
-        """Write transactions to burndown table"""
-        entries = []
+    def getBurndownEntries(transactions,
+                           accounts: Dict[str, AccountHistorySummary],
+                           startDate, endDate):
+        """Generate the entries of the burndown table, applying each
+        transaction to its account as the entries are consumed. Entries only
+        record the new balance of the affected account."""
+        startDate = datetime.strptime(startDate, '%m/%d/%y')
+        endDate = datetime.strptime(endDate, '%m/%d/%y')
+        accountIndices = {name: index for index, name in enumerate(accounts)}
         for transaction in transactions:
-            if transaction.date < datetime.strptime(startDate, '%m/%d/%y'):
+            if transaction.date < startDate:
                 continue
-            if transaction.date > datetime.strptime(endDate, '%m/%d/%y'):
+            if transaction.date > endDate:
                 break
 
             affectedAccount = accounts[transaction.accountName]
             transaction.applyToAccount(affectedAccount)
-
-            balances = list(map(lambda a: a.getBalance(), accounts.values()))
-            entries.append(BurndownEntry(transaction, balances))
-        return entries
+            yield BurndownEntry(
+                transaction, accountIndices[transaction.accountName],
+                affectedAccount.getCurrentBalance())
 
     @staticmethod
     def writeFinalBalances(balances: AccountHistorySummaryForm,
-                           accounts: List[Account]):
-        summaries = list(map(lambda a: a.getHistorySummary(),
-                             accounts.values()))
-        balances.write(summaries)
+                           accounts: Dict[str, AccountHistorySummary]):
+        balances.write(list(accounts.values()))
 
     def run(self, startDate, endDate):
-        accounts = BurndownCalculator.getAccounts(self.balances)
-        bottomCorner = getCellNameFromCoordinates(
-            4 + len(accounts) + - 1,
-            len(self.transactions) + 1)
+        with self.backend.updateSession('Burndown'):
+            self.burndown(startDate, endDate)
 
-        table = CellMatrix(f'A1:{bottomCorner}', self.burndownTableSheet)
+    def burndown(self, startDate, endDate):
+        accounts = BurndownCalculator.getAccounts(self.balances)
+        table = CellMatrix(RangeAddress(0, 0, 4 + len(accounts) - 1, ROW_MAX),
+                           self.burndownTableSheet, buffered=True)
         entries = BurndownCalculator.getBurndownEntries(
             self.transactions, accounts, startDate, endDate)
         BurndownForm(table, accounts).write(startDate, entries)
         BurndownCalculator.writeFinalBalances(self.balances, accounts)
 
+class VectorizedBurndownCalculator(BurndownCalculator):
+    """Computes the whole burndown table at once with NumPy, and writes it to
+    the sheet as a single block. Much faster than BurndownCalculator for
+    large ledgers, but the table is held in memory."""
+    def __init__(self, transactions, balances: AccountHistorySummaryForm,
+                 burndownTableSheet, backend: SheetBackend=None):
+        if numpy is None:
+            raise RuntimeError('The vectorized burndown requires numpy')
+        super().__init__(transactions, balances, burndownTableSheet, backend)
+
+    @staticmethod
+    def getBalanceMatrix(transactions,
+                         accounts: Dict[str, AccountHistorySummary],
+                         startDate, endDate):
+        """Returns the transactions in the window, and a matrix holding the
+        balance of every account after each of them. If transactions is a
+        TransactionTable, its columns are used as they are, and the
+        transactions are returned as a TransactionTable."""
+        if isinstance(transactions, TransactionTable):
+            count = len(transactions)
+            dates = transactions.getValues('date')
+            amounts = transactions.getValues('amount')
+        else:
+            transactions = list(transactions)
+            count = len(transactions)
+            dates = numpy.fromiter(
+                (t.date.toordinal() for t in transactions), numpy.int64,
+                count)
+            amounts = numpy.fromiter(
+                (t.amount for t in transactions), numpy.float64, count)
+
+        # Same as the loop: skip transactions before the window, and stop at
+        # the first one after it.
+        startDate = datetime.strptime(startDate, '%m/%d/%y').toordinal()
+        endDate = datetime.strptime(endDate, '%m/%d/%y').toordinal()
+        after = numpy.flatnonzero(dates > endDate)
+        stop = after[0] if after.size else count
+        window = numpy.flatnonzero(dates[:stop] >= startDate)
+
+        # Like the loop, only the accounts of transactions in the window have
+        # to be in the balances.
+        accountIndices = {name: index for index, name in enumerate(accounts)}
+        if isinstance(transactions, TransactionTable):
+            accountColumn = transactions.getColumn('accountName')
+            codes = accountColumn.getValues()[window]
+            lookup = numpy.array(
+                [accountIndices.get(name, -1)
+                 for name in accountColumn.values] or [-1],
+                dtype=numpy.int64)
+            indices = lookup[codes]
+            missing = numpy.flatnonzero(indices < 0)
+            if missing.size:
+                raise KeyError(accountColumn.values[codes[missing[0]]])
+        else:
+            indices = numpy.fromiter(
+                (accountIndices[transactions[i].accountName] for i in window),
+                numpy.int64, window.size)
+
+        deltas = numpy.zeros((window.size, len(accounts)))
+        deltas[numpy.arange(window.size), indices] = amounts[window]
+        startingBalances = numpy.array(
+            [a.getCurrentBalance() for a in accounts.values()])
+        matrix = numpy.cumsum(deltas, axis=0) + startingBalances
+        if isinstance(transactions, TransactionTable):
+            return transactions.take(window), matrix
+        return [transactions[i] for i in window], matrix
+
+    def burndown(self, startDate, endDate):
+        accounts = BurndownCalculator.getAccounts(self.balances)
+        table = CellMatrix(RangeAddress(0, 0, 4 + len(accounts) - 1, ROW_MAX),
+                           self.burndownTableSheet, buffered=True)
+        transactions, matrix = VectorizedBurndownCalculator.getBalanceMatrix(
+            self.transactions, accounts, startDate, endDate)
+        BurndownForm(table, accounts).writeMatrix(
+            startDate, transactions, matrix)
+        if len(transactions):
+            for account, balance in zip(accounts.values(), matrix[-1]):
+                account.updateBalance(balance - account.getCurrentBalance())
+        BurndownCalculator.writeFinalBalances(self.balances, accounts)
+
 ###############################################################################
 # BurndownForm
 ###
 
 class BurndownEntry:
-    def __init__(self, transaction, balances):
+    def __init__(self, transaction, accountIndex, balance):
         self.date = transaction.date
         self.description = transaction.description
         self.amount = transaction.amount
         self.accountName = transaction.accountName
-        self.balances = balances
+        self.accountIndex = accountIndex
+        self.balance = balance
 
     def getDate(self):
         return self.date
@@ -94,14 +199,19 @@ class BurndownEntry:
     def getAccountName(self):
         return self.accountName
 
-    def getBalances(self):
-        return self.balances
+    def getAccountIndex(self):
+        """Index of the affected account in the balance columns"""
+        return self.accountIndex
+
+    def getBalance(self):
+        """Balance of the affected account after the transaction"""
+        return self.balance
 
 class BurndownRecord:
     def __init__(self, cellrange: CellRow):
         self.cellrange = cellrange
 
-    def write(self, entry: BurndownEntry):
+    def write(self, entry: BurndownEntry, balances):
         iterator = iter(self.cellrange)
         next(iterator).String = datetime.strftime(entry.getDate(), '%m/%d/%y')
         next(iterator).String = entry.getDescription()
@@ -110,17 +220,18 @@ class BurndownRecord:
         amountField.NumberFormat = NumberFormat.CURRENCY
         next(iterator).String = entry.getAccountName()
 
-        for balance in entry.getBalances():
+        for balance in balances:
             balanceField = next(iterator)
             balanceField.Value = balance
             balanceField.NumberFormat = NumberFormat.CURRENCY
 
 class BurndownForm:
-    def __init__(self, cellrange: CellMatrix, accounts: dict[str, Account]):
+    def __init__(self, cellrange: CellMatrix,
+                 accounts: Dict[str, AccountHistorySummary]):
         self.cellrange = cellrange
         self.startingBalances = {}
         for name in accounts:
-            self.startingBalances[name] = accounts[name].getBalance()
+            self.startingBalances[name] = accounts[name].getCurrentBalance()
 
     @staticmethod
     def writeHeaders(iterator, headers):
@@ -138,15 +249,82 @@ class BurndownForm:
             balanceField.Value = balance
             balanceField.NumberFormat = NumberFormat.CURRENCY
 
-    def write(self, startDate, entries: List[BurndownRecord]):
+    def writeHeaderRows(self, startDate):
         headers = ['Date', 'Description', 'Amount', 'Account',
                    *self.startingBalances.keys()]
         iterator = iter(self.cellrange)
         BurndownForm.writeHeaders(iter(next(iterator)), headers)
         BurndownForm.writeInitialBalances(
             iter(next(iterator)), startDate, self.startingBalances.values())
+        return iterator
+
+    def writeMatrix(self, startDate, transactions, matrix):
+        """Write the rows for transactions, with the balances from matrix, as
+        one block."""
+        self.writeHeaderRows(startDate)
+        self.cellrange.flush()
+        rows = tuple(
+            (datetime.strftime(t.date, '%m/%d/%y'), t.description,
+             float(t.amount), t.accountName, *balances)
+            for t, balances in zip(transactions, matrix.tolist()))
+        if not rows:
+            return
+        self.cellrange.writeBlock(0, 2, rows)
+        lastRow = len(rows) + 1
+        self.cellrange.setBlockProperty(
+            2, 2, 2, lastRow, 'NumberFormat', NumberFormat.CURRENCY)
+        self.cellrange.setBlockProperty(
+            4, 1, 3 + len(self.startingBalances), lastRow, 'NumberFormat',
+            NumberFormat.CURRENCY)
+
+    def write(self, startDate, entries: Iterable[BurndownEntry]):
+        """Write the table as the entries are generated. The balances of every
+        account are carried from row to row, and the cellrange is flushed
+        every BURNDOWN_FLUSH_ROWS rows, so memory use doesn't grow with the
+        length of the table."""
+        iterator = self.writeHeaderRows(startDate)
+        balances = list(self.startingBalances.values())
+        for index, entry in enumerate(entries):
+            balances[entry.getAccountIndex()] = entry.getBalance()
+            BurndownRecord(next(iterator)).write(entry, balances)
+            if (index + 1) % BURNDOWN_FLUSH_ROWS == 0:
+                self.cellrange.flush()
+        self.cellrange.flush()
+
+###############################################################################
+# Running the Burndown
+###
+
+def getLedger(backend: SheetBackend) -> TransactionLedger:
+    return TransactionLedger(
+        RecurringTransactionForm(SheetTable(
+            'A1', 4, backend.getSheet(RECURRING_SHEET), snapshot=True)),
+        TransactionForm(SheetTable(
+            'A1', 4, backend.getSheet(NON_RECURRING_SHEET), snapshot=True)))
 
-        for entry in entries:
-            BurndownRecord(next(iterator)).write(entry)
+def runBurndown(backend: SheetBackend, startDate, endDate, vectorized=None,
+                cachePath=None):
+    """Write the burndown table of the ledger in the document, from startDate
+    through endDate (both like 12/31/21). The VectorizedBurndownCalculator is
+    used if numpy is available, unless vectorized says otherwise. Otherwise
+    the ledger is merged into the BurndownCalculator as it goes. Recurring
+    transactions are expanded through the occurrence cache at cachePath (see
+    usePersistentCache), which is saved afterwards."""
+    if vectorized is None:
+        vectorized = numpy is not None
+    cache = usePersistentCache(cachePath)
+    ledger = getLedger(backend)
+    balances = AccountHistorySummaryForm(backend.getSheet(BALANCES_SHEET))
+    burndownTableSheet = backend.getOrCreateSheet(BURNDOWN_TABLE_SHEET)
+    if vectorized:
+        calculator = VectorizedBurndownCalculator(
+            ledger.getTransactionTable(startDate, endDate), balances,
+            burndownTableSheet, backend)
+    else:
+        calculator = BurndownCalculator(
+            ledger.iterTransactions(startDate, endDate), balances,
+            burndownTableSheet, backend)
+    calculator.run(startDate, endDate)
+    cache.save()
 
 ###############################################################################
@@ -7,13 +7,72 @@
 #
 # CREATED:          12/03/2021
 #
-# LAST EDITED:      02/06/2022
+# LAST EDITED:      10/18/2026
 ###
 
-from com.sun.star.util import NumberFormat
+from datetime import datetime
+
+from . import constants
+
+# Dates are stored by Calc as a number of days since this epoch
+DATE_EPOCH = datetime(1899, 12, 30)
 
 class NumberFormat:
-    CURRENCY = NumberFormat.CURRENCY | NumberFormat.SCIENTIFIC \
-        | NumberFormat.FRACTION
+    CURRENCY = constants.NumberFormat.CURRENCY \
+        | constants.NumberFormat.SCIENTIFIC | constants.NumberFormat.FRACTION
+
+def getStyleRuns(cells):
+    """Group cells sharing the same value for a property into rectangles.
+    cells is {(column, row): value}, and the result is a list of
+    (left, top, right, bottom, value)."""
+    byColumn = {}
+    for (column, row), value in cells.items():
+        byColumn.setdefault(column, []).append((row, value))
+
+    runs = []
+    openRuns = {}
+    for column in sorted(byColumn):
+        # Collect the vertical runs in this column...
+        verticalRuns = []
+        for row, value in sorted(byColumn[column]):
+            if verticalRuns and verticalRuns[-1][1] == row - 1 \
+               and verticalRuns[-1][2] == value:
+                verticalRuns[-1][1] = row
+            else:
+                verticalRuns.append([row, row, value])
+
+        # ...and widen the identical runs of the column to the left.
+        currentRuns = {}
+        for top, bottom, value in verticalRuns:
+            run = openRuns.get((top, bottom, value), None)
+            if run is None or run[2] != column - 1:
+                run = [column, top, column, bottom, value]
+                runs.append(run)
+            else:
+                run[2] = column
+            currentRuns[(top, bottom, value)] = run
+        openRuns = currentRuns
+    return [tuple(run) for run in runs]
+
+class StyleBuffer:
+    """Records the properties assigned to individual cells, so that they can be
+    applied to whole rectangles of cells at once."""
+    def __init__(self):
+        self.properties = {}
+
+    def getProperty(self, column, row, name):
+        return self.properties.get(name, {}).get((column, row), None)
+
+    def setProperty(self, column, row, name, value):
+        self.properties.setdefault(name, {})[(column, row)] = value
+
+    def apply(self, xIndexAccess):
+        """Set each property with one call per rectangle of cells sharing its
+        value, and forget about them."""
+        for name, cells in self.properties.items():
+            for left, top, right, bottom, value in getStyleRuns(cells):
+                xIndexAccess.getCellRangeByPosition(
+                    left, top, right, bottom).setPropertyValue(name, value)
+        self.properties = {}
 
 ###############################################################################
@@ -7,7 +7,7 @@
 #
 # CREATED:          12/02/2021
 #
-# LAST EDITED:      12/02/2021
+# LAST EDITED:      10/18/2026
 ###
 
 import re
@@ -29,23 +29,153 @@ def getColumnNameFromIndex(index):
     rowBytes = []
     index += 1
     while index > 0:
-        rem = index % 26
-        index //= 26
-        rowBytes.insert(0, rem + 64)
+        index, rem = divmod(index - 1, 26)
+        rowBytes.insert(0, rem + 65)
     return bytearray(rowBytes).decode('ascii')
 
+# Every column's name, and the reverse, so that hot loops don't have to
+# compute them.
+COLUMN_NAMES = tuple(getColumnNameFromIndex(index)
+                     for index in range(COLUMN_MAX + 1))
+COLUMN_INDICES = {name: index for index, name in enumerate(COLUMN_NAMES)}
+
 def getCoordinatesFromCellName(spec):
     match = re.match(CELLRANGE_RE, spec)
     if not match:
         return None
 
-    column = getIndexFromColumnName(match.group(1))
+    column = COLUMN_INDICES.get(match.group(1), None)
     row = int(match.group(2)) - 1
-    if column > COLUMN_MAX or row > ROW_MAX:
+    if column is None or row > ROW_MAX:
         return None
     return (column, row)
 
 def getCellNameFromCoordinates(column, row):
-    return f'{getColumnNameFromIndex(column)}{row + 1}'
+    return f'{COLUMN_NAMES[column]}{row + 1}'
+
+class RangeAddress:
+    """Immutable address of a rectangle of cells, optionally on a named sheet.
+    Bounds are zero-indexed and inclusive, like a UNO CellRangeAddress. Rows
+    and columns given to the methods are relative to the top left corner, like
+    they are in getCellRangeByPosition(). A range may be empty (like the rows
+    of a table with only headers), in which case right is left - 1 or bottom
+    is top - 1."""
+    __slots__ = ('left', 'top', 'right', 'bottom', 'sheet')
+
+    def __init__(self, left, top, right, bottom, sheet=None):
+        if right < left - 1 or bottom < top - 1:
+            raise ValueError(
+                f'({left}, {top}, {right}, {bottom}) is not a range')
+        object.__setattr__(self, 'left', left)
+        object.__setattr__(self, 'top', top)
+        object.__setattr__(self, 'right', right)
+        object.__setattr__(self, 'bottom', bottom)
+        object.__setattr__(self, 'sheet', sheet)
+
+    @staticmethod
+    def parse(spec, sheet=None):
+        """Parse an A1-style spec, like 'A1:D20' or 'B3'"""
+        firstSpec, _, secondSpec = spec.partition(':')
+        first = getCoordinatesFromCellName(firstSpec)
+        second = getCoordinatesFromCellName(secondSpec or firstSpec)
+        if first is None or second is None:
+            raise ValueError(f'Poorly formed range spec: {spec}')
+        return RangeAddress(*first, *second, sheet)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('RangeAddress is immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, RangeAddress):
+            return NotImplemented
+        return self.getBounds() == other.getBounds() \
+            and self.sheet == other.sheet
+
+    def __hash__(self):
+        return hash((self.getBounds(), self.sheet))
+
+    def __repr__(self):
+        sheet = f', {self.sheet!r}' if self.sheet is not None else ''
+        return f'RangeAddress({self.getName()}{sheet})'
+
+    def __str__(self):
+        return self.getName()
+
+    def __len__(self):
+        return self.getRows()
+
+    def __getitem__(self, index):
+        """Rows of the range: an int gets a single row, a slice a (possibly
+        empty) run of them"""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.getRows())
+            if step != 1:
+                raise IndexError(f'{index} is not a run of rows')
+            return RangeAddress(self.left, self.top + start, self.right,
+                                self.top + max(stop, start) - 1, self.sheet)
+        if index < 0:
+            index += self.getRows()
+        if not 0 <= index < self.getRows():
+            raise IndexError(f'Row {index} is outside of {self}')
+        return self.getSubRange(0, index, self.getColumns() - 1, index)
+
+    def getSheet(self):
+        return self.sheet
+
+    def getBounds(self):
+        """(left, top, right, bottom), for getCellRangeByPosition()"""
+        return (self.left, self.top, self.right, self.bottom)
+
+    def getColumns(self):
+        return self.right - self.left + 1
+
+    def getRows(self):
+        return self.bottom - self.top + 1
+
+    def isEmpty(self):
+        return self.getRows() == 0 or self.getColumns() == 0
+
+    def getName(self):
+        first = getCellNameFromCoordinates(self.left, self.top)
+        if self.left == self.right and self.top == self.bottom:
+            return first
+        return first + ':' + getCellNameFromCoordinates(
+            self.right, self.bottom)
+
+    def getCellName(self, column, row):
+        return getCellNameFromCoordinates(self.left + column, self.top + row)
+
+    def getSubRange(self, left, top, right, bottom):
+        if right >= self.getColumns() or bottom >= self.getRows():
+            raise IndexError(
+                f'({left}, {top}, {right}, {bottom}) is outside of {self}')
+        return RangeAddress(self.left + left, self.top + top,
+                            self.left + right, self.top + bottom, self.sheet)
+
+    def offset(self, columns, rows):
+        return RangeAddress(self.left + columns, self.top + rows,
+                            self.right + columns, self.bottom + rows,
+                            self.sheet)
+
+    def contains(self, column, row):
+        """Whether the cell at absolute (column, row) is in the range"""
+        return self.left <= column <= self.right \
+            and self.top <= row <= self.bottom
+
+    def intersect(self, other):
+        """The range covered by both, or None if they don't overlap"""
+        if self.sheet != other.sheet:
+            return None
+        left, top = max(self.left, other.left), max(self.top, other.top)
+        right = min(self.right, other.right)
+        bottom = min(self.bottom, other.bottom)
+        if right < left or bottom < top:
+            return None
+        return RangeAddress(left, top, right, bottom, self.sheet)
+
+    def getCellRange(self, xSheet):
+        """The range at this address on xSheet"""
+        return xSheet.getCellRangeByPosition(
+            self.left, self.top, self.right, self.bottom)
 
 ###############################################################################
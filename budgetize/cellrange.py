@@ -10,13 +10,176 @@
 #
 # CREATED:          12/01/2021
 #
-# LAST EDITED:      02/06/2022
+# LAST EDITED:      10/18/2026
 ###
 
-from . import cellname
+from .cellname import RangeAddress, getCellNameFromCoordinates
+from .cellformat import StyleBuffer, getStyleRuns
 
 RowAccessor = lambda i, dim, access: access.getCellByPosition(i, dim)
 
+# Number of rows fetched by each getDataArray() call in snapshot mode
+SNAPSHOT_BLOCK_ROWS = 1024
+
+class SnapshotCell:
+    """Read-only cell backed by an element of a getDataArray() result"""
+    def __init__(self, data, column, row, xIndexAccess):
+        self.data = data
+        self.column = column
+        self.row = row
+        self.xIndexAccess = xIndexAccess
+
+    @property
+    def String(self):
+        if self.data is None:
+            return ''
+        if isinstance(self.data, str):
+            return self.data
+        # The display string of a numeric cell depends on its number format,
+        # which getDataArray() doesn't tell us, so ask the cell for it.
+        return self.xIndexAccess.getCellByPosition(
+            self.column, self.row).String
+
+    @property
+    def Value(self):
+        if self.data is None or isinstance(self.data, str):
+            return 0.0
+        return self.data
+
+class SnapshotAccess:
+    """Stands in for a cell range, answering getCellByPosition() from blocks of
+    rows which are each read with a single getDataArray() call."""
+    def __init__(self, xIndexAccess, rows, columns,
+                 blockRows=SNAPSHOT_BLOCK_ROWS):
+        self.xIndexAccess = xIndexAccess
+        self.rows = rows
+        self.columns = columns
+        self.blockRows = blockRows
+        self.blocks = {}
+
+    def getBlock(self, index):
+        if index not in self.blocks:
+            top = index * self.blockRows
+            bottom = min(top + self.blockRows, self.rows) - 1
+            self.blocks[index] = self.xIndexAccess.getCellRangeByPosition(
+                0, top, self.columns - 1, bottom).getDataArray()
+        return self.blocks[index]
+
+    def getDataArray(self):
+        rows = []
+        for index in range((self.rows + self.blockRows - 1) // self.blockRows):
+            rows.extend(self.getBlock(index))
+        return tuple(rows)
+
+    def getCellByPosition(self, column, row):
+        if row >= self.rows or column >= self.columns:
+            raise IndexError(f'({column}, {row}) is outside of the snapshot')
+        block = self.getBlock(row // self.blockRows)
+        return SnapshotCell(block[row % self.blockRows][column], column, row,
+                            self.xIndexAccess)
+
+class BufferedCell:
+    """Cell whose assignments are recorded in a WriteBuffer, instead of being
+    sent to the sheet immediately."""
+    def __init__(self, column, row, buffer):
+        self.__dict__.update(column=column, row=row, buffer=buffer)
+
+    def __getattr__(self, name):
+        if name in ('String', 'Value'):
+            data = self.buffer.getData(self.column, self.row)
+            if data is not None:
+                if name == 'String':
+                    return data if isinstance(data, str) else str(data)
+                return 0.0 if isinstance(data, str) else data
+        else:
+            value = self.buffer.styles.getProperty(self.column, self.row, name)
+            if value is not None:
+                return value
+        return getattr(self.buffer.xIndexAccess.getCellByPosition(
+            self.column, self.row), name)
+
+    def __setattr__(self, name, value):
+        if name == 'String':
+            self.buffer.setData(self.column, self.row, str(value))
+        elif name == 'Value':
+            self.buffer.setData(self.column, self.row, float(value))
+        else:
+            self.buffer.styles.setProperty(self.column, self.row, name, value)
+
+class WriteBuffer:
+    """Stands in for a cell range, collecting the contents assigned to its
+    cells until flush() writes each contiguous block of them with a single
+    setDataArray() call. Other properties, like NumberFormat, are applied to
+    whole rectangles of cells sharing the same value."""
+    def __init__(self, xIndexAccess):
+        self.xIndexAccess = xIndexAccess
+        self.rows = {}
+        self.styles = StyleBuffer()
+
+    def getCellByPosition(self, column, row):
+        return BufferedCell(column, row, self)
+
+    def getData(self, column, row):
+        return self.rows.get(row, {}).get(column, None)
+
+    def setData(self, column, row, data):
+        self.rows.setdefault(row, {})[column] = data
+
+    @staticmethod
+    def getRuns(columns):
+        """Split a sorted list of column indices into contiguous runs"""
+        runs = []
+        for column in columns:
+            if runs and runs[-1][1] == column - 1:
+                runs[-1][1] = column
+            else:
+                runs.append([column, column])
+        return [tuple(run) for run in runs]
+
+    def getBlocks(self):
+        """Group the buffered cells into rectangles: (left, top, rows)"""
+        blocks = []
+        openBlocks = {}
+        for row in sorted(self.rows):
+            cells = self.rows[row]
+            current = {}
+            for run in WriteBuffer.getRuns(sorted(cells)):
+                block = openBlocks.get(run, None)
+                if block is None or block[1] + len(block[2]) != row:
+                    block = (run[0], row, [])
+                    blocks.append(block)
+                block[2].append(tuple(
+                    cells[column] for column in range(run[0], run[1] + 1)))
+                current[run] = block
+            openBlocks = current
+        return blocks
+
+    def diff(self, baseline):
+        """Forget the buffered contents which are the same in baseline (a
+        SnapshotAccess), and return the rectangles of cells which have
+        contents in baseline, but not in this buffer."""
+        stale = {}
+        for row, data in enumerate(baseline.getDataArray()):
+            cells = self.rows.get(row, {})
+            for column, previous in enumerate(data):
+                if column in cells:
+                    if cells[column] == previous:
+                        del cells[column]
+                elif previous is not None and previous != '':
+                    stale[(column, row)] = True
+            if not cells:
+                self.rows.pop(row, None)
+        return [run[:4] for run in getStyleRuns(stale)]
+
+    def flush(self):
+        for left, top, rows in self.getBlocks():
+            right = left + len(rows[0]) - 1
+            bottom = top + len(rows) - 1
+            self.xIndexAccess.getCellRangeByPosition(
+                left, top, right, bottom).setDataArray(tuple(rows))
+        self.styles.apply(self.xIndexAccess)
+        self.rows = {}
+
 class CellRowIterator:
     def __init__(self, row, columns, xIndexAccess):
         self.row = row
@@ -29,17 +192,15 @@ class CellRowIterator:
             raise StopIteration()
         index = self.index
         self.index += 1
-        cell = RowAccessor(index, self.row, self.xIndexAccess)
-        cell.__dict__['position'] = \
-            f'{cellname.getColumnNameFromIndex(index)}{self.row + 1}'
-        return cell
+        return RowAccessor(index, self.row, self.xIndexAccess)
 
 class CellRow:
     def __init__(self, **kwargs):
         """Two forms, really:
-        1. spec, accessor
-        2. row, columns, accessor
-        """
+        1. spec (a string or RangeAddress), accessor[, buffered]
+        2. row, columns, accessor[, address]
+        In the second form, row is relative to address, the address of the
+        matrix the row belongs to."""
         if 'spec' in kwargs:
             self.initString(kwargs)
         else:
@@ -47,21 +208,22 @@ class CellRow:
 
     def initString(self, kwargs):
         spec = kwargs.get('spec', None)
-        firstSpec, secondSpec = tuple(spec.split(':'))
-        firstColumn, firstRow = cellname.getCoordinatesFromCellName(firstSpec)
-        secondColumn, secondRow = cellname.getCoordinatesFromCellName(
-            secondSpec)
-        self.xIndexAccess = kwargs.get(
-            'accessor', None).getCellRangeByName(spec)
-        if firstRow != secondRow:
+        self.address = spec if isinstance(spec, RangeAddress) \
+            else RangeAddress.parse(spec)
+        if self.address.getRows() != 1:
             raise RuntimeError(f'Poorly formed spec ({spec}) for CellRow!')
-        self.columns = secondColumn - firstColumn + 1
-        self.row = firstRow
+        self.xIndexAccess = self.address.getCellRange(
+            kwargs.get('accessor', None))
+        self.columns = self.address.getColumns()
+        self.row = 0
+        if kwargs.get('buffered', False):
+            self.xIndexAccess = WriteBuffer(self.xIndexAccess)
 
     def initIndex(self, kwargs):
         self.row = kwargs.get('row')
         self.columns = kwargs.get('columns', None)
         self.xIndexAccess = kwargs.get('accessor', None)
+        self.address = kwargs.get('address', None)
 
     def __iter__(self):
         return CellRowIterator(self.row, self.columns, self.xIndexAccess)
@@ -75,12 +237,25 @@ class CellRow:
     def getItem(self, index):
         return RowAccessor(index, self.row, self.xIndexAccess)
 
+    def getPosition(self, index):
+        """The A1-style name of the cell at index, which is only worked out
+        when it's asked for"""
+        if self.address is None:
+            return getCellNameFromCoordinates(index, self.row)
+        return self.address.getCellName(index, self.row)
+
+    def flush(self):
+        """Write out the cells buffered since the last flush, if buffered"""
+        if isinstance(self.xIndexAccess, WriteBuffer):
+            self.xIndexAccess.flush()
+
 class CellMatrixIterator:
-    def __init__(self, rows, columns, xIndexAccess):
+    def __init__(self, rows, columns, xIndexAccess, address=None):
         self.rows = rows
         self.columns = columns
         self.index = 0
         self.xIndexAccess = xIndexAccess
+        self.address = address
 
     def __next__(self):
         if self.index >= self.rows:
@@ -88,33 +263,82 @@ class CellMatrixIterator:
         index = self.index
         self.index += 1
         return CellRow(row=index, columns=self.columns,
-                       accessor=self.xIndexAccess)
+                       accessor=self.xIndexAccess, address=self.address)
 
 class CellMatrix:
-    def __init__(self, spec, xSheet):
-        firstSpec, secondSpec = tuple(spec.split(':'))
-        firstColumn, firstRow = cellname.getCoordinatesFromCellName(firstSpec)
-        secondColumn, secondRow = cellname.getCoordinatesFromCellName(
-            secondSpec)
-        self.xIndexAccess = xSheet.getCellRangeByName(spec)
-        if firstRow == secondRow:
-            self.rows = 1
-            self.columns = secondColumn - firstColumn + 1
-        elif firstColumn == secondColumn:
-            self.rows = secondRow - firstRow + 1
-            self.columns = 1
-        else:
-            self.rows = secondRow - firstRow + 1
-            self.columns = secondColumn - firstColumn + 1
+    def __init__(self, spec, xSheet, snapshot=False, buffered=False,
+                 blockRows=SNAPSHOT_BLOCK_ROWS):
+        """spec is an A1-style string, or a RangeAddress. If snapshot is set,
+        cells are read-only, and are read from the sheet in bulk (blockRows
+        rows at a time) the first time any cell in their block is accessed. If
+        buffered is set, assignments to cells are held in memory until flush()
+        is called."""
+        if snapshot and buffered:
+            raise ValueError(
+                'A CellMatrix cannot be both snapshot and buffered')
+        self.address = spec if isinstance(spec, RangeAddress) \
+            else RangeAddress.parse(spec)
+        # There's no such thing as an empty cell range in the sheet
+        self.xIndexAccess = None if self.address.isEmpty() \
+            else self.address.getCellRange(xSheet)
+        self.rows = self.address.getRows()
+        self.columns = self.address.getColumns()
+        if snapshot:
+            self.xIndexAccess = SnapshotAccess(
+                self.xIndexAccess, self.rows, self.columns, blockRows)
+        elif buffered:
+            self.xIndexAccess = WriteBuffer(self.xIndexAccess)
 
     def __iter__(self):
-        return CellMatrixIterator(self.rows, self.columns, self.xIndexAccess)
+        return CellMatrixIterator(self.rows, self.columns, self.xIndexAccess,
+                                  self.address)
 
     def getCount(self):
         return self.rows
 
     def getItem(self, index):
         return CellRow(row=index, columns=self.columns,
-                       accessor=self.xIndexAccess)
+                       accessor=self.xIndexAccess, address=self.address)
+
+    def getAddress(self) -> RangeAddress:
+        return self.address
+
+    def getRange(self):
+        """Get the underlying cell range, bypassing any snapshot or buffer"""
+        if isinstance(self.xIndexAccess, (SnapshotAccess, WriteBuffer)):
+            return self.xIndexAccess.xIndexAccess
+        return self.xIndexAccess
+
+    def writeBlock(self, column, row, data):
+        """Immediately write data, a sequence of equal-length rows, with its
+        top left corner at (column, row), with one setDataArray() call."""
+        if not data:
+            return
+        self.getRange().getCellRangeByPosition(
+            column, row, column + len(data[0]) - 1,
+            row + len(data) - 1).setDataArray(data)
+
+    def setBlockProperty(self, left, top, right, bottom, name, value):
+        """Immediately set a property on a rectangle of cells"""
+        self.getRange().getCellRangeByPosition(
+            left, top, right, bottom).setPropertyValue(name, value)
+
+    def getDataArray(self):
+        """Get the contents of a snapshot matrix as a tuple of rows"""
+        return self.xIndexAccess.getDataArray()
+
+    def diff(self, baseline):
+        """Drop the buffered cells whose contents are unchanged from baseline
+        (a snapshot CellMatrix). Returns the (left, top, right, bottom)
+        rectangles of cells which were not written, but aren't empty in
+        baseline."""
+        if not isinstance(self.xIndexAccess, WriteBuffer):
+            raise RuntimeError('Only a buffered CellMatrix can be diffed')
+        return self.xIndexAccess.diff(baseline.xIndexAccess)
+
+    def flush(self):
+        """Write out the cells buffered since the last flush, if buffered"""
+        if isinstance(self.xIndexAccess, WriteBuffer):
+            self.xIndexAccess.flush()
 
 ###############################################################################
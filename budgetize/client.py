@@ -0,0 +1,63 @@
+###############################################################################
+# NAME:             client.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Client for the budgetizer daemon. Only uses the standard
+#                   library, so that it starts quickly.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import argparse
+import calendar
+from datetime import datetime
+import json
+import os
+import socket
+import sys
+import tempfile
+
+SOCKET_PATH = os.path.join(
+    tempfile.gettempdir(), f'budgetize-{os.getuid()}.sock')
+
+MODES = ('full', 'incremental')
+
+class DaemonError(Exception):
+    pass
+
+def requestRecompute(month, mode='full', path=SOCKET_PATH):
+    """Ask the daemon to budgetize month, and return the timings of each step
+    (in seconds)"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        request = json.dumps({'month': month, 'mode': mode})
+        connection.sendall(request.encode('utf-8') + b'\n')
+        with connection.makefile('rb') as responseFile:
+            response = json.loads(responseFile.readline())
+    if not response['ok']:
+        raise DaemonError(response['error'])
+    return response['timings']
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-m', '--month', required=False,
+                        default=calendar.month_name[datetime.now().month])
+    parser.add_argument('--mode', choices=MODES, default='full')
+    parser.add_argument('-s', '--socket', default=SOCKET_PATH)
+    args = parser.parse_args()
+    try:
+        timings = requestRecompute(args.month, args.mode, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f'No budgetizer daemon is listening on {args.socket}')
+    except DaemonError as error:
+        sys.exit(str(error))
+    for step, seconds in timings.items():
+        print(f'{step}: {seconds * 1000:.1f} ms')
+
+if __name__ == '__main__':
+    main()
+
+###############################################################################
@@ -0,0 +1,319 @@
+###############################################################################
+# NAME:             columnar.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Compact, column-oriented tables of expenses and
+#                   transactions. Dates are stored as ordinals and amounts as
+#                   doubles in arrays, and account, category and line item
+#                   names as integer codes into a list of the distinct names.
+#                   Rows are only turned into objects when they're looked at.
+#                   With numpy, tables can be filtered and aggregated without
+#                   looping in Python.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from array import array
+from datetime import datetime
+from functools import lru_cache
+
+# Kinds of column
+DATE = 'date'       # datetime, stored as its ordinal (the time is dropped)
+AMOUNT = 'amount'   # float
+TEXT = 'text'       # str, stored as-is
+CODED = 'coded'     # str, dictionary-encoded
+
+@lru_cache(maxsize=None)
+def getNumpy():
+    """numpy, or None if it isn't installed. It's imported on first use, since
+    importing it takes longer than most runs of the budgetizer."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+###############################################################################
+# Columns
+###
+
+class ArrayColumn:
+    """Numbers in an array, which numpy can copy without converting them"""
+    def __init__(self, typecode, data=None):
+        self.data = data if data is not None else array(typecode)
+
+    def append(self, value):
+        self.data.append(value)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def getValues(self):
+        """A numpy array of the column if numpy is available, otherwise the
+        underlying array. The numpy array is a copy, since the underlying
+        array can't be appended to while a view of it is alive."""
+        numpy = getNumpy()
+        if numpy is None:
+            return self.data
+        return numpy.frombuffer(self.data, dtype=self.data.typecode).copy()
+
+    def take(self, indices):
+        if getNumpy() is not None:
+            selected = self.getValues()[indices]
+            return type(self)(array(self.data.typecode, selected.tobytes()))
+        return type(self)(array(self.data.typecode,
+                                (self.data[index] for index in indices)))
+
+class DateColumn(ArrayColumn):
+    def __init__(self, data=None):
+        super().__init__('i', data)
+
+    def append(self, value):
+        self.data.append(value.toordinal())
+
+    def __getitem__(self, index):
+        return datetime.fromordinal(self.data[index])
+
+class AmountColumn(ArrayColumn):
+    def __init__(self, data=None):
+        super().__init__('d', data)
+
+class TextColumn:
+    def __init__(self, data=None):
+        self.data = data if data is not None else []
+
+    def append(self, value):
+        self.data.append(value)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def getValues(self):
+        return self.data
+
+    def take(self, indices):
+        return TextColumn([self.data[index] for index in indices])
+
+class CodedColumn(ArrayColumn):
+    """Strings stored as codes into a list of the distinct strings, which is
+    shared with the columns taken from this one"""
+    def __init__(self, data=None, values=None, codes=None):
+        super().__init__('i', data)
+        self.values = values if values is not None else []
+        self.codes = codes if codes is not None else {}
+
+    def append(self, value):
+        code = self.codes.get(value, None)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        self.data.append(code)
+
+    def __getitem__(self, index):
+        return self.values[self.data[index]]
+
+    def getCode(self, value):
+        """The code of value, or -1 if no row holds it"""
+        return self.codes.get(value, -1)
+
+    def getDistinct(self):
+        return list(self.values)
+
+    def take(self, indices):
+        column = super().take(indices)
+        column.values = self.values
+        column.codes = self.codes
+        return column
+
+COLUMN_TYPES = {
+    DATE: DateColumn,
+    AMOUNT: AmountColumn,
+    TEXT: TextColumn,
+    CODED: CodedColumn,
+}
+
+###############################################################################
+# Tables
+###
+
+class ColumnarTable:
+    """Rows stored column by column. Subclasses name their columns (and their
+    kinds) in COLUMNS, and the type of their row views in ROW. Rows are
+    appended in the order of COLUMNS."""
+    COLUMNS = ()
+    ROW = None
+
+    def __init__(self, columns=None):
+        self.columns = columns or {
+            name: COLUMN_TYPES[kind]() for name, kind in self.COLUMNS}
+
+    def append(self, *values):
+        for (name, _), value in zip(self.COLUMNS, values):
+            self.columns[name].append(value)
+
+    def __len__(self):
+        return len(self.columns[self.COLUMNS[0][0]])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.ROW(self, index)
+
+    def getItem(self, index):
+        return self.ROW(self, index)
+
+    def getColumn(self, name):
+        return self.columns[name]
+
+    def getValues(self, name):
+        """The contents of a column: a numpy array (if numpy is available) of
+        ordinals, amounts or codes, or a list of strings for TEXT columns"""
+        return self.columns[name].getValues()
+
+    def take(self, indices):
+        """A new table of the rows at indices, in that order"""
+        return type(self)({name: column.take(indices)
+                           for name, column in self.columns.items()})
+
+    def filter(self, mask):
+        """A new table of the rows for which mask (a sequence of bools, like
+        the result of comparing the values of a column) is true"""
+        numpy = getNumpy()
+        if numpy is not None:
+            return self.take(numpy.flatnonzero(mask))
+        return self.take([index for index, keep in enumerate(mask) if keep])
+
+    def where(self, name, value):
+        """The rows whose CODED column name holds value"""
+        column = self.columns[name]
+        code = column.getCode(value)
+        if getNumpy() is not None:
+            return self.filter(column.getValues() == code)
+        return self.filter([data == code for data in column.getValues()])
+
+    def between(self, startDate, endDate, name='date'):
+        """The rows dated from startDate through endDate"""
+        start, end = startDate.toordinal(), endDate.toordinal()
+        values = self.columns[name].getValues()
+        if getNumpy() is not None:
+            return self.filter((values >= start) & (values <= end))
+        return self.filter([start <= value <= end for value in values])
+
+    def sumBy(self, name, amounts='amount'):
+        """Total of the amounts column for each value of CODED column name"""
+        column = self.columns[name]
+        numpy = getNumpy()
+        if numpy is not None:
+            totals = numpy.bincount(
+                column.getValues(), weights=self.getValues(amounts),
+                minlength=len(column.values)).tolist()
+        else:
+            totals = [0.0] * len(column.values)
+            for code, amount in zip(column.getValues(),
+                                    self.getValues(amounts)):
+                totals[code] += amount
+        return dict(zip(column.values, totals))
+
+    def sortByDate(self, name='date'):
+        """A new table with the rows in date order. Rows on the same date stay
+        in the order they were in."""
+        values = self.columns[name].getValues()
+        numpy = getNumpy()
+        if numpy is not None:
+            return self.take(numpy.argsort(values, kind='stable'))
+        return self.take(sorted(range(len(values)), key=values.__getitem__))
+
+class ColumnarRow:
+    """View of one row of a ColumnarTable"""
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def getField(self, name):
+        return self.table.columns[name][self.index]
+
+###############################################################################
+# Expenses
+###
+
+class ExpenseRow(ColumnarRow):
+    """Reads like a MonthlyExpense"""
+    __slots__ = ()
+
+    def getDescription(self):
+        return self.getField('description')
+
+    def getLineItem(self):
+        return self.getField('lineItem')
+
+    def getCategory(self):
+        return self.getField('category')
+
+    def getDate(self):
+        return self.getField('date')
+
+    def getAmount(self):
+        return self.getField('amount')
+
+    def getAccountName(self):
+        return self.getField('accountName')
+
+class ExpenseTable(ColumnarTable):
+    COLUMNS = (
+        ('description', TEXT),
+        ('lineItem', CODED),
+        ('category', CODED),
+        ('date', DATE),
+        ('amount', AMOUNT),
+        ('accountName', CODED),
+    )
+    ROW = ExpenseRow
+
+###############################################################################
+# Transactions
+###
+
+class TransactionRow(ColumnarRow):
+    """Reads like a Transaction"""
+    __slots__ = ()
+
+    @property
+    def date(self):
+        return self.getField('date')
+
+    @property
+    def description(self):
+        return self.getField('description')
+
+    @property
+    def amount(self):
+        return self.getField('amount')
+
+    @property
+    def accountName(self):
+        return self.getField('accountName')
+
+    def applyToAccount(self, account):
+        account.updateBalance(self.amount)
+
+class TransactionTable(ColumnarTable):
+    COLUMNS = (
+        ('date', DATE),
+        ('description', TEXT),
+        ('amount', AMOUNT),
+        ('accountName', CODED),
+    )
+    ROW = TransactionRow
+
+###############################################################################
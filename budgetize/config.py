@@ -0,0 +1,30 @@
+###############################################################################
+# NAME:             config.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Where the budgetizer keeps its files. appdirs is only
+#                   imported when a path is first asked for.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import os
+
+APP_NAME = 'Budgetizer'
+APP_AUTHOR = "edtwardy"
+
+def getDefaultsPath():
+    """defaults.ini, the template for new budgets"""
+    from appdirs import user_data_dir
+    return os.path.join(user_data_dir(APP_NAME, APP_AUTHOR), 'defaults.ini')
+
+def getOccurrenceCachePath():
+    """The expanded recurrence schedules, kept between runs"""
+    from appdirs import user_cache_dir
+    return os.path.join(
+        user_cache_dir(APP_NAME, APP_AUTHOR), 'occurrences.json')
+
+###############################################################################
@@ -0,0 +1,83 @@
+###############################################################################
+# NAME:             connection.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Connection to a running Office server, which is kept open
+#                   and re-established if the server goes away.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import time
+
+import uno
+from com.sun.star.connection import NoConnectException
+from com.sun.star.lang import DisposedException
+
+from .backend import UnoSheetBackend
+
+OFFICE_URL = (
+    'uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext')
+
+class OfficeConnection:
+    """Holds the UNO bridge, the Desktop and the current document between
+    uses. If the server is restarted (or the document closed), the next use
+    reconnects."""
+    def __init__(self, url=OFFICE_URL, retries=5, retryDelay=1.0):
+        self.url = url
+        self.retries = retries
+        self.retryDelay = retryDelay
+        self.desktop = None
+        self.document = None
+
+    def connect(self):
+        localContext = uno.getComponentContext()
+        resolver = localContext.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', localContext)
+        for attempt in range(self.retries):
+            try:
+                context = resolver.resolve(self.url)
+                break
+            except NoConnectException:
+                # soffice may still be starting up
+                if attempt == self.retries - 1:
+                    raise
+                time.sleep(self.retryDelay)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.frame.Desktop', context)
+        self.document = None
+
+    def disconnect(self):
+        self.desktop = None
+        self.document = None
+
+    def getDesktop(self):
+        if self.desktop is None:
+            self.connect()
+        return self.desktop
+
+    def getDocument(self):
+        """The document that was current when it was first asked for"""
+        if self.document is None:
+            self.document = self.getDesktop().getCurrentComponent()
+        return self.document
+
+    def getBackend(self) -> UnoSheetBackend:
+        return UnoSheetBackend(self.getDocument())
+
+    def run(self, function):
+        """Call function with a backend for the document. If the bridge or the
+        document has gone away (which is reported as a DisposedException),
+        reconnect and try once more. Any other error is the function's own,
+        and it's raised, since whatever was written before it can't be undone
+        by running again."""
+        try:
+            return function(self.getBackend())
+        except DisposedException:
+            self.disconnect()
+            return function(self.getBackend())
+
+###############################################################################
@@ -0,0 +1,49 @@
+###############################################################################
+# NAME:             constants.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Values of the UNO constants groups used by the budgetizer.
+#                   They're copied here so that nothing outside of the UNO
+#                   backend needs uno to be importable.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+class CellFlags:
+    """com.sun.star.sheet.CellFlags"""
+    VALUE = 1
+    DATETIME = 2
+    STRING = 4
+    ANNOTATION = 8
+    FORMULA = 16
+    HARDATTR = 32
+    STYLES = 64
+    OBJECTS = 128
+    EDITATTR = 256
+    FORMATTED = 512
+
+class FontWeight:
+    """com.sun.star.awt.FontWeight"""
+    NORMAL = 100.0
+    BOLD = 150.0
+
+class NumberFormat:
+    """com.sun.star.util.NumberFormat"""
+    ALL = 0
+    DEFINED = 1
+    DATE = 2
+    TIME = 4
+    CURRENCY = 8
+    NUMBER = 16
+    SCIENTIFIC = 32
+    FRACTION = 64
+    PERCENT = 128
+    TEXT = 256
+    DATETIME = 6
+    LOGICAL = 1024
+    UNDEFINED = 2048
+
+###############################################################################
@@ -0,0 +1,130 @@
+###############################################################################
+# NAME:             daemon.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Resident budgetizer, which keeps the connection to the
+#                   Office server, the imported modules and the budget
+#                   defaults warm between runs, and takes requests over a Unix
+#                   socket.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+from .budgetizer import Budgetizer
+from .client import SOCKET_PATH, MODES
+from .connection import OfficeConnection
+
+class BudgetizerDaemon:
+    """Runs budgetizer requests against a long-lived OfficeConnection. Each
+    request is run holding lock, which must be shared with anything else
+    using the connection from another thread (like an ExpenseWatcher)."""
+    def __init__(self, connection: OfficeConnection=None, lock=None):
+        self.connection = connection or OfficeConnection()
+        self.lock = lock or threading.Lock()
+        self.defaults = None
+
+    def budgetize(self, month, mode):
+        """Returns the time taken by each step, in seconds"""
+        if mode not in MODES:
+            raise ValueError(f'Unknown mode {mode}')
+        with self.lock:
+            return self.budgetizeLocked(month, mode)
+
+    def budgetizeLocked(self, month, mode):
+        timings = {}
+        start = time.perf_counter()
+        self.connection.getDocument()
+        timings['connect'] = time.perf_counter() - start
+
+        def run(backend):
+            budgetizer = Budgetizer(backend, month, self.defaults)
+            budgetizer.budgetize(incremental=(mode == 'incremental'))
+            self.defaults = budgetizer.defaults
+
+        start = time.perf_counter()
+        self.connection.run(run)
+        timings['budgetize'] = time.perf_counter() - start
+        return timings
+
+    def handle(self, request):
+        start = time.perf_counter()
+        try:
+            timings = self.budgetize(request['month'],
+                                     request.get('mode', 'full'))
+        except Exception as error:
+            return {'ok': False, 'error': f'{type(error).__name__}: {error}'}
+        timings['total'] = time.perf_counter() - start
+        return {'ok': True, 'timings': timings}
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    # One JSON object per line in each direction
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {'ok': False, 'error': f'Bad request: {error}'}
+            else:
+                response = self.server.daemon.handle(request)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serves one request at a time, since the UNO bridge isn't something to
+    share between threads"""
+    def __init__(self, daemon: BudgetizerDaemon, path=SOCKET_PATH):
+        DaemonServer.removeStaleSocket(path)
+        super().__init__(path, DaemonRequestHandler)
+        self.daemon = daemon
+
+    @staticmethod
+    def removeStaleSocket(path):
+        """Remove a socket left behind by a previous instance. Anything else
+        at path is left alone."""
+        try:
+            mode = os.lstat(path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f'{path} exists, and is not a socket')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except ConnectionRefusedError:
+                os.unlink(path)
+                return
+        raise RuntimeError(f'Another daemon is already listening on {path}')
+
+    def server_bind(self):
+        # The socket is created accessible only to us, instead of being
+        # chmod-ed after the fact
+        mask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(mask)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+def serve(path=SOCKET_PATH, connection: OfficeConnection=None, lock=None):
+    with DaemonServer(BudgetizerDaemon(connection, lock), path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+###############################################################################
@@ -7,18 +7,66 @@
 #
 # CREATED:          02/06/2022
 #
-# LAST EDITED:      02/07/2022
+# LAST EDITED:      10/18/2026
 ###
 
 import math
+import re
 
 from .cellformat import NumberFormat
 from .cellrange import CellRow
 
+TRANSFER_RE = re.compile(r'transfer\(([^,]*),([^,]*)\)')
+
+class ExpenseRouting:
+    """Where the money for a budgeted expense goes: either out of an account,
+    or a transfer out of an account to pay down a loan. The account and loan
+    are bound to the budget's instances once they're known."""
+    def __init__(self, spec, accountName, loanName=None):
+        self.spec = spec
+        self.accountName = accountName
+        self.loanName = loanName
+        self.account = None
+        self.loan = None
+
+    @staticmethod
+    def parse(spec):
+        """Parse the contents of the account column of a budgeted expense"""
+        matches = TRANSFER_RE.fullmatch(spec)
+        if matches:
+            return ExpenseRouting(spec, matches.group(1), matches.group(2))
+        return ExpenseRouting(spec, spec)
+
+    def getSpec(self):
+        return self.spec
+
+    def isTransfer(self):
+        return self.loanName is not None
+
+    def getAccountName(self):
+        return self.accountName
+
+    def getLoanName(self):
+        return self.loanName
+
+    def bind(self, account, loan):
+        self.account = account
+        self.loan = loan
+
+    def getAccount(self):
+        if not self.account:
+            raise RuntimeError(f'No account named {self.accountName}')
+        return self.account
+
+    def getLoan(self):
+        if not self.loan:
+            raise RuntimeError(f'No loan named {self.loanName}')
+        return self.loan
+
 class BudgetedExpense:
-    def __init__(self, description, accountName, budgeted):
+    def __init__(self, description, routing: ExpenseRouting, budgeted):
         self.description = description
-        self.accountName = accountName
+        self.routing = routing
         self.budgeted = budgeted
         self.spent = 0
 
@@ -26,7 +74,10 @@ class BudgetedExpense:
         return self.description
 
     def getAccountName(self):
-        return self.accountName
+        return self.routing.getSpec()
+
+    def getRouting(self) -> ExpenseRouting:
+        return self.routing
 
     def getBudgeted(self):
         return self.budgeted
@@ -37,6 +88,9 @@ class BudgetedExpense:
     def spend(self, amount):
         self.spent += math.fabs(amount)
 
+    def setSpent(self, spent):
+        self.spent = spent
+
 class BudgetedExpenseRecord:
     def __init__(self, cellrange: CellRow):
         self.cellrange = cellrange
@@ -61,8 +115,8 @@ class BudgetedExpenseRecord:
     def read(self) -> BudgetedExpense:
         recordIterator = iter(self.cellrange)
         description = next(recordIterator).String
-        accountName = next(recordIterator).String
+        routing = ExpenseRouting.parse(next(recordIterator).String)
         budgeted = next(recordIterator).Value
-        return BudgetedExpense(description, accountName, budgeted)
+        return BudgetedExpense(description, routing, budgeted)
 
 ###############################################################################
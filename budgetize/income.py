@@ -35,6 +35,9 @@ class Income:
     def getReceived(self):
         return self.received
 
+    def setReceived(self, received):
+        self.received = received
+
 class IncomeRecord:
     def __init__(self, cellrange: CellRow):
         self.cellrange = cellrange
@@ -0,0 +1,153 @@
+###############################################################################
+# NAME:             instrument.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Optional accounting of the calls made to the sheets of a
+#                   document, grouped by phase of the run. Every cell range,
+#                   row and record reaches the document through the sheets the
+#                   backend hands out, so proxying those sees all the traffic.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+import sys
+import time
+
+from .backend import SheetBackend
+from .memory import MemoryCell, MemoryCellRange
+
+# Values of these types are copied over the bridge, not referenced
+PLAIN_TYPES = (str, bytes, int, float, bool, type(None), tuple, list)
+
+def isRemoteObject(value):
+    """Whether value is a UNO object (or a stand-in for one), as opposed to a
+    struct or a plain value"""
+    return hasattr(value, 'queryInterface') \
+        or isinstance(value, (MemoryCellRange, MemoryCell))
+
+class PhaseCounts:
+    def __init__(self):
+        self.calls = Counter()
+        self.gets = Counter()
+        self.sets = Counter()
+        self.seconds = 0.0
+
+class CallCounter:
+    """Counts method calls, property gets and property sets, and the time
+    spent in them, under the current phase. Phases nest, and are named by
+    their path, like 'budgetize/write'."""
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.stack = []
+
+    @contextmanager
+    def phase(self, name):
+        self.stack.append(name)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+
+    def getCounts(self) -> PhaseCounts:
+        name = '/'.join(self.stack) or '(no phase)'
+        if name not in self.phases:
+            self.phases[name] = PhaseCounts()
+        return self.phases[name]
+
+    def report(self, file=sys.stdout, top=3):
+        print(f'{"phase":<32}{"calls":>8}{"gets":>8}{"sets":>8}'
+              + f'{"time [ms]":>12}', file=file)
+        for name, counts in self.phases.items():
+            print(f'{name:<32}{sum(counts.calls.values()):>8}'
+                  + f'{sum(counts.gets.values()):>8}'
+                  + f'{sum(counts.sets.values()):>8}'
+                  + f'{counts.seconds * 1000:>12.1f}', file=file)
+            busiest = (counts.calls + counts.gets + counts.sets).most_common(
+                top)
+            if busiest:
+                print('    ' + ', '.join(
+                    f'{member} x{count}' for member, count in busiest),
+                      file=file)
+
+class CountingProxy:
+    """Stands in for a remote object, counting the uses of it (and of the
+    remote objects it returns) in counter"""
+    def __init__(self, target, counter: CallCounter):
+        object.__setattr__(self, 'target', target)
+        object.__setattr__(self, 'counter', counter)
+
+    @staticmethod
+    def wrap(value, counter):
+        if not isinstance(value, PLAIN_TYPES) and isRemoteObject(value):
+            return CountingProxy(value, counter)
+        return value
+
+    @staticmethod
+    def unwrap(value):
+        if isinstance(value, CountingProxy):
+            return object.__getattribute__(value, 'target')
+        return value
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, 'target')
+        counter = object.__getattribute__(self, 'counter')
+        start = time.perf_counter()
+        value = getattr(target, name)
+        if callable(value):
+            return CountingProxy.wrapMethod(name, value, counter)
+        counts = counter.getCounts()
+        counts.seconds += time.perf_counter() - start
+        counts.gets[name] += 1
+        return CountingProxy.wrap(value, counter)
+
+    def __setattr__(self, name, value):
+        target = object.__getattribute__(self, 'target')
+        counter = object.__getattribute__(self, 'counter')
+        start = time.perf_counter()
+        setattr(target, name, CountingProxy.unwrap(value))
+        counts = counter.getCounts()
+        counts.seconds += time.perf_counter() - start
+        counts.sets[name] += 1
+
+    @staticmethod
+    def wrapMethod(name, method, counter):
+        def call(*args):
+            start = time.perf_counter()
+            result = method(*[CountingProxy.unwrap(arg) for arg in args])
+            counts = counter.getCounts()
+            counts.seconds += time.perf_counter() - start
+            counts.calls[name] += 1
+            return CountingProxy.wrap(result, counter)
+        return call
+
+class InstrumentedBackend(SheetBackend):
+    """Hands out the sheets of backend behind CountingProxies. Anything else
+    is passed through to backend."""
+    def __init__(self, backend: SheetBackend, counter: CallCounter=None):
+        self.backend = backend
+        self.counter = counter or CallCounter()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def getCounter(self) -> CallCounter:
+        return self.counter
+
+    def getSheet(self, name):
+        return CountingProxy(self.backend.getSheet(name), self.counter)
+
+    def createSheet(self, name):
+        return CountingProxy(self.backend.createSheet(name), self.counter)
+
+    def updateSession(self, title='Budgetize'):
+        return self.backend.updateSession(title)
+
+    def phase(self, name):
+        return self.counter.phase(name)
+
+###############################################################################
@@ -0,0 +1,107 @@
+###############################################################################
+# NAME:             listener.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Recompute a month's budget whenever its expenses sheet is
+#                   edited.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import calendar
+import threading
+
+import uno
+import unohelper
+from com.sun.star.util import XModifyListener
+
+from .backend import NoSuchSheetError
+from .budgetizer import Budgetizer
+from .connection import OfficeConnection
+
+# Seconds to wait after an edit for more edits, before recomputing
+DEBOUNCE_DELAY = 0.5
+
+class DebouncedRecompute:
+    """Calls recompute(month) once a month has gone delay seconds without
+    being scheduled again. Recomputes are made holding lock, so they never
+    overlap each other, or anything else holding it."""
+    def __init__(self, recompute, delay=DEBOUNCE_DELAY, lock=None):
+        self.recompute = recompute
+        self.delay = delay
+        self.timers = {}
+        self.timersLock = threading.Lock()
+        self.recomputeLock = lock or threading.Lock()
+
+    def schedule(self, month):
+        with self.timersLock:
+            if month in self.timers:
+                self.timers[month].cancel()
+            timer = threading.Timer(self.delay, self.fire, [month])
+            timer.daemon = True
+            self.timers[month] = timer
+            timer.start()
+
+    def fire(self, month):
+        with self.timersLock:
+            self.timers.pop(month, None)
+        with self.recomputeLock:
+            self.recompute(month)
+
+    def cancel(self):
+        with self.timersLock:
+            for timer in self.timers.values():
+                timer.cancel()
+            self.timers.clear()
+
+class ExpenseSheetListener(unohelper.Base, XModifyListener):
+    """Schedules a recompute of its month when the sheet is modified"""
+    def __init__(self, month, scheduler: DebouncedRecompute):
+        self.month = month
+        self.scheduler = scheduler
+
+    def modified(self, event):
+        self.scheduler.schedule(self.month)
+
+    def disposing(self, event):
+        pass
+
+class ExpenseWatcher:
+    """Listens to the expenses sheet of every month (or of months), and
+    incrementally recomputes that month's budget after it's edited. The
+    recomputes run on timer threads, so anything else using the document at
+    the same time must share lock with the watcher. The backend is looked up
+    through connection for each recompute, so a recompute after the bridge
+    has gone away reconnects instead of using the dead document."""
+    def __init__(self, connection: OfficeConnection, months=None,
+                 delay=DEBOUNCE_DELAY, lock=None):
+        self.connection = connection
+        self.months = months or calendar.month_name[1:]
+        self.scheduler = DebouncedRecompute(self.recompute, delay, lock)
+        self.listeners = []
+
+    def recompute(self, month):
+        self.connection.run(lambda backend: Budgetizer(backend, month)
+                            .budgetize(incremental=True))
+
+    def start(self):
+        backend = self.connection.getBackend()
+        for month in self.months:
+            try:
+                sheet = backend.getSheet(month + ' Expenses')
+            except NoSuchSheetError:
+                continue
+            listener = ExpenseSheetListener(month, self.scheduler)
+            sheet.addModifyListener(listener)
+            self.listeners.append((sheet, listener))
+
+    def stop(self):
+        for sheet, listener in self.listeners:
+            sheet.removeModifyListener(listener)
+        self.listeners = []
+        self.scheduler.cancel()
+
+###############################################################################
@@ -7,7 +7,7 @@
 #
 # CREATED:          02/07/2022
 #
-# LAST EDITED:      02/08/2022
+# LAST EDITED:      10/18/2026
 ###
 
 from .cellrange import CellRow
@@ -38,10 +38,18 @@ class Loan:
         return self.endingBalance
 
     def getPayoffPeriod(self):
+        """Number of months to pay off the loan at this month's payment, or
+        None if it won't be paid off at that rate"""
         payment = self.startingBalance - self.endingBalance
-        time = (
-            math.log(1 - (self.interest / 12 * self.endingBalance / payment))
-            / math.log(1 / (1 + (self.interest / 12))))
+        if payment <= 0:
+            return None
+        rate = self.interest / 12
+        if rate == 0:
+            return round(self.endingBalance / payment)
+        remaining = 1 - (rate * self.endingBalance / payment)
+        if remaining <= 0:
+            return None # The payment doesn't cover the interest
+        time = math.log(remaining) / math.log(1 / (1 + rate))
         return round(time)
 
 class LoanRecord:
@@ -64,6 +72,10 @@ class LoanRecord:
         endingBalanceCell = next(self.cellrange)
         endingBalanceCell.NumberFormat = NumberFormat.CURRENCY
         endingBalanceCell.Value = loan.getEndingBalance()
-        next(self.cellrange).String = f'{loan.getPayoffPeriod()} mo'
+        payoffPeriod = loan.getPayoffPeriod()
+        if payoffPeriod is None:
+            next(self.cellrange).String = 'n/a'
+        else:
+            next(self.cellrange).String = f'{payoffPeriod} mo'
 
 ###############################################################################
@@ -0,0 +1,206 @@
+###############################################################################
+# NAME:             memory.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      In-memory sheet backend. Implements just enough of the
+#                   XSpreadsheet API for the budgetizer to run in-process,
+#                   without an Office server.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from .backend import SheetBackend, NoSuchSheetError
+from . import cellname
+from .constants import CellFlags
+
+def formatValue(value):
+    """Approximate the "General" number format"""
+    if value == int(value):
+        return str(int(value))
+    return f'{value:.15g}'
+
+class MemoryCell:
+    """A single cell, which reads and writes through to its MemorySheet"""
+    def __init__(self, sheet, column, row):
+        self.__dict__.update(sheet=sheet, column=column, row=row)
+
+    def __getattr__(self, name):
+        key = (self.column, self.row)
+        data = self.sheet.cells.get(key, '')
+        if name == 'String':
+            if isinstance(data, str):
+                return data
+            return self.sheet.strings.get(key, None) or formatValue(data)
+        elif name == 'Value':
+            return 0.0 if isinstance(data, str) else data
+        return self.getPropertyValue(name)
+
+    def __setattr__(self, name, value):
+        if name == 'String':
+            self.sheet.setData(self.column, self.row, str(value))
+        elif name == 'Value':
+            self.sheet.setData(self.column, self.row, float(value))
+        else:
+            self.setPropertyValue(name, value)
+
+    def getPropertyValue(self, name):
+        return self.sheet.properties.get((self.column, self.row), {}).get(
+            name, None)
+
+    def setPropertyValue(self, name, value):
+        self.sheet.setProperty(self.column, self.row, name, value)
+
+class MemoryRangeAddress:
+    def __init__(self, left, top, right, bottom):
+        self.StartColumn = left
+        self.StartRow = top
+        self.EndColumn = right
+        self.EndRow = bottom
+
+class MemoryCellRange:
+    """A rectangle of cells in a MemorySheet. Positions are relative to the
+    top left corner of the rectangle, like they are in the UNO API."""
+    def __init__(self, sheet, left, top, right, bottom):
+        self.sheet = sheet
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def getRangeAddress(self):
+        return MemoryRangeAddress(
+            self.left, self.top, self.right, self.bottom)
+
+    def getCellByPosition(self, column, row):
+        return MemoryCell(self.sheet, self.left + column, self.top + row)
+
+    def getCellRangeByPosition(self, left, top, right, bottom):
+        return MemoryCellRange(self.sheet, self.left + left, self.top + top,
+                               self.left + right, self.top + bottom)
+
+    def getDataArray(self):
+        cells = self.sheet.cells
+        return tuple(
+            tuple(cells.get((column, row), '')
+                  for column in range(self.left, self.right + 1))
+            for row in range(self.top, self.bottom + 1))
+
+    def setDataArray(self, data):
+        for rowIndex, row in enumerate(data):
+            for columnIndex, value in enumerate(row):
+                self.sheet.setData(self.left + columnIndex,
+                                   self.top + rowIndex, value)
+
+    def contains(self, column, row):
+        return self.left <= column <= self.right \
+            and self.top <= row <= self.bottom
+
+    def setPropertyValue(self, name, value):
+        for row in range(self.top, self.bottom + 1):
+            for column in range(self.left, self.right + 1):
+                self.sheet.setProperty(column, row, name, value)
+
+    def clearContents(self, flags):
+        clearValues = flags & (CellFlags.VALUE | CellFlags.DATETIME)
+        clearStrings = flags & CellFlags.STRING
+        clearAttributes = flags & (CellFlags.HARDATTR | CellFlags.STYLES)
+        for key in list(self.sheet.cells):
+            if not self.contains(*key):
+                continue
+            isString = isinstance(self.sheet.cells[key], str)
+            if (isString and clearStrings) or (not isString and clearValues):
+                self.sheet.setData(key[0], key[1], '')
+        if clearAttributes:
+            for key in list(self.sheet.properties):
+                if self.contains(*key):
+                    self.sheet.clearProperties(*key)
+
+class MemoryCursor(MemoryCellRange):
+    def gotoEndOfUsedArea(self, expand):
+        right, bottom = self.sheet.getUsedArea()
+        if expand:
+            self.right, self.bottom = right, bottom
+        else:
+            self.left, self.top, self.right, self.bottom = \
+                right, bottom, right, bottom
+
+class MemorySheet(MemoryCellRange):
+    """A sparse sheet. Only cells with contents or properties are stored."""
+    def __init__(self, name):
+        super().__init__(self, 0, 0, cellname.COLUMN_MAX, cellname.ROW_MAX)
+        self.name = name
+        self.cells = {}
+        self.strings = {}
+        self.properties = {}
+        self.sheetProperties = {}
+        self.modified = False
+
+    def getName(self):
+        return self.name
+
+    def setData(self, column, row, data):
+        key = (column, row)
+        self.strings.pop(key, None)
+        if data == '' or data is None:
+            self.cells.pop(key, None)
+        else:
+            self.cells[key] = data
+        self.modified = True
+
+    def setProperty(self, column, row, name, value):
+        self.properties.setdefault((column, row), {})[name] = value
+        self.modified = True
+
+    def clearProperties(self, column, row):
+        del self.properties[(column, row)]
+        self.modified = True
+
+    def getUsedArea(self):
+        if not self.cells:
+            return (0, 0)
+        return (max(column for column, _ in self.cells),
+                max(row for _, row in self.cells))
+
+    def getCellRangeByName(self, spec):
+        firstSpec, _, secondSpec = spec.partition(':')
+        left, top = cellname.getCoordinatesFromCellName(firstSpec)
+        right, bottom = cellname.getCoordinatesFromCellName(
+            secondSpec or firstSpec)
+        return MemoryCellRange(self, left, top, right, bottom)
+
+    def createCursor(self):
+        return MemoryCursor(self, 0, 0, cellname.COLUMN_MAX, cellname.ROW_MAX)
+
+    def getPropertyValue(self, name):
+        return self.sheetProperties.get(name, None)
+
+    def setPropertyValue(self, name, value):
+        # Properties of the sheet itself, like IsVisible
+        self.sheetProperties[name] = value
+        self.modified = True
+
+class MemorySheetBackend(SheetBackend):
+    """A document whose sheets only exist in memory"""
+    SHEET_TYPE = MemorySheet
+
+    def __init__(self):
+        self.sheets = {}
+
+    def getSheetNames(self):
+        return list(self.sheets.keys())
+
+    def getSheet(self, name):
+        try:
+            return self.sheets[name]
+        except KeyError:
+            raise NoSuchSheetError(name)
+
+    def createSheet(self, name):
+        sheet = self.SHEET_TYPE(name)
+        self.sheets[name] = sheet
+        return sheet
+
+###############################################################################
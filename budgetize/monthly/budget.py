@@ -7,21 +7,22 @@
 #
 # CREATED:          02/07/2022
 #
-# LAST EDITED:      03/02/2022
+# LAST EDITED:      10/18/2026
 ###
 
-from configparser import ConfigParser
 from datetime import datetime
-from typing import Dict, List
-import re
+from typing import Dict, List, TYPE_CHECKING
 
 from ..fund import SinkingFund
 from ..account import AccountHistorySummary
 from ..income import Income
-from ..expense import BudgetedExpense
+from ..expense import BudgetedExpense, ExpenseRouting
 from .expense import MonthlyExpense
 from ..loan import Loan
 
+if TYPE_CHECKING:
+    from configparser import ConfigParser
+
 class MonthlyBudget:
     def __init__(self, expenses: Dict[str, List[BudgetedExpense]],
                  incomes: List[Income],
@@ -32,6 +33,33 @@ class MonthlyBudget:
         self.accountSummaries = accountSummaries
         self.funds = funds
         self.loans = loans
+        self.buildIndexes()
+
+    def buildIndexes(self):
+        """Index line items, incomes, accounts and loans by their names, and
+        bind the routing of each line item to its account and loan. This must
+        be called again if any of the budget's lists are changed. Where names
+        collide, the first one wins, as with a linear search."""
+        self.expensesByLineItem = {}
+        for category, expenses in self.expenses.items():
+            for expense in expenses:
+                self.expensesByLineItem.setdefault(
+                    (category, expense.getDescription()), expense)
+        self.incomesByName = {}
+        for income in self.incomes:
+            self.incomesByName.setdefault(income.getDescription(), income)
+        self.accountsByName = {}
+        for account in self.accountSummaries:
+            self.accountsByName.setdefault(account.getAccountName(), account)
+        self.loansByName = {}
+        for loan in self.loans:
+            self.loansByName.setdefault(loan.getName(), loan)
+        for expenses in self.expenses.values():
+            for expense in expenses:
+                routing = expense.getRouting()
+                routing.bind(
+                    self.accountsByName.get(routing.getAccountName(), None),
+                    self.loansByName.get(routing.getLoanName(), None))
 
     def getExpenseSections(self) -> Dict[str, List[BudgetedExpense]]:
         return self.expenses
@@ -49,9 +77,7 @@ class MonthlyBudget:
         return self.loans
 
     def getBudgetedIncome(self, income: MonthlyExpense):
-        budgeted = next(filter(
-            lambda x: x.getDescription() == income.getLineItem(),
-            self.incomes), None)
+        budgeted = self.incomesByName.get(income.getLineItem(), None)
         if not budgeted:
             raise RuntimeError(
                 f'The transaction {income.getLineItem()} was not an '
@@ -60,57 +86,37 @@ class MonthlyBudget:
         return budgeted
 
     def getBudgetedExpense(self, expense: MonthlyExpense):
-        try:
-            category = next(filter(lambda x: x == expense.getCategory(),
-                                   self.expenses.keys()), None)
-            if not category:
-                raise KeyError(expense.getCategory())
-        except KeyError:
+        category = expense.getCategory()
+        if not category or category not in self.expenses:
             raise RuntimeError(f'The category {expense.getCategory()} is not'
                                + ' currently accounted for in the budget!')
-        try:
-            budgeted = next(filter(
-                lambda x: x.getDescription() == expense.getLineItem(),
-                self.expenses[category]), None)
-            if not budgeted:
-                raise KeyError(expense.getLineItem())
-            return budgeted
-        except KeyError:
+        budgeted = self.expensesByLineItem.get(
+            (category, expense.getLineItem()), None)
+        if not budgeted:
             raise RuntimeError(f'The line item {expense.getLineItem()} is not'
                                + ' currently accounted for in the budget!')
+        return budgeted
 
     def getAccountByName(self, accountName) -> AccountHistorySummary:
-        account = next(filter(lambda x: x.getAccountName() == accountName,
-                              self.accountSummaries), None)
+        account = self.accountsByName.get(accountName, None)
         if not account:
             raise RuntimeError(f'No account named {accountName}')
         return account
 
     def getLoanByName(self, loanName) -> Loan:
-        loan = next(filter(lambda x: x.getName() == loanName, self.loans),
-                    None)
+        loan = self.loansByName.get(loanName, None)
         if not loan:
             raise RuntimeError(f'No loan named {loanName}')
         return loan
 
     def ensureAccountsForExpense(self, budgetedExpense, expense):
-        matches = re.fullmatch(r'transfer\(([^,]*),([^,]*)\)',
-                               budgetedExpense.getAccountName())
-        if matches:
-            account = matches.group(1)
-            if account != expense.getAccountName():
-                raise RuntimeError(
-                    f'{budgetedExpense.getDescription()} should go into '
-                    + f'{account}, but it actually '
-                    + f'came from {expense.getAccountName()}'
-                )
-        else:
-            if budgetedExpense.getAccountName() != expense.getAccountName():
-                raise RuntimeError(
-                    f'{budgetedExpense.getDescription()} should go into '
-                    + f'{budgetedExpense.getAccountName()}, but it actually '
-                    + f'came from {expense.getAccountName()}'
-                )
+        account = budgetedExpense.getRouting().getAccountName()
+        if account != expense.getAccountName():
+            raise RuntimeError(
+                f'{budgetedExpense.getDescription()} should go into '
+                + f'{account}, but it actually '
+                + f'came from {expense.getAccountName()}'
+            )
 
     def ensureAccountsForIncome(self, budgetedIncome, income):
         if budgetedIncome.getAccountName() != income.getAccountName():
@@ -130,12 +136,12 @@ class MonthlyBudget:
     def applyExpenseTransaction(self, expense: MonthlyExpense):
         budgetedExpense = self.getBudgetedExpense(expense)
         self.ensureAccountsForExpense(budgetedExpense, expense)
-        account = self.getAccountByName(expense.getAccountName())
+        account = budgetedExpense.getRouting().getAccount()
         budgetedExpense.spend(expense.getAmount())
         account.updateBalance(expense.getAmount())
 
-    def applyExpenses(self, expenses: List[MonthlyExpense]):
-        now = datetime.now()
+    def applyExpenses(self, expenses: List[MonthlyExpense], now=None):
+        now = now or datetime.now()
         for expense in expenses:
             if expense.getDate() > now:
                 continue # Skip expenses that haven't happened yet.
@@ -146,18 +152,13 @@ class MonthlyBudget:
                 self.applyIncomeTransaction(expense)
 
     def updateExpectedBalanceForExpenseAccounts(self, expense):
-        matches = re.fullmatch(r'transfer\(([^,]*),([^,]*)\)',
-                               expense.getAccountName())
-        if matches:
-            account = self.getAccountByName(matches.group(1))
-            loan = self.getLoanByName(matches.group(2))
+        routing = expense.getRouting()
+        account = routing.getAccount()
+        if routing.isTransfer():
+            loan = routing.getLoan()
             loan.setEndingBalance(
                 loan.getEndingBalance() - expense.getBudgeted())
-            account.updateExpectedBalance(-1 * expense.getBudgeted())
-        else:
-            self.getAccountByName(
-                expense.getAccountName()).updateExpectedBalance(
-                    -1 * expense.getBudgeted())
+        account.updateExpectedBalance(-1 * expense.getBudgeted())
 
     def calculateExpectedBalances(self):
         if not self.accountSummaries:
@@ -173,7 +174,7 @@ class MonthlyBudget:
                 self.updateExpectedBalanceForExpenseAccounts(expense)
 
     @staticmethod
-    def defaults(defaults: ConfigParser):
+    def defaults(defaults: 'ConfigParser'):
         expenses = {}
         incomes = []
         for section in defaults.sections():
@@ -185,7 +186,8 @@ class MonthlyBudget:
                 expenses[section] = []
                 for expense in defaults[section]:
                     expenses[section].append(BudgetedExpense(
-                        expense, "", float(defaults[section][expense])))
+                        expense, ExpenseRouting.parse(""),
+                        float(defaults[section][expense])))
         return MonthlyBudget(expenses, incomes, [], [], [])
 
 ###############################################################################
@@ -0,0 +1,137 @@
+###############################################################################
+# NAME:             checkpoint.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Checkpoint of the expenses already applied to a monthly
+#                   budget, so that reruns only have to apply new rows.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import hashlib
+from typing import Dict, Tuple
+
+from ..sheet import getUsedArea, CONTENT_FLAGS
+from .budget import MonthlyBudget
+
+# Record, Name, Section, Value
+FORM_COLUMNS = 4
+
+def hashRows(rows) -> str:
+    """Hash the raw contents (from getDataArray()) of some sheet rows"""
+    return hashlib.sha1(repr(tuple(rows)).encode('utf-8')).hexdigest()
+
+def hashBudgetInputs(budget: MonthlyBudget) -> str:
+    """Hash everything in the budget that applying an expense depends on"""
+    inputs = (
+        tuple((section, expense.getDescription(), expense.getAccountName(),
+               expense.getBudgeted())
+              for section, expenses in budget.getExpenseSections().items()
+              for expense in expenses),
+        tuple((income.getDescription(), income.getAccountName(),
+               income.getAmount()) for income in budget.getIncomes()),
+        tuple((account.getAccountName(), account.getStartingBalance())
+              for account in budget.getAccountSummaries()),
+    )
+    return hashRows(inputs)
+
+class MonthlyCheckpoint:
+    """The state of a budget after applying the first appliedRows rows of its
+    expense sheet, none of which were dated in the future."""
+    def __init__(self, appliedRows: int, rowsHash: str, budgetHash: str,
+                 spent: Dict[Tuple[str, str], float],
+                 received: Dict[str, float], balances: Dict[str, float]):
+        self.appliedRows = appliedRows
+        self.rowsHash = rowsHash
+        self.budgetHash = budgetHash
+        self.spent = spent
+        self.received = received
+        self.balances = balances
+
+    def getAppliedRows(self):
+        return self.appliedRows
+
+    def matches(self, budgetHash, rows) -> bool:
+        """Whether the checkpoint still holds for the budget inputs and the
+        expense rows. It doesn't if any row it covers has changed."""
+        return budgetHash == self.budgetHash \
+            and len(rows) >= self.appliedRows \
+            and hashRows(rows[:self.appliedRows]) == self.rowsHash
+
+    def restore(self, budget: MonthlyBudget):
+        for section, expenses in budget.getExpenseSections().items():
+            for expense in expenses:
+                expense.setSpent(self.spent.get(
+                    (section, expense.getDescription()), 0))
+        for income in budget.getIncomes():
+            income.setReceived(
+                self.received.get(income.getDescription(), 0.0))
+        for account in budget.getAccountSummaries():
+            account.setCurrentBalance(self.balances.get(
+                account.getAccountName(), account.getStartingBalance()))
+
+    @staticmethod
+    def capture(budget: MonthlyBudget, rows, budgetHash):
+        """Capture the state of budget, after applying rows"""
+        spent = {(section, expense.getDescription()): expense.getSpent()
+                 for section, expenses in budget.getExpenseSections().items()
+                 for expense in expenses}
+        received = {income.getDescription(): income.getReceived()
+                    for income in budget.getIncomes()}
+        balances = {account.getAccountName(): account.getCurrentBalance()
+                    for account in budget.getAccountSummaries()}
+        return MonthlyCheckpoint(len(rows), hashRows(rows), budgetHash, spent,
+                                 received, balances)
+
+class MonthlyCheckpointSheet:
+    """Persists a MonthlyCheckpoint to a hidden sheet, one value per row"""
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def read(self) -> MonthlyCheckpoint:
+        """Returns None if the sheet doesn't hold a checkpoint"""
+        _, lastRow = getUsedArea(self.sheet)
+        rows = self.sheet.getCellRangeByPosition(
+            0, 0, FORM_COLUMNS - 1, lastRow).getDataArray()
+        header = {}
+        spent = {}
+        received = {}
+        balances = {}
+        for record, name, section, value in rows:
+            if record == 'Spent':
+                spent[(section, name)] = value
+            elif record == 'Received':
+                received[name] = value
+            elif record == 'Balance':
+                balances[name] = value
+            elif record:
+                header[record] = (name, value)
+        try:
+            return MonthlyCheckpoint(
+                int(header['Applied Rows'][1]), header['Rows Hash'][0],
+                header['Budget Hash'][0], spent, received, balances)
+        except KeyError:
+            return None
+
+    def write(self, checkpoint: MonthlyCheckpoint):
+        rows = [('Applied Rows', '', '', float(checkpoint.appliedRows)),
+                ('Rows Hash', checkpoint.rowsHash, '', ''),
+                ('Budget Hash', checkpoint.budgetHash, '', '')]
+        for (section, name), value in checkpoint.spent.items():
+            rows.append(('Spent', name, section, float(value)))
+        for name, value in checkpoint.received.items():
+            rows.append(('Received', name, '', float(value)))
+        for name, value in checkpoint.balances.items():
+            rows.append(('Balance', name, '', float(value)))
+
+        _, lastRow = getUsedArea(self.sheet)
+        self.sheet.getCellRangeByPosition(
+            0, 0, FORM_COLUMNS - 1, lastRow).clearContents(CONTENT_FLAGS)
+        self.sheet.getCellRangeByPosition(
+            0, 0, FORM_COLUMNS - 1, len(rows) - 1).setDataArray(tuple(rows))
+        self.sheet.setPropertyValue('IsVisible', False)
+
+###############################################################################
@@ -7,19 +7,19 @@
 #
 # CREATED:          02/06/2022
 #
-# LAST EDITED:      02/07/2022
+# LAST EDITED:      10/18/2026
 ###
 
 from datetime import datetime
 from typing import List
 
-import uno
-from com.sun.star.awt.FontWeight import BOLD
 
 from ..cellformat import NumberFormat
-from ..cellname import getCellNameFromCoordinates, COLUMN_MAX, ROW_MAX
+from ..cellname import RangeAddress, ROW_MAX
 from ..cellrange import CellMatrix, CellRow
-from ..sheet import SheetTable
+from ..columnar import ExpenseTable
+from ..constants import FontWeight
+from ..sheet import SheetTable, getCellDate, getCellString, parseDate
 
 class MonthlyExpense:
     def __init__(self, description, lineItem, category, date, amount,
@@ -58,7 +58,7 @@ class MonthlyExpenseRecord:
         description = next(recordIter).String
         lineItem = next(recordIter).String
         category = next(recordIter).String
-        date = datetime.strptime(next(recordIter).String, '%m/%d/%y')
+        date = getCellDate(next(recordIter))
         amount = next(recordIter).Value
         accountName = next(recordIter).String
         return MonthlyExpense(description, lineItem, category, date, amount,
@@ -78,28 +78,65 @@ class MonthlyExpenseRecord:
 
         next(recordIter).String = expense.getAccountName()
 
+# Description, Line Item, Category, Date, Amount, Account
+FORM_COLUMNS = 6
+
 class MonthlyExpenseSheet:
     def __init__(self, sheet):
         self.sheet = sheet
-        cellspec = f'A1:{getCellNameFromCoordinates(COLUMN_MAX, ROW_MAX)}'
-        self.cellrange = CellMatrix(cellspec, sheet)
+        self.address = RangeAddress(0, 0, FORM_COLUMNS - 1, ROW_MAX)
+        self.table = None
 
     def write(self, expenses: List[MonthlyExpense]):
-        rowIter = iter(self.cellrange)
+        cellrange = CellMatrix(self.address, self.sheet, buffered=True)
+        rowIter = iter(cellrange)
         recordIter = iter(next(rowIter))
         for header in ["Description", "Line Item", "Category", "Date",
                        "Amount", "Account"]:
             headerCell = next(recordIter)
             headerCell.String = header
-            headerCell.CharWeight = BOLD
+            headerCell.CharWeight = FontWeight.BOLD
         for expense in expenses:
             MonthlyExpenseRecord(next(rowIter)).write(expense)
-
-    def read(self) -> List[MonthlyExpense]:
-        sheetTable = SheetTable('A1', 6, self.sheet)
+        cellrange.flush()
+
+    def getTable(self) -> SheetTable:
+        # The sheet is read once, no matter how many times it's looked at
+        if self.table is None:
+            self.table = SheetTable('A1', FORM_COLUMNS, self.sheet,
+                                    snapshot=True)
+        return self.table
+
+    def getDataArray(self):
+        """Get the raw contents of the expense rows as a tuple of rows"""
+        return self.getTable().getDataArray()
+
+    def read(self, start=0) -> List[MonthlyExpense]:
+        """Read the expenses, skipping the first start rows"""
+        sheetTable = self.getTable()
         expenses = []
-        for row in sheetTable:
-            expenses.append(MonthlyExpenseRecord(row).read())
+        for index in range(start, sheetTable.getCount()):
+            expenses.append(
+                MonthlyExpenseRecord(sheetTable.getItem(index)).read())
         return expenses
 
+    def readTable(self, start=0) -> ExpenseTable:
+        """Read the expenses into an ExpenseTable, skipping the first start
+        rows. Contents are taken from the table's snapshot, instead of from
+        each cell."""
+        sheetTable = self.getTable()
+        table = ExpenseTable()
+        for index, data in enumerate(sheetTable.getDataArray()[start:],
+                                     start):
+            row = sheetTable.getItem(index)
+            description, lineItem, category = (
+                getCellString(row, column, data[column])
+                for column in range(3))
+            amount = data[4]
+            table.append(
+                description, lineItem, category, parseDate(data[3]),
+                0.0 if isinstance(amount, str) else amount,
+                getCellString(row, 5, data[5]))
+        return table
+
 ###############################################################################
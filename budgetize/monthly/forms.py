@@ -7,28 +7,29 @@
 #
 # CREATED:          02/06/2022
 #
-# LAST EDITED:      02/07/2022
+# LAST EDITED:      10/18/2026
 ###
 
-from configparser import ConfigParser
-import uno
-from com.sun.star.awt.FontWeight import BOLD
 from typing import Dict, List
 from datetime import datetime
 
 from ..account import AccountHistorySummary, AccountHistorySummaryRecord
 from ..cellformat import NumberFormat
 from ..cellrange import CellMatrix, CellMatrixIterator
-from ..cellname import getCellNameFromCoordinates, COLUMN_MAX, ROW_MAX
+from ..cellname import RangeAddress, ROW_MAX
+from ..constants import FontWeight
 from ..expense import BudgetedExpense, BudgetedExpenseRecord
 from ..fund import SinkingFund, SinkingFundRecord
 from ..income import Income, IncomeRecord
-from ..sheet import clearSheet
+from ..sheet import getUsedArea, hasContents, CONTENT_FLAGS, FORMAT_FLAGS
 from ..loan import Loan, LoanRecord
 
 from .expense import MonthlyExpense
 from .budget import MonthlyBudget
 
+# The widest row in the form is five cells wide (the expense sections)
+FORM_COLUMNS = 5
+
 class ExpenseSubForm:
     def __init__(self, iterator: CellMatrixIterator):
         self.rowIterator = iterator
@@ -38,11 +39,11 @@ class ExpenseSubForm:
         next(self.rowIterator) # Eat the total row
         currentRow = next(self.rowIterator)
         expensesBySection = {}
-        while currentRow.getItem(4).String:
+        while hasContents(currentRow.getItem(4)):
             sectionName = currentRow.getItem(0).String
             currentRow = next(self.rowIterator)
             expenses = []
-            while currentRow.getItem(0).String:
+            while hasContents(currentRow.getItem(0)):
                 expenses.append(BudgetedExpenseRecord(currentRow).read())
                 currentRow = next(self.rowIterator)
             if sectionName:
@@ -56,18 +57,18 @@ class ExpenseSubForm:
         for header in ["Expenses", "Account", "Budgeted", "Spent",
                        "Remaining"]:
             expensesTitleCell = next(titleRow)
-            expensesTitleCell.CharWeight = BOLD
+            expensesTitleCell.CharWeight = FontWeight.BOLD
             expensesTitleCell.String = header
         totalCell = next(secondTitleRow)
         totalCell.String = "Total"
-        totalCell.CharWeight = BOLD
+        totalCell.CharWeight = FontWeight.BOLD
         next(secondTitleRow)
         return secondTitleRow
 
     def writeTotals(self, iterator, totals: List[float]):
         for total in totals:
             totalCell = next(iterator)
-            totalCell.CharWeight = BOLD
+            totalCell.CharWeight = FontWeight.BOLD
             totalCell.NumberFormat = NumberFormat.CURRENCY
             totalCell.Value = total
 
@@ -78,7 +79,7 @@ class ExpenseSubForm:
         for section in expenses:
             sectionHeaderIter = iter(next(self.rowIterator))
             sectionTitleCell = next(sectionHeaderIter)
-            sectionTitleCell.CharWeight = BOLD
+            sectionTitleCell.CharWeight = FontWeight.BOLD
             sectionTitleCell.String = section
 
             budgeted = 0.0
@@ -106,7 +107,7 @@ class IncomeSubForm:
         next(self.rowIterator) # Eat the header row
         currentRow = next(self.rowIterator)
         incomes = []
-        while currentRow.getItem(0).String:
+        while hasContents(currentRow.getItem(0)):
             incomes.append(IncomeRecord(currentRow).read())
             currentRow = next(self.rowIterator)
         return incomes, self.rowIterator
@@ -115,14 +116,14 @@ class IncomeSubForm:
         for header in ["Incomes", "", "Expected", "Received"]:
             sectionTitleCell = next(iterator)
             sectionTitleCell.String = header
-            sectionTitleCell.CharWeight = BOLD
+            sectionTitleCell.CharWeight = FontWeight.BOLD
 
     def write(self, incomes: List[Income]):
         iterator = self.writeHeaders(iter(next(self.rowIterator)))
         totalRowIterator = iter(next(self.rowIterator))
         totalCell = next(totalRowIterator)
         totalCell.String = "Total"
-        totalCell.CharWeight = BOLD
+        totalCell.CharWeight = FontWeight.BOLD
 
         totalExpected = 0.0
         totalReceived = 0.0
@@ -133,12 +134,12 @@ class IncomeSubForm:
 
         next(totalRowIterator)
         totalCell = next(totalRowIterator)
-        totalCell.CharWeight = BOLD
+        totalCell.CharWeight = FontWeight.BOLD
         totalCell.NumberFormat = NumberFormat.CURRENCY
         totalCell.Value = totalExpected
 
         totalCell = next(totalRowIterator)
-        totalCell.CharWeight = BOLD
+        totalCell.CharWeight = FontWeight.BOLD
         totalCell.NumberFormat = NumberFormat.CURRENCY
         totalCell.Value = totalReceived
         return self.rowIterator
@@ -151,7 +152,7 @@ class AccountHistorySummarySubForm:
     def read(self) -> (List[AccountHistorySummary], datetime, datetime):
         currentRow = next(self.rowIterator)
         accounts = []
-        while currentRow.getItem(0).String:
+        while hasContents(currentRow.getItem(0)):
             accounts.append(AccountHistorySummaryRecord(currentRow).read())
             currentRow = next(self.rowIterator)
         return accounts, self.rowIterator
@@ -162,7 +163,7 @@ class AccountHistorySummarySubForm:
                    "Expected Period End Balance"]
         for header in headers:
             headerCell = next(headerRow)
-            headerCell.CharWeight = BOLD
+            headerCell.CharWeight = FontWeight.BOLD
             headerCell.String = header
 
         for summary in summaries:
@@ -176,7 +177,7 @@ class SinkingFundSubForm:
     def read(self) -> List[SinkingFund]:
         currentRow = next(self.rowIterator)
         funds = []
-        while currentRow.getItem(0).String:
+        while hasContents(currentRow.getItem(0)):
             funds.append(SinkingFundRecord(currentRow).read())
             currentRow = next(self.rowIterator)
         return funds, self.rowIterator
@@ -187,7 +188,7 @@ class SinkingFundSubForm:
                    "Current Balance", "Expected Period End Balance"]
         for header in headers:
             headerCell = next(headerRow)
-            headerCell.CharWeight = BOLD
+            headerCell.CharWeight = FontWeight.BOLD
             headerCell.String = header
 
         for fund in funds:
@@ -201,7 +202,7 @@ class LoanSubForm:
     def read(self) -> (List[Loan], CellMatrixIterator):
         currentRow = next(self.rowIterator)
         loans = []
-        while currentRow.getItem(0).String:
+        while hasContents(currentRow.getItem(0)):
             loans.append(LoanRecord(currentRow).read())
             currentRow = next(self.rowIterator)
         return loans, self.rowIterator
@@ -211,7 +212,7 @@ class LoanSubForm:
         for header in ["Loan", "Interest", "Starting Balance",
                        "Ending Balance", "Est. Payoff Period"]:
             headerCell = next(headerRow)
-            headerCell.CharWeight = BOLD
+            headerCell.CharWeight = FontWeight.BOLD
             headerCell.String = header
         for loan in loans:
             LoanRecord(next(self.rowIterator)).write(loan)
@@ -221,12 +222,18 @@ class MonthlyBudgetSheet:
     """Monthly budget form"""
     def __init__(self, sheet):
         self.sheet = sheet
-        cellspec = f'A1:{getCellNameFromCoordinates(COLUMN_MAX, ROW_MAX)}'
-        self.cellrange = CellMatrix(cellspec, sheet)
+        self.address = RangeAddress(0, 0, FORM_COLUMNS - 1, ROW_MAX)
 
     def write(self, budget: MonthlyBudget):
-        clearSheet(self.sheet)
-        rowIterator = iter(self.cellrange)
+        """Only the cells whose contents changed since the last write are
+        written, and stale cells past the end of the new form are cleared.
+        Formatting is cheap to apply in bulk, so it's reset and reapplied."""
+        _, lastRow = getUsedArea(self.sheet)
+        lastRow = min(lastRow + 1, ROW_MAX)
+        previous = CellMatrix(
+            self.address[:lastRow + 1], self.sheet, snapshot=True)
+        cellrange = CellMatrix(self.address, self.sheet, buffered=True)
+        rowIterator = iter(cellrange)
         rowIterator = ExpenseSubForm(rowIterator).write(
             budget.getExpenseSections())
         next(rowIterator)
@@ -239,8 +246,19 @@ class MonthlyBudgetSheet:
         next(rowIterator)
         LoanSubForm(rowIterator).write(budget.getLoans())
 
+        for left, top, right, bottom in cellrange.diff(previous):
+            self.sheet.getCellRangeByPosition(
+                left, top, right, bottom).clearContents(CONTENT_FLAGS)
+        self.sheet.getCellRangeByPosition(
+            0, 0, FORM_COLUMNS - 1, lastRow).clearContents(FORMAT_FLAGS)
+        cellrange.flush()
+
     def read(self) -> MonthlyBudget:
-        rowIterator = iter(self.cellrange)
+        # Each sub-form reads one row past its last record, so the last
+        # sub-form needs one row after the used area.
+        _, lastRow = getUsedArea(self.sheet)
+        cellspec = self.address[:min(lastRow + 1, ROW_MAX) + 1]
+        rowIterator = iter(CellMatrix(cellspec, self.sheet, snapshot=True))
         expenses, rowIterator = ExpenseSubForm(rowIterator).read()
         next(rowIterator)
         incomes, rowIterator = IncomeSubForm(rowIterator).read()
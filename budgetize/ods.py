@@ -0,0 +1,492 @@
+###############################################################################
+# NAME:             ods.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Sheet backend reading and writing OpenDocument spreadsheet
+#                   files directly, for batch runs without an Office server.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import copy
+from datetime import datetime
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ElementTree
+from xml.sax.saxutils import quoteattr
+import zipfile
+
+from .cellformat import DATE_EPOCH
+from .memory import MemorySheetBackend, MemorySheet, formatValue
+from . import cellname
+
+OFFICE = 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+STYLE = 'urn:oasis:names:tc:opendocument:xmlns:style:1.0'
+TABLE = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
+TEXT = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
+NUMBER = 'urn:oasis:names:tc:opendocument:xmlns:datastyle:1.0'
+FO = 'urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0'
+CALCEXT = 'urn:org:documentfoundation:names:experimental:calc:xmlns:' \
+    + 'calcext:1.0'
+
+CONTENT = 'content.xml'
+
+# Property assigned to cells read from the file, holding their cell style
+STYLE_PROPERTY = 'OdsStyleName'
+
+# Automatic styles used for the formatting the budgetizer applies
+CURRENCY_STYLE = 'budgetizeN1'
+CELL_STYLES = {
+    (True, False): 'budgetizeC1', # Bold
+    (False, True): 'budgetizeC2', # Currency
+    (True, True): 'budgetizeC3', # Bold currency
+}
+HIDDEN_TABLE_STYLE = 'budgetizeT1'
+
+def qualify(namespace, name):
+    return f'{{{namespace}}}{name}'
+
+def getText(element):
+    """Get the text content of a text:p element"""
+    parts = [element.text or '']
+    for child in element:
+        if child.tag == qualify(TEXT, 's'):
+            parts.append(' ' * int(child.get(qualify(TEXT, 'c'), '1')))
+        elif child.tag == qualify(TEXT, 'tab'):
+            parts.append('\t')
+        elif child.tag == qualify(TEXT, 'line-break'):
+            parts.append('\n')
+        else:
+            parts.append(getText(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+def getCellData(cell):
+    """Get (data, display string) of a table:table-cell element"""
+    valueType = cell.get(qualify(OFFICE, 'value-type'), None)
+    paragraphs = cell.findall(qualify(TEXT, 'p'))
+    display = '\n'.join(getText(p) for p in paragraphs)
+    if valueType in ('float', 'currency', 'percentage'):
+        return float(cell.get(qualify(OFFICE, 'value'))), display
+    elif valueType == 'date':
+        date = datetime.fromisoformat(cell.get(qualify(OFFICE, 'date-value')))
+        delta = date - DATE_EPOCH
+        return delta.days + delta.seconds / 86400, display
+    elif valueType == 'boolean':
+        value = cell.get(qualify(OFFICE, 'boolean-value')) == 'true'
+        return float(value), display
+    return display, None
+
+# Elements which hold rows, and the attributes which describe the value of a
+# cell, and so are out of date once its contents are replaced
+ROW_GROUPS = ('table-rows', 'table-header-rows', 'table-row-group')
+VALUE_ATTRIBUTES = (
+    (OFFICE, 'value-type'), (OFFICE, 'value'), (OFFICE, 'date-value'),
+    (OFFICE, 'time-value'), (OFFICE, 'boolean-value'),
+    (OFFICE, 'string-value'), (OFFICE, 'currency'), (TABLE, 'formula'),
+    (CALCEXT, 'value-type'))
+
+class OdsSheet(MemorySheet):
+    """Remembers which cells were changed since the sheet was read, so that
+    only those have to be written back. Assignments which don't change a cell
+    aren't counted, so a formula is only replaced if its value is."""
+    def __init__(self, name):
+        super().__init__(name)
+        self.changedData = set()
+        self.changedProperties = set()
+
+    def setData(self, column, row, data):
+        if self.cells.get((column, row), '') == ('' if data is None else data):
+            return
+        super().setData(column, row, data)
+        self.changedData.add((column, row))
+
+    def setProperty(self, column, row, name, value):
+        properties = self.properties.get((column, row), {})
+        if name in properties and properties[name] == value:
+            return
+        super().setProperty(column, row, name, value)
+        self.changedProperties.add((column, row))
+
+    def clearProperties(self, column, row):
+        super().clearProperties(column, row)
+        self.changedProperties.add((column, row))
+
+    def getChangedCells(self):
+        return self.changedData | self.changedProperties
+
+    def markSaved(self):
+        self.modified = False
+        self.changedData = set()
+        self.changedProperties = set()
+
+class OdsSheetBackend(MemorySheetBackend):
+    """Loads every sheet of an .ods file into memory. Only non-empty cells are
+    stored, and repeated rows and columns are only expanded where they have
+    contents. save() writes the cells which were changed back out, leaving
+    everything else in the file as it was."""
+    SHEET_TYPE = OdsSheet
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.originalSheets = set()
+        self.load()
+
+    def load(self):
+        with zipfile.ZipFile(self.path) as archive:
+            with archive.open(CONTENT) as content:
+                self.parse(content)
+        self.originalSheets = set(self.sheets)
+
+    def parse(self, content):
+        sheet = None
+        row = 0
+        column = 0
+        rowsRepeated = 1
+        for event, element in ElementTree.iterparse(
+                content, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == qualify(TABLE, 'table'):
+                    sheet = OdsSheet(element.get(qualify(TABLE, 'name')))
+                    self.sheets[sheet.getName()] = sheet
+                    row = 0
+                elif tag == qualify(TABLE, 'table-row'):
+                    column = 0
+                    rowsRepeated = int(element.get(
+                        qualify(TABLE, 'number-rows-repeated'), '1'))
+                continue
+
+            if tag in (qualify(TABLE, 'table-cell'),
+                       qualify(TABLE, 'covered-table-cell')):
+                columnsRepeated = int(element.get(
+                    qualify(TABLE, 'number-columns-repeated'), '1'))
+                data, display = getCellData(element)
+                styleName = element.get(qualify(TABLE, 'style-name'), None)
+                if data != '' or styleName:
+                    self.storeCell(
+                        sheet, column, row, columnsRepeated, rowsRepeated,
+                        data, display, styleName)
+                column += columnsRepeated
+                element.clear()
+            elif tag == qualify(TABLE, 'table-row'):
+                row += rowsRepeated
+                element.clear()
+            elif tag == qualify(TABLE, 'table'):
+                sheet.markSaved()
+                sheet = None
+                element.clear()
+
+    @staticmethod
+    def storeCell(sheet, column, row, columns, rows, data, display,
+                  styleName):
+        # Trailing, empty styled cells are usually repeated to the edge of the
+        # sheet. Their style doesn't need to be kept around for them.
+        if data == '' and (columns > 1 or rows > 1):
+            return
+        lastColumn = min(column + columns, cellname.COLUMN_MAX + 1)
+        lastRow = min(row + rows, cellname.ROW_MAX + 1)
+        for cellRow in range(row, lastRow):
+            for cellColumn in range(column, lastColumn):
+                if data != '':
+                    sheet.setData(cellColumn, cellRow, data)
+                if display is not None:
+                    sheet.strings[(cellColumn, cellRow)] = display
+                if styleName:
+                    sheet.setProperty(
+                        cellColumn, cellRow, STYLE_PROPERTY, styleName)
+
+    def getModifiedSheets(self):
+        return [sheet for name, sheet in self.sheets.items()
+                if sheet.modified or name not in self.originalSheets]
+
+    def save(self, path=None):
+        """Write the document to path (by default, the file it was read
+        from), replacing the tables of the sheets which were modified."""
+        path = path or self.path
+        with zipfile.ZipFile(self.path) as archive:
+            content = self.renderContent(archive)
+            handle, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)), suffix='.ods')
+            os.close(handle)
+            try:
+                with zipfile.ZipFile(temporary, 'w') as output:
+                    for info in archive.infolist():
+                        data = content if info.filename == CONTENT \
+                            else archive.read(info.filename)
+                        output.writestr(info, data)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        self.path = path
+        self.originalSheets = set(self.sheets)
+        for sheet in self.sheets.values():
+            sheet.markSaved()
+
+    def renderContent(self, archive):
+        modified = self.getModifiedSheets()
+        if not modified:
+            return archive.read(CONTENT)
+
+        # The styles added to the document may use namespaces it doesn't
+        # declare yet. They get their usual prefixes, instead of ns0, ns1...
+        namespaces = {'number': NUMBER, 'fo': FO}
+        with archive.open(CONTENT) as content:
+            for _, (prefix, uri) in ElementTree.iterparse(
+                    content, events=('start-ns',)):
+                if not re.fullmatch(r'ns\d+', prefix):
+                    namespaces[prefix] = uri
+        for prefix, uri in namespaces.items():
+            ElementTree.register_namespace(prefix, uri)
+        with archive.open(CONTENT) as content:
+            tree = ElementTree.parse(content)
+
+        root = tree.getroot()
+        OdsSheetBackend.addAutomaticStyles(root)
+        spreadsheet = root.find(
+            f'{qualify(OFFICE, "body")}/{qualify(OFFICE, "spreadsheet")}')
+        tables = {table.get(qualify(TABLE, 'name')): table
+                  for table in spreadsheet.findall(qualify(TABLE, 'table'))}
+        for sheet in modified:
+            table = tables.get(sheet.getName(), None)
+            if table is None:
+                table = ElementTree.Element(qualify(TABLE, 'table'))
+                table.set(qualify(TABLE, 'name'), sheet.getName())
+                children = list(spreadsheet)
+                lastTable = max((index for index, child in enumerate(children)
+                                 if child.tag == qualify(TABLE, 'table')),
+                                default=-1)
+                spreadsheet.insert(lastTable + 1, table)
+            OdsSheetBackend.renderTable(table, sheet)
+        return OdsSheetBackend.declareNamespaces(
+            ElementTree.tostring(root, encoding='UTF-8',
+                                 xml_declaration=True), namespaces)
+
+    @staticmethod
+    def declareNamespaces(content, namespaces):
+        """ElementTree only declares the namespaces of the element and
+        attribute names it writes, but prefixes are also used inside attribute
+        values, like the of: of table:formula="of:=SUM([.A1:.A3])". Put every
+        declaration of the original root element back on the root."""
+        start = re.search(rb'<(?![?!])[^\s>/]+', content)
+        end = content.index(b'>', start.end())
+        rootTag = content[start.start():end]
+        declarations = b''.join(
+            f' xmlns:{prefix}={quoteattr(uri)}'.encode('utf-8')
+            for prefix, uri in namespaces.items()
+            if prefix and f'xmlns:{prefix}='.encode('utf-8') not in rootTag)
+        return content[:start.end()] + declarations + content[start.end():]
+
+    @staticmethod
+    def addAutomaticStyles(root):
+        styles = root.find(qualify(OFFICE, 'automatic-styles'))
+        if styles is None:
+            styles = ElementTree.Element(qualify(OFFICE, 'automatic-styles'))
+            root.insert(0, styles)
+        names = {style.get(qualify(STYLE, 'name')) for style in styles}
+        if CURRENCY_STYLE not in names:
+            currency = ElementTree.SubElement(
+                styles, qualify(NUMBER, 'currency-style'),
+                {qualify(STYLE, 'name'): CURRENCY_STYLE})
+            ElementTree.SubElement(
+                currency, qualify(NUMBER, 'currency-symbol')).text = '$'
+            ElementTree.SubElement(currency, qualify(NUMBER, 'number'), {
+                qualify(NUMBER, 'decimal-places'): '2',
+                qualify(NUMBER, 'min-integer-digits'): '1',
+                qualify(NUMBER, 'grouping'): 'true'})
+        for (bold, currency), name in CELL_STYLES.items():
+            if name in names:
+                continue
+            style = ElementTree.SubElement(styles, qualify(STYLE, 'style'), {
+                qualify(STYLE, 'name'): name,
+                qualify(STYLE, 'family'): 'table-cell',
+                qualify(STYLE, 'parent-style-name'): 'Default'})
+            if currency:
+                style.set(qualify(STYLE, 'data-style-name'), CURRENCY_STYLE)
+            if bold:
+                ElementTree.SubElement(
+                    style, qualify(STYLE, 'text-properties'),
+                    {qualify(FO, 'font-weight'): 'bold'})
+        if HIDDEN_TABLE_STYLE not in names:
+            style = ElementTree.SubElement(styles, qualify(STYLE, 'style'), {
+                qualify(STYLE, 'name'): HIDDEN_TABLE_STYLE,
+                qualify(STYLE, 'family'): 'table'})
+            ElementTree.SubElement(
+                style, qualify(STYLE, 'table-properties'),
+                {qualify(TABLE, 'display'): 'false'})
+
+    @staticmethod
+    def getStyleName(properties):
+        bold = properties.get('CharWeight', 0) > 100
+        currency = bool(properties.get('NumberFormat', 0))
+        if bold or currency:
+            return CELL_STYLES[(bold, currency)]
+        return properties.get(STYLE_PROPERTY, None)
+
+    @staticmethod
+    def renderTable(table, sheet: OdsSheet):
+        """Patch the cells of the sheet which were changed into the table.
+        Repeated rows and cells are split around them, and everything else,
+        like formulas, date cells and styles, is left alone."""
+        if sheet.getPropertyValue('IsVisible') is False:
+            table.set(qualify(TABLE, 'style-name'), HIDDEN_TABLE_STYLE)
+
+        changed = {}
+        for column, row in sheet.getChangedCells():
+            changed.setdefault(row, []).append(column)
+        if not changed:
+            return
+
+        # A table needs at least one column definition
+        if table.find(qualify(TABLE, 'table-column')) is None:
+            columns = max(max(row) for row in changed.values()) + 1
+            table.insert(0, ElementTree.Element(
+                qualify(TABLE, 'table-column'),
+                {qualify(TABLE, 'number-columns-repeated'): str(columns)}))
+
+        rowTag = qualify(TABLE, 'table-row')
+        nextRow = 0
+        for parent, rowElement in OdsSheetBackend.getRowElements(table):
+            count = int(rowElement.get(
+                qualify(TABLE, 'number-rows-repeated'), '1'))
+            offsets = sorted(row - nextRow for row in changed
+                             if nextRow <= row < nextRow + count)
+            if offsets:
+                singles = OdsSheetBackend.splitRepeated(
+                    parent, rowElement, 'number-rows-repeated', offsets)
+                for offset, single in singles.items():
+                    OdsSheetBackend.renderRow(
+                        single, sheet, nextRow + offset,
+                        changed.pop(nextRow + offset))
+            nextRow += count
+
+        # Rows past the end of the table
+        for row in sorted(changed):
+            if row > nextRow:
+                ElementTree.SubElement(table, rowTag, {
+                    qualify(TABLE, 'number-rows-repeated'): str(row - nextRow)
+                }).append(ElementTree.Element(qualify(TABLE, 'table-cell')))
+            OdsSheetBackend.renderRow(
+                ElementTree.SubElement(table, rowTag), sheet, row,
+                changed[row])
+            nextRow = row + 1
+
+    @staticmethod
+    def getRowElements(parent):
+        """(parent, row) for each table:table-row, in order, including the
+        rows in header rows and row groups"""
+        rows = []
+        for child in parent:
+            if child.tag == qualify(TABLE, 'table-row'):
+                rows.append((parent, child))
+            elif child.tag in {qualify(TABLE, tag) for tag in ROW_GROUPS}:
+                rows.extend(OdsSheetBackend.getRowElements(child))
+        return rows
+
+    @staticmethod
+    def splitRepeated(parent, element, attribute, offsets):
+        """Replace element, which stands for as many rows or cells as its
+        attribute says, with copies of it, so that each of offsets (sorted)
+        is covered by a copy of its own. Returns those copies by offset."""
+        name = qualify(TABLE, attribute)
+        count = int(element.get(name, '1'))
+        if count == 1:
+            return {0: element}
+
+        def repeat(times):
+            piece = copy.deepcopy(element)
+            if times > 1:
+                piece.set(name, str(times))
+            else:
+                piece.attrib.pop(name, None)
+            return piece
+
+        pieces = []
+        singles = {}
+        start = 0
+        for offset in offsets:
+            if offset > start:
+                pieces.append(repeat(offset - start))
+            singles[offset] = repeat(1)
+            pieces.append(singles[offset])
+            start = offset + 1
+        if count > start:
+            pieces.append(repeat(count - start))
+        index = list(parent).index(element)
+        parent.remove(element)
+        for position, piece in enumerate(pieces):
+            parent.insert(index + position, piece)
+        return singles
+
+    @staticmethod
+    def renderRow(rowElement, sheet, row, columns):
+        cellTags = (qualify(TABLE, 'table-cell'),
+                    qualify(TABLE, 'covered-table-cell'))
+        columns = set(columns)
+        nextColumn = 0
+        for cell in [child for child in rowElement if child.tag in cellTags]:
+            count = int(cell.get(
+                qualify(TABLE, 'number-columns-repeated'), '1'))
+            offsets = sorted(column - nextColumn for column in columns
+                             if nextColumn <= column < nextColumn + count)
+            if offsets:
+                singles = OdsSheetBackend.splitRepeated(
+                    rowElement, cell, 'number-columns-repeated', offsets)
+                for offset, single in singles.items():
+                    OdsSheetBackend.renderCell(
+                        single, sheet, nextColumn + offset, row)
+                    columns.discard(nextColumn + offset)
+            nextColumn += count
+
+        # Cells past the end of the row
+        for column in sorted(columns):
+            if column > nextColumn:
+                ElementTree.SubElement(
+                    rowElement, qualify(TABLE, 'table-cell'),
+                    {qualify(TABLE, 'number-columns-repeated'):
+                     str(column - nextColumn)})
+            OdsSheetBackend.renderCell(
+                ElementTree.SubElement(
+                    rowElement, qualify(TABLE, 'table-cell')),
+                sheet, column, row)
+            nextColumn = column + 1
+
+    @staticmethod
+    def renderCell(cell, sheet, column, row):
+        """Write what was changed about the cell at (column, row) into its
+        element"""
+        if (column, row) in sheet.changedProperties:
+            styleName = OdsSheetBackend.getStyleName(
+                sheet.properties.get((column, row), {}))
+            if styleName:
+                cell.set(qualify(TABLE, 'style-name'), styleName)
+            else:
+                cell.attrib.pop(qualify(TABLE, 'style-name'), None)
+        if (column, row) not in sheet.changedData:
+            return
+
+        for namespace, name in VALUE_ATTRIBUTES:
+            cell.attrib.pop(qualify(namespace, name), None)
+        for paragraph in cell.findall(qualify(TEXT, 'p')):
+            cell.remove(paragraph)
+        data = sheet.cells.get((column, row), '')
+        if data == '':
+            return
+        if isinstance(data, str):
+            cell.set(qualify(OFFICE, 'value-type'), 'string')
+            display = data
+        else:
+            cell.set(qualify(OFFICE, 'value-type'), 'float')
+            cell.set(qualify(OFFICE, 'value'), repr(float(data)))
+            display = sheet.strings.get((column, row), None) \
+                or formatValue(data)
+        for line in display.split('\n'):
+            ElementTree.SubElement(cell, qualify(TEXT, 'p')).text = line
+
+###############################################################################
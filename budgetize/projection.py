@@ -0,0 +1,179 @@
+###############################################################################
+# NAME:             projection.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Projects account, loan and sinking fund balances forward
+#                   several months from the current budget. Requires numpy.
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import calendar
+from configparser import ConfigParser
+from typing import List
+
+import numpy
+
+from .cellformat import NumberFormat
+from .constants import FontWeight
+from .amortization import getBalances
+from .backend import SheetBackend
+from .monthly.budget import MonthlyBudget
+from .monthly.forms import MonthlyBudgetSheet
+from .sheet import clearSheet
+
+PROJECTION_SHEET = 'Projection'
+
+class BalanceProjection:
+    """Balances at the end of each projected month. The balance arrays have
+    one row per month, and one column per account, loan or fund."""
+    def __init__(self, month, accountNames, accounts, loanNames, loans,
+                 fundNames, funds):
+        self.month = month
+        self.accountNames = accountNames
+        self.accounts = accounts
+        self.loanNames = loanNames
+        self.loans = loans
+        self.fundNames = fundNames
+        self.funds = funds
+
+    def getMonths(self) -> List[str]:
+        """Names of the projected months, starting with the one after the
+        budget's month"""
+        first = list(calendar.month_name).index(self.month)
+        return [calendar.month_name[(first + offset - 1) % 12 + 1]
+                for offset in range(1, len(self.accounts) + 1)]
+
+    def getAccountBalances(self):
+        return self.accounts
+
+    def getLoanBalances(self):
+        return self.loans
+
+    def getFundBalances(self):
+        return self.funds
+
+class BudgetProjector:
+    """Chains the state of a budget forward, assuming that every following
+    month repeats its incomes and line items. Where defaults (the template for
+    new budgets) has an amount for a line item or income, that amount is
+    used, since that's what new budgets will start with. Line items which are
+    only in the template have no account, and are left out."""
+    def __init__(self, budget: MonthlyBudget, month, defaults=None):
+        self.budget = budget
+        self.month = month
+        self.defaults = defaults or ConfigParser()
+
+    def getTemplateAmount(self, section, name, amount):
+        if self.defaults.has_option(section, name):
+            return float(self.defaults[section][name])
+        return amount
+
+    def getAccountFlows(self, accountIndices, loanIndices):
+        """Returns the monthly net flow into each account, not counting loan
+        payments, and the monthly payment into each loan from each account."""
+        flows = numpy.zeros(len(accountIndices))
+        payments = numpy.zeros((len(loanIndices), len(accountIndices)))
+        for income in self.budget.getIncomes():
+            if income.getAccountName() not in accountIndices:
+                continue
+            amount = self.getTemplateAmount(
+                'Incomes', income.getDescription(), income.getAmount())
+            flows[accountIndices[income.getAccountName()]] += amount
+        for section, expenses in self.budget.getExpenseSections().items():
+            for expense in expenses:
+                routing = expense.getRouting()
+                if routing.getAccountName() not in accountIndices:
+                    continue
+                account = accountIndices[routing.getAccountName()]
+                amount = self.getTemplateAmount(
+                    section, expense.getDescription(), expense.getBudgeted())
+                if routing.isTransfer() \
+                   and routing.getLoanName() in loanIndices:
+                    payments[loanIndices[routing.getLoanName()],
+                             account] += amount
+                else:
+                    flows[account] -= amount
+        return flows, payments
+
+    def project(self, months) -> BalanceProjection:
+        accounts = self.budget.getAccountSummaries()
+        loans = self.budget.getLoans()
+        funds = self.budget.getSinkingFunds()
+        accountIndices = {account.getAccountName(): index
+                          for index, account in enumerate(accounts)}
+        loanIndices = {loan.getName(): index
+                       for index, loan in enumerate(loans)}
+        flows, payments = self.getAccountFlows(accountIndices, loanIndices)
+
+        # Loans: the payments actually made stop once a loan is paid off, and
+        # are split between the accounts they come from.
+        loanPayments = payments.sum(axis=1)
+        loanBalances = getBalances(
+            numpy.array([loan.getEndingBalance() for loan in loans]),
+            numpy.array([loan.getAPR() for loan in loans]), loanPayments,
+            months)
+        previous = numpy.vstack([
+            [loan.getEndingBalance() for loan in loans], loanBalances[:-1]])
+        rates = numpy.array([loan.getAPR() for loan in loans])
+        paid = previous * (1 + rates / 12) - loanBalances
+        shares = payments / numpy.where(
+            loanPayments > 0, loanPayments, 1)[:, numpy.newaxis]
+
+        accountFlows = flows - paid @ shares
+        accountBalances = numpy.array(
+            [account.getExpectedEndBalance() for account in accounts]) \
+            + numpy.cumsum(accountFlows, axis=0)
+
+        # Sinking funds keep growing by what they were expected to this month
+        growth = numpy.array([fund.getExpectedEndBalance()
+                              - fund.getStartingBalance() for fund in funds])
+        fundBalances = numpy.array(
+            [fund.getExpectedEndBalance() for fund in funds]) \
+            + numpy.outer(numpy.arange(1, months + 1), growth)
+
+        return BalanceProjection(
+            self.month, list(accountIndices), accountBalances,
+            list(loanIndices), loanBalances,
+            [fund.getDescription() for fund in funds], fundBalances)
+
+class ProjectionSheet:
+    """Writes a BalanceProjection to a sheet, in a handful of calls"""
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def write(self, projection: BalanceProjection):
+        headers = ('Month', *projection.accountNames, *projection.loanNames,
+                   *projection.fundNames)
+        balances = numpy.hstack([
+            projection.getAccountBalances(), projection.getLoanBalances(),
+            projection.getFundBalances()]).tolist()
+        rows = (headers,) + tuple(
+            (month, *row) for month, row in zip(projection.getMonths(),
+                                                balances))
+
+        clearSheet(self.sheet)
+        right = len(headers) - 1
+        self.sheet.getCellRangeByPosition(
+            0, 0, right, len(rows) - 1).setDataArray(rows)
+        self.sheet.getCellRangeByPosition(0, 0, right, 0).setPropertyValue(
+            'CharWeight', FontWeight.BOLD)
+        if right > 0 and len(rows) > 1:
+            self.sheet.getCellRangeByPosition(
+                1, 1, right, len(rows) - 1).setPropertyValue(
+                    'NumberFormat', NumberFormat.CURRENCY)
+
+def writeProjection(backend: SheetBackend, month, months, defaults=None):
+    """Project the budget for month forward by months, and write it to the
+    projection sheet"""
+    budget = MonthlyBudgetSheet(backend.getSheet(month + ' Budget')).read()
+    budget.calculateExpectedBalances()
+    projection = BudgetProjector(budget, month, defaults).project(months)
+    with backend.updateSession('Projection'):
+        ProjectionSheet(backend.getOrCreateSheet(PROJECTION_SHEET)).write(
+            projection)
+
+###############################################################################
@@ -7,31 +7,56 @@
 #
 # CREATED:          12/02/2021
 #
-# LAST EDITED:      02/06/2022
+# LAST EDITED:      10/18/2026
 ###
 
-import uno
-from com.sun.star.container import NoSuchElementException
-from com.sun.star.sheet import CellFlags
+from datetime import datetime, timedelta
 
-from .cellrange import CellMatrix
-from . import cellname
+from .cellformat import DATE_EPOCH
+from .cellrange import CellMatrix, CellRow, SnapshotCell
+from .cellname import RangeAddress
+from .constants import CellFlags
 
-def getOrCreateSheet(sheetsDocument, sheetName):
-    try:
-        return sheetsDocument.getSheets().getByName(sheetName)
-    except NoSuchElementException:
-        # Must not currently be a burndown table sheet
-        namedSheet = sheetsDocument.createInstance(
-            'com.sun.star.sheet.Spreadsheet')
-        sheetsDocument.getSheets().insertByName(sheetName, namedSheet)
-        return namedSheet
+CONTENT_FLAGS = CellFlags.VALUE | CellFlags.DATETIME | CellFlags.STRING \
+    | CellFlags.OBJECTS
+FORMAT_FLAGS = CellFlags.HARDATTR | CellFlags.STYLES | CellFlags.EDITATTR \
+    | CellFlags.FORMATTED
+
+DATE_FORMAT = '%m/%d/%y'
+
+def getCellString(row: CellRow, column, data):
+    """The display string of a cell, given its contents from getDataArray().
+    Only numeric cells need to be asked for it."""
+    return data if isinstance(data, str) else row.getItem(column).String
+
+def parseDate(data):
+    """The date in the contents of a cell: either a string like 12/31/21, or
+    the serial number Calc stores a date typed into a cell as. Serials are
+    converted here, instead of asking the cell for its display string."""
+    if isinstance(data, str):
+        return datetime.strptime(data, DATE_FORMAT)
+    return DATE_EPOCH + timedelta(days=int(data))
+
+def getCellDate(cell):
+    value = cell.Value
+    return parseDate(value if value else cell.String)
+
+def hasContents(cell):
+    """Whether a cell isn't empty. Snapshot cells know from their data,
+    without asking the sheet for the display string of a numeric cell."""
+    if isinstance(cell, SnapshotCell):
+        return cell.data is not None and cell.data != ''
+    return cell.String != ''
 
 def clearSheet(sheet):
-    flags = CellFlags.VALUE | CellFlags.DATETIME | CellFlags.STRING \
-        | CellFlags.HARDATTR | CellFlags.STYLES | CellFlags.OBJECTS \
-        | CellFlags.EDITATTR | CellFlags.FORMATTED
-    sheet.clearContents(flags)
+    sheet.clearContents(CONTENT_FLAGS | FORMAT_FLAGS)
+
+def getUsedArea(sheet):
+    """Get the (column, row) of the bottom-right corner of the used area"""
+    cursor = sheet.createCursor()
+    cursor.gotoEndOfUsedArea(False)
+    address = cursor.getRangeAddress()
+    return (address.EndColumn, address.EndRow)
 
 class EmptyFormError(Exception):
     pass
@@ -62,46 +87,42 @@ class SheetTableIterator:
         return SheetRecord(self.headers, next(self.inner))
 
 class SheetTable:
-    """Represents a group of non-empty cells with named columns"""
-    def __init__(self, topLeft, tableWidth, xSheet):
+    """Represents a group of non-empty cells with named columns. If snapshot is
+    set, the records are read-only, and are read from the sheet in bulk."""
+    def __init__(self, topLeft, tableWidth, xSheet, snapshot=False):
         # Get the coordinates (in zero-indexed form)
-        topLeftColumn, topLeftRow = cellname.getCoordinatesFromCellName(
-            topLeft)
-
-        # Get the number of rows in the table
+        corner = topLeft if isinstance(topLeft, RangeAddress) \
+            else RangeAddress.parse(topLeft)
+        topLeftColumn, topLeftRow = corner.left, corner.top
+
+        # Get the number of rows in the table. Nothing below the used area can
+        # be part of the table, so read the first column down to there in one
+        # go, and find the first empty cell.
+        _, lastRow = getUsedArea(xSheet)
         numberOfRows = 0
-        dataProbeSpec = (
-            f'{topLeft}:' + cellname.getCellNameFromCoordinates(
-                topLeftColumn, cellname.ROW_MAX)
-        )
-        for row in CellMatrix(spec=dataProbeSpec, xSheet=xSheet):
-            if not row.getItem(0).String:
-                break
-            numberOfRows += 1
+        if lastRow >= topLeftRow:
+            probe = xSheet.getCellRangeByPosition(
+                topLeftColumn, topLeftRow, topLeftColumn, lastRow)
+            for (data,) in probe.getDataArray():
+                if data is None or data == '':
+                    break
+                numberOfRows += 1
         if not numberOfRows:
             raise EmptyFormError()
 
         # Grab headers and instantiate an inner container
-        self._parseHeaders(topLeft, tableWidth, xSheet)
-        rightColumn = topLeftColumn + tableWidth - 1
-        dataSpec = (
-            cellname.getCellNameFromCoordinates(topLeftColumn, topLeftRow + 1)
-            + ':' + cellname.getCellNameFromCoordinates(
-                rightColumn, numberOfRows + topLeftRow - 1)
-        )
-        self.container = CellMatrix(dataSpec, xSheet)
-
-    def _parseHeaders(self, topLeft, tableWidth, xSheet):
-        leftColumn, leftRow = cellname.getCoordinatesFromCellName(topLeft)
-        rightColumn = leftColumn + tableWidth - 1
-        headerSpec = (
-            f'{topLeft}:'
-            + cellname.getCellNameFromCoordinates(rightColumn, leftRow)
-        )
-
+        address = RangeAddress(
+            topLeftColumn, topLeftRow, topLeftColumn + tableWidth - 1,
+            topLeftRow + numberOfRows - 1)
+        self._parseHeaders(address[0], xSheet)
+        self.container = CellMatrix(address[1:], xSheet, snapshot=snapshot,
+                                    blockRows=max(numberOfRows - 1, 1))
+
+    def _parseHeaders(self, headerAddress, xSheet):
         index = 0
         headerMap = {}
-        row = CellMatrix(spec=headerSpec, xSheet=xSheet).getItem(0)
+        row = CellMatrix(spec=headerAddress, xSheet=xSheet,
+                         snapshot=True).getItem(0)
         for cell in row:
             headerMap[cell.String] = index
             index += 1
@@ -116,6 +137,11 @@ class SheetTable:
     def getItem(self, index):
         return self.container.getItem(index)
 
+    def getDataArray(self):
+        """Get the contents of a snapshot table (without the headers) as a
+        tuple of rows"""
+        return self.container.getDataArray()
+
     def getHeaders(self):
         return list(self.headers.keys())
 
@@ -7,16 +7,22 @@
 #
 # CREATED:          12/14/2021
 #
-# LAST EDITED:      02/03/2022
+# LAST EDITED:      10/18/2026
 ###
 
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime
+import heapq
+from itertools import takewhile
+import json
+import os
 from typing import List
 
-from pyrecurrence import PyOccurrenceSeries
-
 from .cellrange import CellRow
-from .sheet import SheetTable
+from .columnar import TransactionTable
+from .config import getOccurrenceCachePath
+from .sheet import SheetTable, getCellDate, getCellString, parseDate
 
 ###############################################################################
 # Transactions
@@ -38,7 +44,7 @@ class TransactionRecord:
 
     def read(self) -> Transaction:
         iterator = iter(self.cellrange)
-        date = datetime.strptime(next(iterator).String, '%m/%d/%y')
+        date = getCellDate(next(iterator))
         description = next(iterator).String
         amount = next(iterator).Value
         accountName = next(iterator).String
@@ -48,57 +54,185 @@ class TransactionForm:
     def __init__(self, cellrange: SheetTable):
         self.cellrange = cellrange
 
-    def read(self) -> List[TransactionRecord]:
-        result = []
+    def __iter__(self):
         for row in self.cellrange:
-            result.append(TransactionRecord(row).read())
-        return result
+            yield TransactionRecord(row).read()
+
+    def read(self) -> List[TransactionRecord]:
+        return list(self)
+
+    def readTable(self) -> TransactionTable:
+        """Read the transactions into a TransactionTable. Contents are taken
+        from the table's snapshot, instead of from each cell."""
+        table = TransactionTable()
+        for index, data in enumerate(self.cellrange.getDataArray()):
+            row = self.cellrange.getItem(index)
+            amount = data[2]
+            table.append(
+                parseDate(data[0]),
+                getCellString(row, 1, data[1]),
+                0.0 if isinstance(amount, str) else amount,
+                getCellString(row, 3, data[3]))
+        return table
 
 ###############################################################################
-# Recurring Transactions
+# Occurrence Cache
 ###
 
-class RecurringTransactionIterator:
-    """Iterate over the series of payments in a recurring transaction"""
-    def __init__(self, template: Transaction=None, schedule=None,
-                 startDate=None, endDate=None):
-        self.template = template
-        self.schedule = schedule
-        self.startDate = startDate
-        self.endDate = endDate
+OCCURRENCE_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
-    def __next__(self):
-        self.startDate = self.schedule.next_occurrence(self.startDate)
-        if self.startDate > self.endDate:
-            raise StopIteration()
-        description = self.template.description
-        amount = self.template.amount
-        accountName = self.template.accountName
-        return Transaction(description=description, amount=amount,
-                           accountName=accountName, date=self.startDate)
+class OccurrenceSeriesEntry:
+    """The known occurrences of a schedule. dates holds every occurrence after
+    anchor, up to and including dates[-1]."""
+    def __init__(self, anchor, dates=None):
+        self.anchor = anchor
+        self.dates = dates or []
+        self.series = None
+
+class OccurrenceCache:
+    """Memoizes the expansion of recurrence schedules. Since an occurrence is
+    always the next one after a given date, the occurrences in any window are
+    a slice of the occurrences after an earlier date, so a single entry per
+    schedule serves every window, and is only extended at either end when a
+    window falls outside of it. Entries are evicted least-recently-used."""
+    def __init__(self, maxSchedules=256, path=None):
+        self.maxSchedules = maxSchedules
+        self.path = path
+        self.entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def getEntry(self, schedule):
+        entry = self.entries.get(schedule, None)
+        if entry is not None:
+            self.entries.move_to_end(schedule)
+        return entry
+
+    def putEntry(self, schedule, entry):
+        self.entries[schedule] = entry
+        self.entries.move_to_end(schedule)
+        while len(self.entries) > self.maxSchedules:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def getSeries(schedule, entry):
+        # Parsing the schedule (and loading the module to do it) is deferred
+        # until an entry needs extending
+        if entry.series is None:
+            from pyrecurrence import PyOccurrenceSeries
+            entry.series = PyOccurrenceSeries(schedule)
+        return entry.series
+
+    @staticmethod
+    def expand(series, startDate, endDate):
+        """Occurrences after startDate, through the first one after endDate"""
+        dates = []
+        date = startDate
+        while True:
+            date = series.next_occurrence(date)
+            dates.append(date)
+            if date > endDate:
+                return dates
+
+    def getOccurrences(self, schedule, startDate, endDate) -> List[datetime]:
+        """Get the occurrences of schedule after startDate, through endDate"""
+        entry = self.getEntry(schedule)
+        if entry is None:
+            entry = OccurrenceSeriesEntry(startDate)
+            entry.dates = OccurrenceCache.expand(
+                OccurrenceCache.getSeries(schedule, entry), startDate,
+                endDate)
+            self.putEntry(schedule, entry)
+        if startDate < entry.anchor:
+            entry.dates = OccurrenceCache.expand(
+                OccurrenceCache.getSeries(schedule, entry), startDate,
+                entry.anchor)[:-1] + entry.dates
+            entry.anchor = startDate
+        if not entry.dates or entry.dates[-1] <= endDate:
+            last = entry.dates[-1] if entry.dates else entry.anchor
+            entry.dates.extend(OccurrenceCache.expand(
+                OccurrenceCache.getSeries(schedule, entry), last, endDate))
+
+        first = bisect_right(entry.dates, startDate)
+        last = bisect_right(entry.dates, endDate, lo=first)
+        return entry.dates[first:last]
+
+    def load(self):
+        """Read the cache from path. A cache which can't be read is only a
+        lost optimization, so it's started afresh."""
+        try:
+            with open(self.path, 'r') as cacheFile:
+                contents = json.load(cacheFile)
+            for schedule, (anchor, dates) in contents.items():
+                self.putEntry(schedule, OccurrenceSeriesEntry(
+                    datetime.strptime(anchor, OCCURRENCE_DATE_FORMAT),
+                    [datetime.strptime(date, OCCURRENCE_DATE_FORMAT)
+                     for date in dates]))
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.entries = OrderedDict()
+
+    def save(self):
+        """Persist the cache to path, if one was provided"""
+        if self.path is None:
+            return
+        contents = {
+            schedule: (entry.anchor.strftime(OCCURRENCE_DATE_FORMAT),
+                       [date.strftime(OCCURRENCE_DATE_FORMAT)
+                        for date in entry.dates])
+            for schedule, entry in self.entries.items()}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporaryPath = self.path + '.tmp'
+        with open(temporaryPath, 'w') as cacheFile:
+            json.dump(contents, cacheFile)
+        os.replace(temporaryPath, self.path)
+
+###############################################################################
+# Recurring Transactions
+###
 
 class RecurringTransactionIteratorGenerator:
     """Generates an iterator for a recurring transaction and start/end dates"""
     def __init__(self, transaction, startDate, endDate):
         self.template = transaction.template
         self.schedule = transaction.schedule
+        self.cache = transaction.cache
         self.startDate = startDate
         self.endDate = endDate
 
     def __iter__(self):
-        return RecurringTransactionIterator(
-            template=self.template, schedule=self.schedule,
-            startDate=self.startDate, endDate=self.endDate)
+        description = self.template.description
+        amount = self.template.amount
+        accountName = self.template.accountName
+        for date in self.cache.getOccurrences(
+                self.schedule, self.startDate, self.endDate):
+            yield Transaction(description=description, amount=amount,
+                              accountName=accountName, date=date)
 
 class RecurringTransaction:
-    """Encapsulates a payment schedule from a template transaction"""
-    def __init__(self, template=None, schedule=''):
+    """Encapsulates a payment schedule from a template transaction. The
+    schedule is expanded through cache, which is shared by every recurring
+    transaction unless one is provided."""
+    cache = OccurrenceCache()
+
+    def __init__(self, template=None, schedule='', cache=None):
         self.template = template
-        self.schedule = PyOccurrenceSeries(schedule)
+        self.schedule = schedule
+        if cache is not None:
+            self.cache = cache
 
     def forDates(self, startDate, endDate):
         return RecurringTransactionIteratorGenerator(self, startDate, endDate)
 
+def usePersistentCache(path=None) -> OccurrenceCache:
+    """Make the cache shared by recurring transactions one which is kept at
+    path (by default, in the user cache directory), loading what's already
+    there. If the shared cache is kept somewhere else, it's replaced, so
+    callers should save() it once they're done."""
+    path = path or getOccurrenceCachePath()
+    if RecurringTransaction.cache.path != path:
+        RecurringTransaction.cache = OccurrenceCache(path=path)
+    return RecurringTransaction.cache
+
 class RecurringTransactionRecord:
     """Concerned with serialization of a single recurring transaction"""
     def __init__(self, cellrange: CellRow):
@@ -146,4 +280,34 @@ class TransactionLedger:
 
         return sorted(transactions, key=lambda x: x.date)
 
+    def getTransactionTable(self, startDate, endDate) -> TransactionTable:
+        """The transactions of getTransactions, in a TransactionTable. The
+        recurring transactions are expanded into the table, so none of them
+        are ever made into Transactions."""
+        table = self.nonRecurringForm.readTable()
+
+        startDateObj = datetime.strptime(startDate, '%m/%d/%y')
+        endDateObj = datetime.strptime(endDate, '%m/%d/%y')
+        for transaction in self.recurringForm.read():
+            template = transaction.template
+            for date in transaction.cache.getOccurrences(
+                    transaction.schedule, startDateObj, endDateObj):
+                table.append(date, template.description, template.amount,
+                             template.accountName)
+
+        return table.sortByDate()
+
+    def iterTransactions(self, startDate, endDate):
+        """Lazily generate the transactions of getTransactions through
+        endDate, in date order, by merging the streams instead of sorting
+        them. This requires the non-recurring transactions to be in
+        chronological order, as the user manual asks."""
+        startDateObj = datetime.strptime(startDate, '%m/%d/%y')
+        endDateObj = datetime.strptime(endDate, '%m/%d/%y')
+        streams = [takewhile(lambda x: x.date <= endDateObj,
+                             iter(self.nonRecurringForm))]
+        for transaction in self.recurringForm.read():
+            streams.append(transaction.forDates(startDateObj, endDateObj))
+        return heapq.merge(*streams, key=lambda x: x.date)
+
 ###############################################################################
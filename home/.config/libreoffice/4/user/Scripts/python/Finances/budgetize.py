@@ -7,13 +7,29 @@
 #
 # CREATED:          11/30/2021
 #
-# LAST EDITED:      12/02/2021
+# LAST EDITED:      10/18/2026
 ###
 
+from datetime import datetime
+import calendar
+import os
+import sys
+
+# Prefer the precompiled bundle built by BuildBundle.py, if it's installed
+SCRIPTS_DIRECTORY = os.path.dirname(globals().get('__file__') or '') \
+    or os.path.expanduser(
+        '~/.config/libreoffice/4/user/Scripts/python/Finances')
+BUNDLE = os.path.join(SCRIPTS_DIRECTORY, 'budgetize.zip')
+if os.path.exists(BUNDLE) and BUNDLE not in sys.path:
+    sys.path.insert(0, BUNDLE)
+
+from budgetize.backend import UnoSheetBackend
 from budgetize.budgetizer import Budgetizer
 
 def runBudgetizer():
-    budgetizer = Budgetizer(XSCRIPTCONTEXT.getDesktop().getCurrentComponent())
+    budgetizer = Budgetizer(
+        UnoSheetBackend(XSCRIPTCONTEXT.getDesktop().getCurrentComponent()),
+        calendar.month_name[datetime.now().month])
     budgetizer.budgetize()
 
 # Lists the scripts, that shall be visible inside OOo. Can be omitted, if all
@@ -7,11 +7,14 @@ setuptools.setup(
     author_email="ethan.twardy@gmail.com",
     description="Scripts to help organize and perform budgeting tasks",
     url="https://github.com/AmateurECE/Budget",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=['tests', 'tests.*']),
     classifiers=[
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.6',
+    extras_require={
+        'vectorized': ['numpy'],
+    },
     provides=['budgetize']
 )
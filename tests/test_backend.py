@@ -0,0 +1,84 @@
+###############################################################################
+# NAME:             test_backend.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of the update sessions of the UNO backend
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import unittest
+
+from budgetize.backend import UnoSheetBackend
+
+class FakeDocument:
+    """Records the calls an update session makes, and fails the one named
+    failAt"""
+    def __init__(self, failAt=None):
+        self.failAt = failAt
+        self.calls = []
+
+    def record(self, name, *args):
+        if name == self.failAt:
+            raise RuntimeError(name)
+        self.calls.append(name)
+
+    def getUndoManager(self):
+        return self
+
+    def isAutomaticCalculationEnabled(self):
+        return True
+
+    def lockControllers(self):
+        self.record('lockControllers')
+
+    def unlockControllers(self):
+        self.record('unlockControllers')
+
+    def addActionLock(self):
+        self.record('addActionLock')
+
+    def removeActionLock(self):
+        self.record('removeActionLock')
+
+    def enableAutomaticCalculation(self, enabled):
+        self.record('enableAutomaticCalculation', enabled)
+
+    def enterUndoContext(self, title):
+        self.record('enterUndoContext', title)
+
+    def leaveUndoContext(self):
+        self.record('leaveUndoContext')
+
+class UpdateSessionTest(unittest.TestCase):
+    def test_nested_sessions(self):
+        document = FakeDocument()
+        backend = UnoSheetBackend(document)
+        with backend.updateSession():
+            with backend.updateSession():
+                self.assertEqual(2, backend.sessionDepth)
+        self.assertEqual(0, backend.sessionDepth)
+        self.assertEqual(
+            ['lockControllers', 'addActionLock', 'enableAutomaticCalculation',
+             'enterUndoContext', 'leaveUndoContext',
+             'enableAutomaticCalculation', 'removeActionLock',
+             'unlockControllers'],
+            document.calls)
+
+    def test_failed_step_undoes_the_earlier_ones(self):
+        document = FakeDocument(failAt='enterUndoContext')
+        backend = UnoSheetBackend(document)
+        with self.assertRaises(RuntimeError):
+            with backend.updateSession():
+                pass
+        self.assertEqual(0, backend.sessionDepth)
+        self.assertEqual(
+            ['lockControllers', 'addActionLock', 'enableAutomaticCalculation',
+             'enableAutomaticCalculation', 'removeActionLock',
+             'unlockControllers'],
+            document.calls)
+
+###############################################################################
@@ -0,0 +1,114 @@
+###############################################################################
+# NAME:             test_budget.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of applying expenses to a MonthlyBudget
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from datetime import datetime
+import unittest
+
+from budgetize.account import AccountHistorySummary
+from budgetize.expense import BudgetedExpense, ExpenseRouting
+from budgetize.income import Income
+from budgetize.loan import Loan
+from budgetize.monthly.budget import MonthlyBudget
+from budgetize.monthly.expense import MonthlyExpense
+
+NOW = datetime(2030, 1, 31)
+
+def makeBudget():
+    expenses = {
+        'Housing': [
+            BudgetedExpense('Rent', ExpenseRouting.parse('Checking'), 1000.0),
+            BudgetedExpense('Mortgage',
+                            ExpenseRouting.parse('transfer(Checking,House)'),
+                            500.0),
+        ],
+        'Food': [
+            BudgetedExpense('Groceries', ExpenseRouting.parse('Credit'),
+                            400.0),
+            # Shadowed by the first line item of the same name
+            BudgetedExpense('Groceries', ExpenseRouting.parse('Checking'),
+                            1.0),
+        ],
+    }
+    incomes = [Income('Pay', 'Checking', 2000.0)]
+    accounts = [AccountHistorySummary('Checking', 100.0),
+                AccountHistorySummary('Credit', 0.0)]
+    loans = [Loan('House', 0.05, 100000.0)]
+    return MonthlyBudget(expenses, incomes, accounts, [], loans)
+
+def makeExpense(lineItem, category, amount, accountName, day=15):
+    return MonthlyExpense('', lineItem, category, datetime(2030, 1, day),
+                          amount, accountName)
+
+class MonthlyBudgetTest(unittest.TestCase):
+    def test_lookups(self):
+        budget = makeBudget()
+        groceries = budget.getBudgetedExpense(
+            makeExpense('Groceries', 'Food', -1.0, 'Credit'))
+        self.assertEqual(400.0, groceries.getBudgeted())
+        self.assertIs(budget.getIncomes()[0], budget.getBudgetedIncome(
+            makeExpense('Pay', 'Incomes', 1.0, 'Checking')))
+        self.assertEqual('Credit',
+                         budget.getAccountByName('Credit').getAccountName())
+        self.assertEqual(0.05, budget.getLoanByName('House').getAPR())
+
+        mortgage = budget.getExpenseSections()['Housing'][1]
+        self.assertIs(budget.getAccountByName('Checking'),
+                      mortgage.getRouting().getAccount())
+        self.assertIs(budget.getLoanByName('House'),
+                      mortgage.getRouting().getLoan())
+
+    def test_missing_names(self):
+        budget = makeBudget()
+        for expense in (makeExpense('Rent', 'Travel', -1.0, 'Checking'),
+                        makeExpense('Hotel', 'Housing', -1.0, 'Checking')):
+            with self.assertRaises(RuntimeError):
+                budget.getBudgetedExpense(expense)
+        with self.assertRaises(RuntimeError):
+            budget.getBudgetedIncome(makeExpense('Bonus', '', 1.0, 'Savings'))
+        with self.assertRaises(RuntimeError):
+            budget.getAccountByName('Savings')
+        with self.assertRaises(RuntimeError):
+            budget.getLoanByName('Car')
+
+    def test_apply_expenses(self):
+        budget = makeBudget()
+        budget.calculateExpectedBalances()
+        budget.applyExpenses([
+            makeExpense('Pay', 'Incomes', 2000.0, 'Checking', 1),
+            makeExpense('Rent', 'Housing', -1000.0, 'Checking', 2),
+            makeExpense('Groceries', 'Food', -120.0, 'Credit', 3),
+            makeExpense('Groceries', 'Food', -30.0, 'Credit', 4),
+            # Hasn't happened yet
+            makeExpense('Rent', 'Housing', -1000.0, 'Checking', 31),
+        ], datetime(2030, 1, 30))
+
+        housing, food = budget.getExpenseSections().values()
+        self.assertEqual(1000.0, housing[0].getSpent())
+        self.assertEqual(150.0, food[0].getSpent())
+        self.assertEqual(0, food[1].getSpent())
+        self.assertEqual(2000.0, budget.getIncomes()[0].getReceived())
+        checking = budget.getAccountByName('Checking')
+        self.assertEqual(1100.0, checking.getCurrentBalance())
+        self.assertEqual(100.0 + 2000.0 - 1000.0 - 500.0 - 1.0,
+                         checking.getExpectedEndBalance())
+        self.assertEqual(-150.0,
+                         budget.getAccountByName('Credit').getCurrentBalance())
+        self.assertEqual(99500.0,
+                         budget.getLoanByName('House').getEndingBalance())
+
+    def test_mismatched_account(self):
+        budget = makeBudget()
+        with self.assertRaises(RuntimeError):
+            budget.applyExpenses(
+                [makeExpense('Rent', 'Housing', -1.0, 'Credit')], NOW)
+
+###############################################################################
@@ -0,0 +1,122 @@
+###############################################################################
+# NAME:             test_budgetizer.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests that incremental budgetizing agrees with budgetizing
+#                   from scratch
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from configparser import ConfigParser
+from datetime import datetime
+import unittest
+
+from budgetize.account import AccountHistorySummary
+from budgetize.budgetizer import Budgetizer
+from budgetize.expense import BudgetedExpense, ExpenseRouting
+from budgetize.income import Income
+from budgetize.memory import MemorySheetBackend
+from budgetize.monthly.budget import MonthlyBudget
+from budgetize.monthly.checkpoint import MonthlyCheckpointSheet
+from budgetize.monthly.expense import MonthlyExpense, MonthlyExpenseSheet
+from budgetize.monthly.forms import MonthlyBudgetSheet
+
+MONTH = 'January'
+
+def makeBudget():
+    expenses = {
+        'Housing': [
+            BudgetedExpense('Rent', ExpenseRouting.parse('Checking'), 1000.0),
+            BudgetedExpense('Utilities', ExpenseRouting.parse('Checking'),
+                            150.0),
+        ],
+        'Food': [
+            BudgetedExpense('Groceries', ExpenseRouting.parse('Credit'),
+                            400.0),
+        ],
+    }
+    incomes = [Income('Pay', 'Checking', 2000.0)]
+    accounts = [AccountHistorySummary('Checking', 500.0),
+                AccountHistorySummary('Credit', 0.0)]
+    return MonthlyBudget(expenses, incomes, accounts, [], [])
+
+def makeExpense(lineItem, category, amount, accountName, date):
+    return MonthlyExpense(lineItem, lineItem, category, date, amount,
+                          accountName)
+
+FIRST_EXPENSES = [
+    makeExpense('Pay', 'Incomes', 2000.0, 'Checking', datetime(2025, 1, 1)),
+    makeExpense('Rent', 'Housing', -1000.0, 'Checking', datetime(2025, 1, 2)),
+    makeExpense('Groceries', 'Food', -75.5, 'Credit', datetime(2025, 1, 3)),
+]
+
+LATER_EXPENSES = [
+    makeExpense('Groceries', 'Food', -42.25, 'Credit', datetime(2025, 1, 9)),
+    makeExpense('Utilities', 'Housing', -130.0, 'Checking',
+                datetime(2025, 1, 10)),
+    # Hasn't happened yet, so the checkpoint has to stop before it
+    makeExpense('Groceries', 'Food', -10.0, 'Credit', datetime(2030, 1, 11)),
+]
+
+def makeBackend(expenses):
+    backend = MemorySheetBackend()
+    MonthlyBudgetSheet(backend.createSheet(MONTH + ' Budget')).write(
+        makeBudget())
+    MonthlyExpenseSheet(backend.createSheet(MONTH + ' Expenses')).write(
+        expenses)
+    return backend
+
+def budgetize(backend, incremental):
+    Budgetizer(backend, MONTH, ConfigParser()).budgetize(incremental)
+
+def getBudgetCells(backend):
+    return backend.getSheet(MONTH + ' Budget').cells
+
+class IncrementalBudgetizeTest(unittest.TestCase):
+    def setUp(self):
+        self.expected = makeBackend(FIRST_EXPENSES + LATER_EXPENSES)
+        budgetize(self.expected, incremental=False)
+
+    def test_appended_expenses(self):
+        backend = makeBackend(FIRST_EXPENSES)
+        budgetize(backend, incremental=True)
+        MonthlyExpenseSheet(backend.getSheet(MONTH + ' Expenses')).write(
+            FIRST_EXPENSES + LATER_EXPENSES)
+        budgetize(backend, incremental=True)
+        self.assertEqual(getBudgetCells(self.expected),
+                         getBudgetCells(backend))
+        checkpoint = MonthlyCheckpointSheet(
+            backend.getSheet(MONTH + ' Checkpoint')).read()
+        self.assertEqual(5, checkpoint.getAppliedRows())
+
+        # Nothing new to apply
+        budgetize(backend, incremental=True)
+        self.assertEqual(getBudgetCells(self.expected),
+                         getBudgetCells(backend))
+
+    def test_edited_expenses(self):
+        backend = makeBackend(FIRST_EXPENSES + LATER_EXPENSES[:1])
+        budgetize(backend, incremental=True)
+        edited = list(FIRST_EXPENSES)
+        edited[2] = makeExpense('Groceries', 'Food', -80.0, 'Credit',
+                                datetime(2025, 1, 3))
+        MonthlyExpenseSheet(backend.getSheet(MONTH + ' Expenses')).write(
+            edited + LATER_EXPENSES)
+        budgetize(backend, incremental=True)
+
+        expected = makeBackend(edited + LATER_EXPENSES)
+        budgetize(expected, incremental=False)
+        self.assertEqual(getBudgetCells(expected), getBudgetCells(backend))
+
+    def test_full_after_incremental(self):
+        backend = makeBackend(FIRST_EXPENSES + LATER_EXPENSES)
+        budgetize(backend, incremental=True)
+        budgetize(backend, incremental=False)
+        self.assertEqual(getBudgetCells(self.expected),
+                         getBudgetCells(backend))
+
+###############################################################################
@@ -0,0 +1,131 @@
+###############################################################################
+# NAME:             test_burndown.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of the burndown table
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from budgetize import burndown
+from budgetize.account import AccountHistorySummary, AccountHistorySummaryForm
+from budgetize.burndown import (
+    BALANCES_SHEET, BURNDOWN_TABLE_SHEET, NON_RECURRING_SHEET,
+    RECURRING_SHEET, runBurndown)
+from budgetize.memory import MemorySheetBackend
+from budgetize.transaction import RecurringTransaction
+
+LEDGER = (
+    ('12/31/21', 'Too early', -5.0, 'Checking'),
+    ('01/01/22', 'Pay', 2000.0, 'Checking'),
+    ('01/02/22', 'Rent', -1000.0, 'Checking'),
+    ('01/02/22', 'Transfer', 300.0, 'Savings'),
+    ('01/05/22', 'Groceries', -120.0, 'Credit'),
+    ('01/09/22', 'Interest', 2.0, 'Savings'),
+    ('01/12/22', 'Groceries', -80.0, 'Credit'),
+    ('02/01/22', 'Too late', -5.0, 'Checking'),
+)
+
+# Rows for an account that's no longer in the balances, all outside of the
+# window being burned down
+CLOSED_ACCOUNT_LEDGER = (
+    ('12/30/21', 'Closing', 5.0, 'OldCard'),
+) + LEDGER + (
+    ('03/01/22', 'Refund', 5.0, 'OldCard'),
+)
+
+def makeBackend(ledger=LEDGER):
+    backend = MemorySheetBackend()
+    rows = (('Date', 'Description', 'Amount', 'Account'),) + ledger
+    backend.createSheet(NON_RECURRING_SHEET).getCellRangeByPosition(
+        0, 0, 3, len(rows) - 1).setDataArray(rows)
+    backend.createSheet(RECURRING_SHEET).getCellRangeByPosition(
+        0, 0, 3, 0).setDataArray(
+            (('Description', 'Amount', 'Account', 'Schedule'),))
+    AccountHistorySummaryForm(backend.createSheet(BALANCES_SHEET)).write(
+        [AccountHistorySummary('Checking', 100.0),
+         AccountHistorySummary('Savings', 1000.0),
+         AccountHistorySummary('Credit', 0.0)])
+    return backend
+
+def getBalances(backend):
+    """The Current Balance column of the balances sheet, which the form
+    doesn't read back"""
+    rows = backend.getSheet(BALANCES_SHEET).getCellRangeByPosition(
+        0, 1, 2, 3).getDataArray()
+    return {name: current for name, _, current in rows}
+
+class BurndownTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = RecurringTransaction.cache
+        self.directory = tempfile.TemporaryDirectory()
+        self.cachePath = os.path.join(self.directory.name, 'cache.json')
+
+    def tearDown(self):
+        RecurringTransaction.cache = self.cache
+        self.directory.cleanup()
+
+    def runBurndown(self, vectorized, ledger=LEDGER):
+        backend = makeBackend(ledger)
+        runBurndown(backend, '01/01/22', '01/31/22', vectorized,
+                    self.cachePath)
+        return backend
+
+    def test_streaming_burndown(self):
+        backend = self.runBurndown(False)
+        table = backend.getSheet(BURNDOWN_TABLE_SHEET)
+        rows = table.getCellRangeByPosition(0, 0, 6, 8).getDataArray()
+        self.assertEqual(('Date', 'Description', 'Amount', 'Account',
+                          'Checking', 'Savings', 'Credit'), rows[0])
+        self.assertEqual(('01/01/22', 'Starting Balance', '', '',
+                          100.0, 1000.0, 0.0), rows[1])
+        self.assertEqual(('01/02/22', 'Transfer', 300.0, 'Savings',
+                          1100.0, 1300.0, 0.0), rows[4])
+        self.assertEqual(('01/12/22', 'Groceries', -80.0, 'Credit',
+                          1100.0, 1302.0, -200.0), rows[7])
+        self.assertEqual(('',) * 7, rows[8])
+        self.assertEqual(
+            {'Checking': 1100.0, 'Savings': 1302.0, 'Credit': -200.0},
+            getBalances(backend))
+
+    def test_flushing_doesnt_change_the_table(self):
+        expected = self.runBurndown(False)
+        with mock.patch.object(burndown, 'BURNDOWN_FLUSH_ROWS', 2):
+            backend = self.runBurndown(False)
+        self.assertEqual(expected.getSheet(BURNDOWN_TABLE_SHEET).cells,
+                         backend.getSheet(BURNDOWN_TABLE_SHEET).cells)
+
+    @unittest.skipIf(burndown.numpy is None, 'numpy is not installed')
+    def test_vectorized_matches_streaming(self):
+        expected = self.runBurndown(False)
+        backend = self.runBurndown(True)
+        self.assertEqual(expected.getSheet(BURNDOWN_TABLE_SHEET).cells,
+                         backend.getSheet(BURNDOWN_TABLE_SHEET).cells)
+        self.assertEqual(getBalances(expected), getBalances(backend))
+
+    @unittest.skipIf(burndown.numpy is None, 'numpy is not installed')
+    def test_unknown_accounts_outside_window(self):
+        expected = self.runBurndown(False)
+        for vectorized in (False, True):
+            backend = self.runBurndown(vectorized, CLOSED_ACCOUNT_LEDGER)
+            self.assertEqual(expected.getSheet(BURNDOWN_TABLE_SHEET).cells,
+                             backend.getSheet(BURNDOWN_TABLE_SHEET).cells)
+            self.assertEqual(getBalances(expected), getBalances(backend))
+
+    @unittest.skipIf(burndown.numpy is None, 'numpy is not installed')
+    def test_unknown_account_in_window(self):
+        ledger = LEDGER[:-1] + (('01/20/22', 'Refund', 5.0, 'OldCard'),) \
+            + LEDGER[-1:]
+        for vectorized in (False, True):
+            with self.assertRaises(KeyError):
+                self.runBurndown(vectorized, ledger)
+
+###############################################################################
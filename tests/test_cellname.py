@@ -0,0 +1,92 @@
+###############################################################################
+# NAME:             test_cellname.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of cell names and range addresses
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import unittest
+
+from budgetize.cellname import (
+    RangeAddress, getCellNameFromCoordinates, getColumnNameFromIndex,
+    getCoordinatesFromCellName, getIndexFromColumnName)
+
+class CellNameTest(unittest.TestCase):
+    def test_column_names_round_trip(self):
+        for index, name in ((0, 'A'), (25, 'Z'), (26, 'AA'), (51, 'AZ'),
+                            (52, 'BA'), (701, 'ZZ'), (702, 'AAA')):
+            self.assertEqual(name, getColumnNameFromIndex(index))
+            self.assertEqual(index, getIndexFromColumnName(name))
+
+    def test_cell_names_round_trip(self):
+        self.assertEqual((27, 9), getCoordinatesFromCellName('AB10'))
+        self.assertEqual('AB10', getCellNameFromCoordinates(27, 9))
+        self.assertIsNone(getCoordinatesFromCellName('10'))
+
+class RangeAddressTest(unittest.TestCase):
+    def test_parse(self):
+        address = RangeAddress.parse('B3:D20', 'Sheet')
+        self.assertEqual((1, 2, 3, 19), address.getBounds())
+        self.assertEqual('Sheet', address.getSheet())
+        self.assertEqual(18, address.getRows())
+        self.assertEqual(3, address.getColumns())
+        self.assertEqual('B3:D20', str(address))
+        self.assertEqual('C5', RangeAddress.parse('C5').getName())
+        with self.assertRaises(ValueError):
+            RangeAddress.parse('3B:D20')
+
+    def test_rows(self):
+        address = RangeAddress.parse('B3:D20')
+        self.assertEqual(RangeAddress.parse('B3:D3'), address[0])
+        self.assertEqual(RangeAddress.parse('B20:D20'), address[-1])
+        with self.assertRaises(IndexError):
+            address[18]
+
+    def test_slice(self):
+        address = RangeAddress.parse('B3:D20')
+        self.assertEqual(RangeAddress.parse('B4:D20'), address[1:])
+        self.assertEqual(RangeAddress.parse('B5:D6'), address[2:4])
+        self.assertEqual(address, address[:])
+
+        empty = address[18:]
+        self.assertTrue(empty.isEmpty())
+        self.assertEqual(0, len(empty))
+        self.assertTrue(address[5:2].isEmpty())
+        with self.assertRaises(IndexError):
+            address[::2]
+
+    def test_sub_ranges(self):
+        address = RangeAddress.parse('B3:D20')
+        self.assertEqual(RangeAddress.parse('C4:D5'),
+                         address.getSubRange(1, 1, 2, 2))
+        self.assertEqual('C4', address.getCellName(1, 1))
+        self.assertEqual(RangeAddress.parse('C5:E22'), address.offset(1, 2))
+        self.assertTrue(address.contains(3, 19))
+        self.assertFalse(address.contains(4, 19))
+        with self.assertRaises(IndexError):
+            address.getSubRange(0, 0, 3, 0)
+
+    def test_intersect(self):
+        address = RangeAddress.parse('B3:D20')
+        self.assertEqual(RangeAddress.parse('C10:D20'),
+                         address.intersect(RangeAddress.parse('C10:F30')))
+        self.assertEqual(RangeAddress.parse('D3'),
+                         address.intersect(RangeAddress.parse('D1:F3')))
+        # Ranges which only touch don't overlap
+        self.assertIsNone(address.intersect(RangeAddress.parse('E3:F20')))
+        self.assertIsNone(address.intersect(RangeAddress.parse('B21:D30')))
+        self.assertIsNone(address.intersect(
+            RangeAddress.parse('B3:D20', 'Other')))
+
+    def test_immutable(self):
+        address = RangeAddress.parse('A1')
+        with self.assertRaises(AttributeError):
+            address.left = 2
+        self.assertEqual(hash(address), hash(RangeAddress(0, 0, 0, 0)))
+
+###############################################################################
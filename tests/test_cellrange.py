@@ -0,0 +1,126 @@
+###############################################################################
+# NAME:             test_cellrange.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of buffered writes, and of rewriting the Month Budget
+#                   sheet over its previous contents
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import unittest
+
+from budgetize.account import AccountHistorySummary
+from budgetize.cellrange import CellMatrix
+from budgetize.expense import BudgetedExpense, ExpenseRouting
+from budgetize.income import Income
+from budgetize.memory import MemorySheet
+from budgetize.monthly.budget import MonthlyBudget
+from budgetize.monthly.forms import MonthlyBudgetSheet
+from budgetize.sheet import CONTENT_FLAGS
+
+OLD_CONTENTS = (
+    ('Name', 'Amount', 'Account', 'Note'),
+    ('Rent', 1000.0, 'Checking', 'Due on the 1st'),
+    ('Groceries', 400.0, 'Checking', ''),
+    ('Savings', 200.0, 'Savings', 'Automatic'),
+    ('Gifts', 50.0, 'Checking', ''),
+)
+
+NEW_CONTENTS = (
+    ('Name', 'Amount', 'Account', ''),
+    ('Rent', 1100.0, 'Checking', ''),
+    ('Groceries', 400.0, 'Credit', 'Moved'),
+)
+
+def writeCells(cellrange: CellMatrix, contents):
+    for row, data in zip(cellrange, contents):
+        for cell, value in zip(row, data):
+            if isinstance(value, str):
+                cell.String = value
+            else:
+                cell.Value = value
+
+def writeBuffered(sheet, contents):
+    """Write contents over the sheet the way MonthlyBudgetSheet does: buffer
+    everything, drop what's unchanged, clear what's stale, then flush"""
+    previous = CellMatrix('A1:D10', sheet, snapshot=True)
+    cellrange = CellMatrix('A1:D10', sheet, buffered=True)
+    writeCells(cellrange, contents)
+    for left, top, right, bottom in cellrange.diff(previous):
+        sheet.getCellRangeByPosition(
+            left, top, right, bottom).clearContents(CONTENT_FLAGS)
+    cellrange.flush()
+
+def makeBudget(lineItems):
+    accounts = [AccountHistorySummary('Checking', 1000.0),
+                AccountHistorySummary('Savings', 5000.0)]
+    expenses = {'Housing': [
+        BudgetedExpense(f'Line Item {index}',
+                        ExpenseRouting.parse('Checking'), 10.0 * index)
+        for index in range(lineItems)]}
+    incomes = [Income('Pay', 'Checking', 2000.0)]
+    return MonthlyBudget(expenses, incomes, accounts, [], [])
+
+class WriteBufferTest(unittest.TestCase):
+    def test_flush_writes_buffered_cells(self):
+        sheet = MemorySheet('Sheet')
+        cellrange = CellMatrix('B2:E5', sheet, buffered=True)
+        cellrange.getItem(0).getItem(0).String = 'Corner'
+        cellrange.getItem(1).getItem(1).Value = 2.5
+        cellrange.getItem(1).getItem(2).Value = 3
+        self.assertEqual({}, sheet.cells)
+        self.assertEqual('Corner', cellrange.getItem(0).getItem(0).String)
+
+        cellrange.flush()
+        self.assertEqual({(1, 1): 'Corner', (2, 2): 2.5, (3, 2): 3.0},
+                         sheet.cells)
+
+    def test_diff_then_flush_matches_direct_write(self):
+        expected = MemorySheet('Expected')
+        writeCells(CellMatrix('A1:D10', expected), NEW_CONTENTS)
+
+        sheet = MemorySheet('Sheet')
+        writeCells(CellMatrix('A1:D10', sheet), OLD_CONTENTS)
+        writeBuffered(sheet, NEW_CONTENTS)
+        self.assertEqual(expected.cells, sheet.cells)
+
+    def test_diff_drops_unchanged_cells(self):
+        sheet = MemorySheet('Sheet')
+        writeCells(CellMatrix('A1:D10', sheet), OLD_CONTENTS)
+        previous = CellMatrix('A1:D10', sheet, snapshot=True)
+        cellrange = CellMatrix('A1:D10', sheet, buffered=True)
+        writeCells(cellrange, OLD_CONTENTS[:2])
+        cellrange.getItem(0).getItem(0).String = 'Changed'
+        stale = cellrange.diff(previous)
+        self.assertEqual({0: {0: 'Changed'}}, cellrange.xIndexAccess.rows)
+
+        # Every cell left over from the old rows, and nothing else, is stale
+        cleared = {(column, row) for left, top, right, bottom in stale
+                   for column in range(left, right + 1)
+                   for row in range(top, bottom + 1)}
+        self.assertEqual({key for key in sheet.cells if key[1] >= 2},
+                         cleared)
+
+class MonthlyBudgetSheetTest(unittest.TestCase):
+    def test_rewrite_matches_fresh_write(self):
+        expected = MemorySheet('Expected')
+        MonthlyBudgetSheet(expected).write(makeBudget(3))
+
+        sheet = MemorySheet('Sheet')
+        MonthlyBudgetSheet(sheet).write(makeBudget(8))
+        MonthlyBudgetSheet(sheet).write(makeBudget(3))
+        self.assertEqual(expected.cells, sheet.cells)
+
+    def test_unchanged_rewrite_keeps_contents(self):
+        sheet = MemorySheet('Sheet')
+        MonthlyBudgetSheet(sheet).write(makeBudget(3))
+        before = dict(sheet.cells)
+        budget = MonthlyBudgetSheet(sheet).read()
+        MonthlyBudgetSheet(sheet).write(budget)
+        self.assertEqual(before, sheet.cells)
+
+###############################################################################
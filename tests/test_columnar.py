@@ -0,0 +1,116 @@
+###############################################################################
+# NAME:             test_columnar.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of the column-oriented tables
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from datetime import datetime
+import unittest
+
+from budgetize.account import AccountHistorySummary
+from budgetize.columnar import TransactionTable
+from budgetize.expense import BudgetedExpense, ExpenseRouting
+from budgetize.income import Income
+from budgetize.memory import MemorySheet
+from budgetize.monthly.budget import MonthlyBudget
+from budgetize.monthly.expense import MonthlyExpense, MonthlyExpenseSheet
+
+def makeTable():
+    table = TransactionTable()
+    table.append(datetime(2030, 1, 3), 'Rent', -1000.0, 'Checking')
+    table.append(datetime(2030, 1, 1), 'Pay', 2000.0, 'Checking')
+    table.append(datetime(2030, 1, 2), 'Interest', 5.0, 'Savings')
+    return table
+
+EXPENSES = [
+    MonthlyExpense('Paycheck', 'Pay', 'Incomes', datetime(2030, 1, 1), 2000.0,
+                   'Checking'),
+    MonthlyExpense('Landlord', 'Rent', 'Housing', datetime(2030, 1, 2),
+                   -1000.0, 'Checking'),
+    MonthlyExpense('Market', 'Groceries', 'Food', datetime(2030, 1, 3),
+                   -75.5, 'Credit'),
+    MonthlyExpense('Market', 'Groceries', 'Food', datetime(2030, 1, 9),
+                   -42.25, 'Credit'),
+]
+
+def makeBudget():
+    expenses = {
+        'Housing': [
+            BudgetedExpense('Rent', ExpenseRouting.parse('Checking'), 1000.0),
+        ],
+        'Food': [
+            BudgetedExpense('Groceries', ExpenseRouting.parse('Credit'),
+                            400.0),
+        ],
+    }
+    incomes = [Income('Pay', 'Checking', 2000.0)]
+    accounts = [AccountHistorySummary('Checking', 500.0),
+                AccountHistorySummary('Credit', 0.0)]
+    return MonthlyBudget(expenses, incomes, accounts, [], [])
+
+def getFields(expense):
+    return (expense.getDescription(), expense.getLineItem(),
+            expense.getCategory(), expense.getDate(), expense.getAmount(),
+            expense.getAccountName())
+
+class ColumnarTableTest(unittest.TestCase):
+    def test_append_after_reading_values(self):
+        table = makeTable()
+        amounts = table.getValues('amount')
+        table.append(datetime(2030, 1, 4), 'Groceries', -50.0, 'Checking')
+        self.assertEqual(3, len(amounts))
+        self.assertEqual(4, len(table))
+        self.assertEqual(-50.0, table.getItem(3).amount)
+
+    def test_queries(self):
+        table = makeTable()
+        checking = table.where('accountName', 'Checking')
+        self.assertEqual(['Rent', 'Pay'],
+                         [row.description for row in checking])
+        self.assertEqual(0, len(table.where('accountName', 'Credit')))
+        self.assertEqual({'Checking': 1000.0, 'Savings': 5.0},
+                         table.sumBy('accountName'))
+        self.assertEqual(
+            ['Pay', 'Interest'],
+            [row.description for row in table.sortByDate().between(
+                datetime(2030, 1, 1), datetime(2030, 1, 2))])
+
+class ExpenseTableTest(unittest.TestCase):
+    def setUp(self):
+        self.sheet = MemorySheet('Expenses')
+        MonthlyExpenseSheet(self.sheet).write(EXPENSES)
+
+    def test_read_table(self):
+        form = MonthlyExpenseSheet(self.sheet)
+        self.assertEqual([getFields(expense) for expense in form.read()],
+                         [getFields(row) for row in form.readTable()])
+        self.assertEqual([getFields(expense) for expense in EXPENSES[2:]],
+                         [getFields(row) for row in form.readTable(2)])
+
+    def test_apply_table(self):
+        now = datetime(2030, 1, 31)
+        expected = makeBudget()
+        expected.applyExpenses(EXPENSES, now)
+
+        budget = makeBudget()
+        table = MonthlyExpenseSheet(self.sheet).readTable()
+        budget.applyExpenses(table.take(range(2)), now)
+        budget.applyExpenses(table.take(range(2, len(table))), now)
+        for account in ('Checking', 'Credit'):
+            self.assertEqual(
+                expected.getAccountByName(account).getCurrentBalance(),
+                budget.getAccountByName(account).getCurrentBalance())
+        self.assertEqual(
+            [expense.getSpent() for section in
+             expected.getExpenseSections().values() for expense in section],
+            [expense.getSpent() for section in
+             budget.getExpenseSections().values() for expense in section])
+        self.assertEqual(2000.0, budget.getIncomes()[0].getReceived())
+
+###############################################################################
@@ -0,0 +1,162 @@
+###############################################################################
+# NAME:             test_ods.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of the .ods file backend
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+from budgetize.ods import OdsSheetBackend, CONTENT, OFFICE, TABLE, qualify
+
+CONTENT_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content
+ xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+ xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0"
+ xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+ xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+ xmlns:of="urn:oasis:names:tc:opendocument:xmlns:of:1.2"
+ office:version="1.2">
+ <office:automatic-styles/>
+ <office:body>
+  <office:spreadsheet>
+   <table:table table:name="Touched">
+    <table:table-column table:number-columns-repeated="3"/>
+    <table:table-row>
+     <table:table-cell office:value-type="string"><text:p>Old</text:p>
+     </table:table-cell>
+     <table:table-cell office:value-type="float" office:value="3">
+      <text:p>3</text:p></table:table-cell>
+     <table:table-cell table:formula="of:=[.B1]*2" office:value-type="float"
+      office:value="6"><text:p>6</text:p></table:table-cell>
+    </table:table-row>
+    <table:table-row>
+     <table:table-cell table:style-name="ce1" office:value-type="date"
+      office:date-value="2022-01-05"><text:p>01/05/22</text:p>
+     </table:table-cell>
+     <table:table-cell table:number-columns-repeated="2"/>
+    </table:table-row>
+    <table:table-row table:number-rows-repeated="10">
+     <table:table-cell table:number-columns-repeated="3"/>
+    </table:table-row>
+   </table:table>
+   <table:table table:name="Untouched">
+    <table:table-column/>
+    <table:table-row>
+     <table:table-cell office:value-type="float" office:value="1">
+      <text:p>1</text:p></table:table-cell>
+    </table:table-row>
+    <table:table-row>
+     <table:table-cell table:formula="of:=[.A1]*2" office:value-type="float"
+      office:value="2"><text:p>2</text:p></table:table-cell>
+    </table:table-row>
+   </table:table>
+  </office:spreadsheet>
+ </office:body>
+</office:document-content>
+'''
+
+def getTable(path, sheetName):
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read(CONTENT))
+    for table in root.iter(qualify(TABLE, 'table')):
+        if table.get(qualify(TABLE, 'name')) == sheetName:
+            return table
+    return None
+
+def getFormulas(path, sheetName):
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read(CONTENT))
+    for table in root.iter(qualify(TABLE, 'table')):
+        if table.get(qualify(TABLE, 'name')) == sheetName:
+            return [cell.get(qualify(TABLE, 'formula'))
+                    for cell in table.iter(qualify(TABLE, 'table-cell'))
+                    if cell.get(qualify(TABLE, 'formula'))]
+    return None
+
+class OdsRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.ods')
+        os.close(handle)
+        with zipfile.ZipFile(self.path, 'w') as archive:
+            archive.writestr('mimetype',
+                             'application/vnd.oasis.opendocument.spreadsheet')
+            archive.writestr(CONTENT, CONTENT_XML)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_untouched_formulas_survive_save(self):
+        before = getFormulas(self.path, 'Untouched')
+        backend = OdsSheetBackend(self.path)
+        backend.getSheet('Touched').getCellByPosition(0, 0).String = 'New'
+        backend.save()
+
+        with zipfile.ZipFile(self.path) as archive:
+            content = archive.read(CONTENT)
+        self.assertIn(
+            b'xmlns:of="urn:oasis:names:tc:opendocument:xmlns:of:1.2"',
+            content)
+        self.assertEqual(before, getFormulas(self.path, 'Untouched'))
+
+        reloaded = OdsSheetBackend(self.path)
+        self.assertEqual(
+            'New', reloaded.getSheet('Touched').getCellByPosition(0, 0).String)
+        self.assertEqual(
+            2.0, reloaded.getSheet('Untouched').getCellByPosition(0, 1).Value)
+
+    def test_touched_sheet_keeps_unchanged_cells(self):
+        backend = OdsSheetBackend(self.path)
+        sheet = backend.getSheet('Touched')
+        sheet.getCellByPosition(0, 0).String = 'New'
+        sheet.getCellByPosition(1, 0).Value = 3 # Unchanged
+        sheet.getCellByPosition(1, 4).Value = 7 # In the repeated rows
+        sheet.getCellByPosition(4, 0).String = 'Far' # Past the end of a row
+        sheet.getCellByPosition(0, 20).String = 'Last' # Past the last row
+        backend.save()
+
+        self.assertEqual(['of:=[.B1]*2'], getFormulas(self.path, 'Touched'))
+        table = getTable(self.path, 'Touched')
+        rows = table.findall(qualify(TABLE, 'table-row'))
+        date = rows[1].find(qualify(TABLE, 'table-cell'))
+        self.assertEqual('date', date.get(qualify(OFFICE, 'value-type')))
+        self.assertEqual('ce1', date.get(qualify(TABLE, 'style-name')))
+        self.assertEqual(
+            21, sum(int(row.get(qualify(TABLE, 'number-rows-repeated'), '1'))
+                    for row in rows))
+
+        reloaded = OdsSheetBackend(self.path).getSheet('Touched')
+        self.assertEqual(('New', 3.0, 6.0, '', 'Far'),
+                         reloaded.getCellRangeByPosition(
+                             0, 0, 4, 0).getDataArray()[0])
+        self.assertEqual(7.0, reloaded.getCellByPosition(1, 4).Value)
+        self.assertEqual('', reloaded.getCellByPosition(1, 3).String)
+        self.assertEqual('', reloaded.getCellByPosition(1, 5).String)
+        self.assertEqual('Last', reloaded.getCellByPosition(0, 20).String)
+
+    def test_formatted_cells_survive_saving_twice(self):
+        backend = OdsSheetBackend(self.path)
+        cell = backend.getSheet('Touched').getCellByPosition(0, 0)
+        cell.String = 'Bold'
+        cell.CharWeight = 150.0
+        backend.save()
+
+        backend = OdsSheetBackend(self.path)
+        backend.getSheet('Touched').getCellByPosition(0, 1).String = 'Again'
+        backend.save()
+        with zipfile.ZipFile(self.path) as archive:
+            self.assertNotIn(b'xmlns:ns0', archive.read(CONTENT))
+        reloaded = OdsSheetBackend(self.path).getSheet('Touched')
+        self.assertEqual('Bold', reloaded.getCellByPosition(0, 0).String)
+        self.assertEqual('Again', reloaded.getCellByPosition(0, 1).String)
+
+###############################################################################
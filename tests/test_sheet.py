@@ -0,0 +1,83 @@
+###############################################################################
+# NAME:             test_sheet.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of reading cells from snapshots without asking the
+#                   sheet for display strings
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from datetime import datetime
+import unittest
+
+from budgetize.cellrange import CellMatrix
+from budgetize.instrument import InstrumentedBackend
+from budgetize.memory import MemorySheet, MemorySheetBackend
+from budgetize.monthly.expense import MonthlyExpense, MonthlyExpenseSheet
+from budgetize.sheet import SheetTable, hasContents, parseDate
+from budgetize.transaction import TransactionForm
+
+# The serial of 01/05/22, as Calc stores it
+SERIAL = 44566.0
+
+class SheetTest(unittest.TestCase):
+    def test_parse_date(self):
+        self.assertEqual(datetime(2022, 1, 5), parseDate('01/05/22'))
+        self.assertEqual(datetime(2022, 1, 5), parseDate(SERIAL))
+        self.assertEqual(datetime(2022, 1, 5), parseDate(SERIAL + 0.75))
+        with self.assertRaises(ValueError):
+            parseDate('Not a date')
+
+    def test_has_contents(self):
+        sheet = MemorySheet('Sheet')
+        sheet.setData(0, 0, 0.0)
+        sheet.setData(1, 0, 'Text')
+        row = CellMatrix('A1:C1', sheet, snapshot=True).getItem(0)
+        self.assertEqual([True, True, False],
+                         [hasContents(row.getItem(index))
+                          for index in range(3)])
+        self.assertFalse(hasContents(sheet.getCellByPosition(2, 0)))
+        self.assertTrue(hasContents(sheet.getCellByPosition(0, 0)))
+
+class DateSerialTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = InstrumentedBackend(MemorySheetBackend())
+        self.sheet = self.backend.backend.createSheet('Sheet')
+
+    def getStringGets(self):
+        return sum(counts.gets['String']
+                   for counts in self.backend.getCounter().phases.values())
+
+    def test_expenses(self):
+        MonthlyExpenseSheet(self.sheet).write([MonthlyExpense(
+            'Groceries', 'Groceries', 'Food', datetime(2022, 1, 5), -20.0,
+            'Credit')])
+        self.sheet.setData(3, 1, SERIAL)
+
+        form = MonthlyExpenseSheet(self.backend.getSheet('Sheet'))
+        expense, = form.read()
+        self.assertEqual(datetime(2022, 1, 5), expense.getDate())
+        self.assertEqual('Credit', expense.getAccountName())
+        table = form.readTable()
+        self.assertEqual(datetime(2022, 1, 5), table.getItem(0).getDate())
+        self.assertEqual(0, self.getStringGets())
+
+    def test_transactions(self):
+        rows = (('Date', 'Description', 'Amount', 'Account'),
+                (SERIAL, 'Rent', -1000.0, 'Checking'),
+                ('01/06/22', 'Pay', 2000.0, 'Checking'))
+        self.sheet.getCellRangeByPosition(0, 0, 3, 2).setDataArray(rows)
+
+        form = TransactionForm(SheetTable(
+            'A1', 4, self.backend.getSheet('Sheet'), snapshot=True))
+        self.assertEqual([datetime(2022, 1, 5), datetime(2022, 1, 6)],
+                         [transaction.date for transaction in form])
+        self.assertEqual([datetime(2022, 1, 5), datetime(2022, 1, 6)],
+                         [row.date for row in form.readTable()])
+        self.assertEqual(0, self.getStringGets())
+
+###############################################################################
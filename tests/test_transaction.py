@@ -0,0 +1,63 @@
+###############################################################################
+# NAME:             test_transaction.py
+#
+# AUTHOR:           Ethan D. Twardy <ethan.twardy@gmail.com>
+#
+# DESCRIPTION:      Tests of the occurrence cache shared by recurring
+#                   transactions
+#
+# CREATED:          10/18/2026
+#
+# LAST EDITED:      10/18/2026
+###
+
+from datetime import datetime
+import os
+import tempfile
+import unittest
+
+from budgetize.transaction import (
+    OccurrenceCache, OccurrenceSeriesEntry, RecurringTransaction,
+    usePersistentCache)
+
+SCHEDULE = 'FREQ=MONTHLY;BYMONTHDAY=1'
+
+class UsePersistentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = RecurringTransaction.cache
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        RecurringTransaction.cache = self.cache
+        self.directory.cleanup()
+
+    def getPath(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_same_path_keeps_the_cache(self):
+        cache = usePersistentCache(self.getPath('cache.json'))
+        self.assertIs(RecurringTransaction.cache, cache)
+        self.assertIs(cache, usePersistentCache(self.getPath('cache.json')))
+
+    def test_other_path_replaces_the_cache(self):
+        first = usePersistentCache(self.getPath('first.json'))
+        first.putEntry(SCHEDULE, OccurrenceSeriesEntry(
+            datetime(2022, 1, 1), [datetime(2022, 2, 1)]))
+        first.save()
+
+        second = usePersistentCache(self.getPath('second.json'))
+        self.assertIsNot(first, second)
+        self.assertEqual(self.getPath('second.json'), second.path)
+        self.assertIsNone(second.getEntry(SCHEDULE))
+
+        reloaded = usePersistentCache(self.getPath('first.json'))
+        self.assertEqual([datetime(2022, 2, 1)],
+                         reloaded.getEntry(SCHEDULE).dates)
+
+    def test_recurring_transactions_share_the_cache(self):
+        cache = usePersistentCache(self.getPath('cache.json'))
+        self.assertIs(cache, RecurringTransaction().cache)
+        own = OccurrenceCache()
+        self.assertIs(own, RecurringTransaction(cache=own).cache)
+
+###############################################################################